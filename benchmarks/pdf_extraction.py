@@ -0,0 +1,60 @@
+"""
+Benchmark PDF pages text extraction: serial vs parallel worker processes.
+
+A large sample PDF is built repeating the pages of a source PDF, or a PDF file
+can be passed with `--pdf`. Usage example:
+
+    python benchmarks/pdf_extraction.py --pages 2000 --workers 8
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+import click
+import pypdf
+from brevia.load_file import iter_pdf_pages
+
+SOURCE_PDF = f'{Path(__file__).parent.parent}/tests/files/docs/empty.pdf'
+
+
+def build_sample_pdf(source: str, pages: int, dest: str) -> None:
+    """Write a `pages` long PDF repeating the pages of `source` PDF"""
+    reader = pypdf.PdfReader(source)
+    writer = pypdf.PdfWriter()
+    for num in range(pages):
+        writer.add_page(reader.pages[num % len(reader.pages)])
+    with open(dest, 'wb') as file:
+        writer.write(file)
+
+
+def timed_extraction(file_path: str, workers: int) -> tuple[float, list[str]]:
+    """Extract all PDF pages text, return elapsed seconds and pages text"""
+    start = time.perf_counter()
+    pages = list(iter_pdf_pages(file_path=file_path, workers=workers))
+
+    return time.perf_counter() - start, pages
+
+
+@click.command()
+@click.option('--pdf', default=None, help='PDF file, a sample is built if missing')
+@click.option('--source', default=SOURCE_PDF, help='Source PDF of sample pages')
+@click.option('--pages', default=1000, help='Number of pages of sample PDF')
+@click.option('--workers', default=os.cpu_count(), help='Parallel worker processes')
+def benchmark(pdf: str | None, source: str, pages: int, workers: int):
+    """Compare serial and parallel PDF pages text extraction"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if pdf is None:
+            pdf = f'{tmp_dir}/sample.pdf'
+            build_sample_pdf(source=source, pages=pages, dest=pdf)
+        serial_time, serial_pages = timed_extraction(pdf, workers=1)
+        parallel_time, parallel_pages = timed_extraction(pdf, workers=workers)
+
+    print(f'Pages: {len(serial_pages)}')
+    print(f'Serial: {serial_time:.2f}s')
+    print(f'Parallel ({workers} workers): {parallel_time:.2f}s')
+    print(f'Speedup: {serial_time / parallel_time:.2f}x')
+    print(f'Same text: {serial_pages == parallel_pages}')
+
+
+if __name__ == '__main__':
+    benchmark()  # pylint: disable=no-value-for-parameter
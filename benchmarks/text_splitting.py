@@ -0,0 +1,77 @@
+"""
+Benchmark text splitters throughput: default NLTK splitter vs built-in splitters.
+
+A sample text is built with random sentences and paragraphs, or a text file
+can be passed with `--text`. Usage example:
+
+    python benchmarks/text_splitting.py --size 20 --chunk-size 2000
+"""
+import random
+import time
+import click
+from langchain_text_splitters import NLTKTextSplitter
+from langchain_text_splitters.base import TextSplitter
+from brevia.index import create_custom_splitter, init_splitting_data
+
+WORDS = (
+    'the of and to in a is that for it as was with be by on not he this are or '
+    'his from at which but have an they you were her she there one all we their '
+    'document index vector search collection embedding chunk sentence paragraph'
+).split()
+
+
+def build_sample_text(size: int, seed: int = 42) -> str:
+    """Random sentences and paragraphs text of about `size` bytes"""
+    rnd = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        words = rnd.choices(WORDS, k=rnd.randint(5, 30))
+        sentence = ' '.join(words).capitalize() + rnd.choice('..!?')
+        sep = '\n\n' if rnd.random() < 0.1 else ' '
+        parts.append(sentence + sep)
+        length += len(sentence) + len(sep)
+
+    return ''.join(parts)
+
+
+def timed_split(splitter: TextSplitter, text: str) -> tuple[float, list[str]]:
+    """Split text, return elapsed seconds and chunks"""
+    start = time.perf_counter()
+    chunks = splitter.split_text(text)
+
+    return time.perf_counter() - start, chunks
+
+
+@click.command()
+@click.option('--text', default=None, help='Text file, a sample is built if missing')
+@click.option('--size', default=10, help='Sample text size in MB')
+@click.option('--chunk-size', default=2000, help='Text chunk size')
+@click.option('--chunk-overlap', default=200, help='Text chunk overlap')
+def benchmark(text: str | None, size: int, chunk_size: int, chunk_overlap: int):
+    """Compare NLTK, regex and content-defined text splitters throughput"""
+    if text is None:
+        content = build_sample_text(size * 1_000_000)
+    else:
+        with open(text, encoding='utf-8') as file:
+            content = file.read()
+    init_splitting_data()
+    chunk_conf = {'chunk_size': chunk_size, 'chunk_overlap': chunk_overlap}
+    splitters = {
+        'NLTK': NLTKTextSplitter(separator='\n', **chunk_conf),
+        'Regex': create_custom_splitter({'splitter': 'regex', **chunk_conf}),
+        'CDC': create_custom_splitter({'splitter': 'cdc', **chunk_conf}),
+    }
+    megabytes = len(content.encode()) / 1_000_000
+    print(f'Text: {megabytes:.1f} MB')
+    for name, splitter in splitters.items():
+        elapsed, chunks = timed_split(splitter, content)
+        avg = sum(len(c) for c in chunks) / max(1, len(chunks))
+        print(
+            f'{name}: {megabytes / elapsed:.2f} MB/s, {len(chunks)} chunks, '
+            f'{avg:.0f} chars on average'
+        )
+
+
+if __name__ == '__main__':
+    benchmark()  # pylint: disable=no-value-for-parameter
@@ -7,6 +7,7 @@ from brevia.connection import connection_string
 # Import models for autogenerate support
 from brevia.chat_history import ChatHistoryStore  # noqa: F401
 from brevia.async_jobs import AsyncJobsStore  # noqa: F401
+from brevia.embeddings_cache import EmbeddingsCacheStore  # noqa: F401
 from brevia.settings import ConfigStore  # noqa: F401
 from langchain_community.vectorstores.pgembedding import (  # noqa: F401
     BaseModel,
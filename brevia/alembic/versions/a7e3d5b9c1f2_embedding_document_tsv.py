@@ -0,0 +1,100 @@
+"""Embedding document full-text search vector
+
+Revision ID: a7e3d5b9c1f2
+Revises: f4a9c2e7b1d3
+Create Date: 2026-10-17 17:05:22.614803
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+# revision identifiers, used by Alembic.
+revision = 'a7e3d5b9c1f2'
+down_revision = 'f4a9c2e7b1d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'langchain_pg_embedding',
+        sa.Column(
+            'document_tsv',
+            TSVECTOR(),
+            nullable=True,
+            comment='Document full-text search vector, used in hybrid search',
+        ),
+    )
+    # text search configuration is read from `brevia.text_search_config`
+    # session setting, set by Brevia on writes, or from collection
+    # `hybrid_search` metadata; vectors are built only if hybrid search
+    # is enabled on the collection
+    op.execute("""
+        CREATE OR REPLACE FUNCTION embedding_document_tsv() RETURNS trigger AS $$
+        DECLARE
+            config text := NULLIF(
+                current_setting('brevia.text_search_config', true), ''
+            );
+        BEGIN
+            IF config IS NULL THEN
+                SELECT COALESCE(c.cmetadata -> 'hybrid_search' ->> 'language', 'simple')
+                INTO config
+                FROM langchain_pg_collection c
+                WHERE c.uuid = NEW.collection_id
+                AND (c.cmetadata -> 'hybrid_search') IS NOT NULL;
+            END IF;
+            IF config IS NULL THEN
+                NEW.document_tsv := NULL;
+            ELSE
+                NEW.document_tsv := to_tsvector(
+                    config::regconfig,
+                    COALESCE(NEW.document, '')
+                );
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER embedding_document_tsv_trigger
+        BEFORE INSERT OR UPDATE OF document, collection_id
+        ON langchain_pg_embedding
+        FOR EACH ROW
+        WHEN (current_setting('brevia.text_search_config', true)
+            IS DISTINCT FROM 'off')
+        EXECUTE FUNCTION embedding_document_tsv()
+    """)
+    # existing documents vectors are built outside of this migration,
+    # in batches, with `refresh_documents_tsv` command
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_embedding_document_tsv',
+            'langchain_pg_embedding',
+            ['document_tsv'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # indexes of a partitioned table can't be dropped concurrently
+    concurrently = op.get_bind().execute(sa.text(
+        "SELECT relkind <> 'p' FROM pg_class "
+        "WHERE oid = to_regclass('langchain_pg_embedding')"
+    )).scalar()
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_embedding_document_tsv',
+            table_name='langchain_pg_embedding',
+            postgresql_concurrently=concurrently,
+            if_exists=True,
+        )
+    op.execute(
+        'DROP TRIGGER IF EXISTS embedding_document_tsv_trigger '
+        'ON langchain_pg_embedding'
+    )
+    op.execute('DROP FUNCTION IF EXISTS embedding_document_tsv()')
+    op.drop_column('langchain_pg_embedding', 'document_tsv')
@@ -0,0 +1,58 @@
+"""Embeddings cache table
+
+Revision ID: c3f1a7d2e8b4
+Revises: eb659f4dd1c9
+Create Date: 2026-10-17 10:12:41.281934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+import uuid
+
+# revision identifiers, used by Alembic.
+revision = 'c3f1a7d2e8b4'
+down_revision = 'eb659f4dd1c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'embeddings_cache',
+        sa.Column('uuid', sa.UUID(), primary_key=True, default=uuid.uuid4),
+        sa.Column(
+            'model_hash',
+            sa.String(),
+            nullable=False,
+            comment='Embeddings model configuration hash'
+        ),
+        sa.Column(
+            'text_hash',
+            sa.String(),
+            nullable=False,
+            comment='Text content hash'
+        ),
+        sa.Column(
+            'embedding',
+            Vector(),
+            nullable=False,
+            comment='Text embedding'
+        ),
+        sa.Column(
+            'created',
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.func.current_timestamp(),
+            comment='Creation timestamp'
+        ),
+        sa.UniqueConstraint(
+            'model_hash',
+            'text_hash',
+            name='uq_embeddings_cache_key',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('embeddings_cache')
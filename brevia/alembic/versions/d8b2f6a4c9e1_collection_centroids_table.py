@@ -0,0 +1,57 @@
+"""Collection centroids table
+
+Revision ID: d8b2f6a4c9e1
+Revises: a7e3d5b9c1f2
+Create Date: 2026-10-17 18:21:07.392516
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+import uuid
+
+# revision identifiers, used by Alembic.
+revision = 'd8b2f6a4c9e1'
+down_revision = 'a7e3d5b9c1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'collection_centroids',
+        sa.Column('uuid', sa.UUID(), primary_key=True, default=uuid.uuid4),
+        sa.Column(
+            'collection_id',
+            sa.UUID(),
+            sa.ForeignKey('langchain_pg_collection.uuid', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column(
+            'position',
+            sa.Integer(),
+            nullable=False,
+            comment='Centroid position'
+        ),
+        sa.Column(
+            'vector_sum',
+            Vector(),
+            nullable=False,
+            comment='Sum of embeddings assigned to centroid'
+        ),
+        sa.Column(
+            'count',
+            sa.BigInteger(),
+            nullable=False,
+            comment='Number of embeddings assigned to centroid'
+        ),
+        sa.UniqueConstraint(
+            'collection_id',
+            'position',
+            name='uq_collection_centroids_position',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('collection_centroids')
@@ -0,0 +1,27 @@
+"""Partitioned embeddings table
+
+Revision ID: e9c4b2d6f8a1
+Revises: d8b2f6a4c9e1
+Create Date: 2026-10-17 19:34:52.108347
+
+"""
+from alembic import op
+from brevia.embedding_partitions import convert_embeddings, is_partitioned
+
+# revision identifiers, used by Alembic.
+revision = 'e9c4b2d6f8a1'
+down_revision = 'd8b2f6a4c9e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # opt-in layout, converted with `partition_embeddings` command
+    pass
+
+
+def downgrade() -> None:
+    if is_partitioned(op.get_bind()):
+        # conversion uses its own transactions
+        with op.get_context().autocommit_block():
+            convert_embeddings(partitioned=False)
@@ -0,0 +1,57 @@
+"""Embedding filter indexes
+
+Revision ID: f4a9c2e7b1d3
+Revises: c3f1a7d2e8b4
+Create Date: 2026-10-17 15:41:09.527120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f4a9c2e7b1d3'
+down_revision = 'c3f1a7d2e8b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # indexes are created concurrently, outside of a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_embedding_collection_custom_id',
+            'langchain_pg_embedding',
+            ['collection_id', 'custom_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_embedding_cmetadata',
+            'langchain_pg_embedding',
+            ['cmetadata'],
+            postgresql_using='gin',
+            postgresql_ops={'cmetadata': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # indexes of a partitioned table can't be dropped concurrently
+    concurrently = op.get_bind().execute(sa.text(
+        "SELECT relkind <> 'p' FROM pg_class "
+        "WHERE oid = to_regclass('langchain_pg_embedding')"
+    )).scalar()
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_embedding_cmetadata',
+            table_name='langchain_pg_embedding',
+            postgresql_concurrently=concurrently,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_embedding_collection_custom_id',
+            table_name='langchain_pg_embedding',
+            postgresql_concurrently=concurrently,
+            if_exists=True,
+        )
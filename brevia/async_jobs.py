@@ -12,7 +12,9 @@ from langchain_community.vectorstores.pgembedding import BaseModel
 from brevia.connection import db_connection
 from brevia.services import BaseService
 from brevia.utilities.dates import date_filter
-from brevia.utilities.json_api import query_data_pagination
+from brevia.utilities.json_api import (
+    CountMode, query_data_cursor, query_data_pagination,
+)
 from brevia.utilities.types import load_type
 from brevia.utilities.output import LinkedFileOutput
 
@@ -65,6 +67,8 @@ class JobsFilter(PydanticModel):
     completed: bool | None = None
     page: int = 1
     page_size: int = 50
+    cursor: str | None = None  # keyset pagination, empty for first page
+    count: CountMode = 'exact'
 
 
 def get_jobs(filter: JobsFilter) -> dict:  # pylint: disable=redefined-builtin
@@ -103,10 +107,19 @@ def get_jobs(filter: JobsFilter) -> dict:  # pylint: disable=redefined-builtin
             filter_service=filter_service,
             filter_completed=filter_completed,
         )
+        if filter.cursor is not None:
+            return query_data_cursor(
+                query=query,
+                keys=[AsyncJobsStore.created, AsyncJobsStore.uuid],
+                cursor=filter.cursor,
+                page_size=filter.page_size,
+                count=filter.count,
+            )
         result = query_data_pagination(
             query=query,
             page=filter.page,
-            page_size=filter.page_size
+            page_size=filter.page_size,
+            count=filter.count,
         )
         return result
 
@@ -1,6 +1,10 @@
 """Base retriever module"""
+from typing import ClassVar, Collection
 from langchain_core.documents import Document
-from langchain_core.callbacks.manager import AsyncCallbackManagerForRetrieverRun
+from langchain_core.callbacks.manager import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
 from langchain_core.vectorstores import VectorStore, VectorStoreRetriever
 
 
@@ -13,6 +17,59 @@ class BreviaBaseRetriever(VectorStoreRetriever):
     search_kwargs: dict
     """Configuration containing settings for the search from the application"""
 
+    allowed_search_types: ClassVar[Collection[str]] = (
+        "similarity",
+        "similarity_score_threshold",
+        "mmr",
+        "hybrid",
+        "prefix",
+    )
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun, **kwargs
+    ) -> list[Document]:
+        """
+        Synchronous implementation for retrieving relevant documents with score,
+        see `_aget_relevant_documents`.
+
+        Parameters:
+            query (str): The search query.
+            run_manager (CallbackManagerForRetrieverRun): Manager for retriever runs.
+
+        Returns:
+            List[Document]: A list of relevant documents based on the search.
+        """
+        if self.search_type == "similarity":
+            docs = self.vectorstore.similarity_search(query, **self.search_kwargs)
+        elif self.search_type == "similarity_score_threshold":
+            docs_and_similarities = (
+                self.vectorstore.similarity_search_with_relevance_scores(
+                    query, **self.search_kwargs
+                )
+            )
+            for doc, score in docs_and_similarities:
+                doc.metadata["score"] = score
+            docs = [doc for doc, _ in docs_and_similarities]
+        elif self.search_type == "mmr":
+            docs = self.vectorstore.max_marginal_relevance_search(
+                query, **self.search_kwargs
+            )
+        elif self.search_type == "prefix":
+            docs = self.vectorstore.similarity_search(
+                query, prefix=True, **self.search_kwargs
+            )
+        elif self.search_type == "hybrid":
+            docs_and_scores = self.vectorstore.hybrid_search_with_score(
+                query, **self.search_kwargs
+            )
+            for doc, score in docs_and_scores:
+                doc.metadata["score"] = score
+            docs = [doc for doc, _ in docs_and_scores]
+        else:
+            msg = f"search_type of {self.search_type} not allowed."
+            raise ValueError(msg)
+        return docs
+
     async def _aget_relevant_documents(
         self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun, **kwargs
     ) -> list[Document]:
@@ -44,6 +101,17 @@ class BreviaBaseRetriever(VectorStoreRetriever):
             docs = await self.vectorstore.amax_marginal_relevance_search(
                 query, **self.search_kwargs
             )
+        elif self.search_type == "prefix":
+            docs = await self.vectorstore.asimilarity_search(
+                query, prefix=True, **self.search_kwargs
+            )
+        elif self.search_type == "hybrid":
+            docs_and_scores = await self.vectorstore.ahybrid_search_with_score(
+                query, **self.search_kwargs
+            )
+            for doc, score in docs_and_scores:
+                doc.metadata["score"] = score
+            docs = [doc for doc, _ in docs_and_scores]
         else:
             msg = f"search_type of {self.search_type} not allowed."
             raise ValueError(msg)
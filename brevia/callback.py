@@ -10,7 +10,7 @@ from langchain_core.callbacks import AsyncCallbackHandler, BaseCallbackHandler
 from langchain_core.documents import Document
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import LLMResult
-from brevia.chat_history import add_history
+from brevia.chat_history import add_history, async_add_history
 
 
 # Only OpenAI token usage callback handler is supported for now
@@ -109,6 +109,28 @@ class ConversationCallbackHandler(AsyncCallbackHandler):
             metadata=token_usage(callb),
         )
 
+        return self.result_documents(chat_hist)
+
+    async def async_chain_result(
+        self,
+        callb: TokensCallbackHandler,
+        question: str,
+        collection: str,
+        x_chat_session: str | None = None,
+    ) -> str:
+        """Async version of `chain_result`, not blocking the event loop"""
+        chat_hist = await async_add_history(
+            session_id=x_chat_session,
+            collection=collection,
+            question=question,
+            answer=self.answer.strip(" \n"),
+            metadata=token_usage(callb),
+        )
+
+        return self.result_documents(chat_hist)
+
+    def result_documents(self, chat_hist: Any) -> str:
+        """Chain result JSON with history id and source documents"""
         docs = [{'chat_history_id': None if chat_hist is None else str(chat_hist.uuid)}]
 
         for doc in self.documents:
@@ -1,4 +1,5 @@
 """Chat history table & utilities"""
+import asyncio
 from typing import List
 import logging
 from langchain_community.vectorstores.pgembedding import BaseModel, CollectionStore
@@ -8,11 +9,13 @@ from sqlalchemy import func
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, Query, Session
 from sqlalchemy.sql.expression import BinaryExpression
-from brevia.connection import db_connection
-from brevia.models import load_embeddings
+from brevia.connection import async_db_session, db_connection
+from brevia.embeddings_cache import load_cached_embeddings
 from brevia.settings import get_settings
 from brevia.utilities.dates import date_filter
-from brevia.utilities.json_api import query_data_pagination
+from brevia.utilities.json_api import (
+    CountMode, query_data_cursor, query_data_pagination,
+)
 from brevia.utilities.uuid import is_valid_uuid
 
 
@@ -64,6 +67,17 @@ def history(chat_history: list, session: str = None):
     return history_from_db(session)
 
 
+async def async_history(chat_history: list, session: str = None):
+    """ Load chat history from input or from DB, async version """
+    if len(chat_history) > 0:
+        return [(x["query"], x["answer"]) for x in chat_history]
+
+    if not is_valid_uuid(session) or get_settings().qa_no_chat_history:
+        return []
+
+    return await async_history_from_db(session)
+
+
 def is_related(chat_history: list, question: str, embeddings: dict | None = None):
     """
     Determine whether a question is related to a sequence of sentences.
@@ -71,7 +85,7 @@ def is_related(chat_history: list, question: str, embeddings: dict | None = None
     scale between the vectors (in this case = similarity) and compare it
     with a threshold specified by environment variables.
     """
-    embeddings_engine = load_embeddings(embeddings)
+    embeddings_engine = load_cached_embeddings(embeddings)
     q_e = embeddings_engine.embed_query(question)
     h_e = embeddings_engine.embed_query(
         ''.join([sentence for tuple in chat_history for sentence in tuple])
@@ -109,6 +123,26 @@ def history_from_db(session_id: str) -> List[tuple[str, str]]:
     return chat_hist
 
 
+async def async_history_from_db(session_id: str) -> List[tuple[str, str]]:
+    """ Load chat history from DB, using the async engine if available """
+    db_session = async_db_session()
+    if db_session is None:
+        return await asyncio.to_thread(history_from_db, session_id)
+    async with db_session:
+        query = (
+            sqlalchemy.select(ChatHistoryStore.question, ChatHistoryStore.answer)
+            .filter(ChatHistoryStore.session_id == session_id)
+            .order_by(sqlalchemy.desc(ChatHistoryStore.created))
+            .limit(3)
+        )
+        results = (await db_session.execute(query)).all()
+
+    chat_hist = [(x.question, x.answer) for x in results]
+    chat_hist.reverse()
+
+    return chat_hist
+
+
 def add_history(
     session_id: str,
     collection: str,
@@ -142,6 +176,51 @@ def add_history(
         return chat_history_store
 
 
+async def async_add_history(
+    session_id: str,
+    collection: str,
+    question: str,
+    answer: str,
+    metadata: dict | None = None,
+    chat_source: str | None = None,
+) -> (ChatHistoryStore | None):
+    """Save chat history item to database, using the async engine if available"""
+    if not is_valid_uuid(session_id):
+        return None
+    db_session = async_db_session()
+    if db_session is None:
+        return await asyncio.to_thread(
+            add_history,
+            session_id=session_id,
+            collection=collection,
+            question=question,
+            answer=answer,
+            metadata=metadata,
+            chat_source=chat_source,
+        )
+
+    async with db_session:
+        collection_uuid = None  # Default empty UUID
+        if collection:
+            query = sqlalchemy.select(CollectionStore.uuid).where(
+                CollectionStore.name == collection
+            )
+            collection_uuid = (await db_session.execute(query)).scalars().first()
+
+        chat_history_store = ChatHistoryStore(
+            session_id=session_id,
+            collection_id=collection_uuid,
+            question=question,
+            answer=answer,
+            cmetadata=metadata,
+            chat_source=chat_source,
+        )
+        db_session.add(chat_history_store)
+        await db_session.commit()
+
+        return chat_history_store
+
+
 class ChatHistoryFilter(PydanticModel):
     """ Chat history filter """
     min_date: str | None = None
@@ -150,6 +229,8 @@ class ChatHistoryFilter(PydanticModel):
     session_id: str | None = None
     page: int = 1
     page_size: int = 50
+    cursor: str | None = None  # keyset pagination, empty for first page
+    count: CountMode = 'exact'
 
 
 def get_collection_filter(collection_name):
@@ -191,10 +272,19 @@ def get_history(filter: ChatHistoryFilter) -> dict:  # pylint: disable=redefined
             filter_collection=filter_collection,
             filter_session_id=filter_session_id,
         )
+        if filter.cursor is not None:
+            return query_data_cursor(
+                query=query,
+                keys=[ChatHistoryStore.created, ChatHistoryStore.uuid],
+                cursor=filter.cursor,
+                page_size=filter.page_size,
+                count=filter.count,
+            )
         result = query_data_pagination(
             query=query,
             page=filter.page,
-            page_size=filter.page_size
+            page_size=filter.page_size,
+            count=filter.count,
         )
         return result
 
@@ -216,10 +306,19 @@ def get_history_sessions(filter: ChatHistoryFilter) -> dict:
             filter_max_date=ChatHistoryStore.created <= max_date,
             filter_collection=filter_collection,
         )
+        if filter.cursor is not None:
+            return query_data_cursor(
+                query=query,
+                keys=[ChatHistoryStore.created, ChatHistoryStore.session_id],
+                cursor=filter.cursor,
+                page_size=filter.page_size,
+                count=filter.count,
+            )
         result = query_data_pagination(
             query=query,
             page=filter.page,
-            page_size=filter.page_size
+            page_size=filter.page_size,
+            count=filter.count,
         )
         return result
 
@@ -0,0 +1,317 @@
+"""
+Collections routing: embeddings centroids of each collection, kept up to date
+while documents are indexed, are used to search only the collections closest
+to a query in a multiple collections search
+"""
+from typing import Any
+from uuid import uuid4
+import numpy as np
+import sqlalchemy
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert
+from sqlalchemy.orm import Session
+from langchain_community.vectorstores.pgembedding import (
+    BaseModel,
+    CollectionStore,
+    EmbeddingStore,
+)
+from pgvector.sqlalchemy import Vector
+from brevia import connection
+from brevia.collections import single_collection_by_name
+from brevia.settings import get_settings
+
+# max number of embeddings sampled to compute k-means centroids
+KMEANS_SAMPLE_SIZE = 10000
+# k-means iterations on sampled embeddings
+KMEANS_ITERATIONS = 20
+# embeddings read per round trip when refreshing centroids
+REFRESH_BATCH_SIZE = 1000
+
+
+class CollectionCentroidStore(BaseModel):
+    # pylint: disable=too-few-public-methods
+    """ Collection embeddings centroids table """
+    __tablename__ = "collection_centroids"
+    __table_args__ = (
+        UniqueConstraint(
+            'collection_id', 'position', name='uq_collection_centroids_position'
+        ),
+    )
+
+    collection_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(f'{CollectionStore.__tablename__}.uuid', ondelete='CASCADE'),
+        nullable=False,
+    )
+    position = Column(Integer, nullable=False, comment='Centroid position')
+    vector_sum = Column(
+        Vector(), nullable=False, comment='Sum of embeddings assigned to centroid'
+    )
+    count = Column(
+        BigInteger, nullable=False, comment='Number of embeddings assigned to centroid'
+    )
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale vectors, as matrix rows, to unit length"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def read_centroids(session: Session, collection_id: Any) -> dict[int, np.ndarray]:
+    """Centroids embeddings sums of a collection, by position"""
+    query = sqlalchemy.select(
+        CollectionCentroidStore.position,
+        CollectionCentroidStore.vector_sum,
+    ).where(CollectionCentroidStore.collection_id == collection_id)
+
+    return {
+        row.position: np.asarray(row.vector_sum, dtype=np.float64)
+        for row in session.execute(query)
+    }
+
+
+class CentroidsUpdate:
+    """
+    Incremental update of a collection centroids: embeddings added are assigned
+    to the closest centroid, by cosine similarity, and summed up; missing
+    centroids are seeded with the first embeddings. Removed embeddings are
+    subtracted from their closest centroid. Centroids store embeddings
+    sums and counts, so concurrent updates simply add up.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        collection_id: Any,
+        size: int | None = None,
+    ):
+        self.collection_id = collection_id
+        self.size = get_settings().collection_centroids if size is None else size
+        self.centroids = read_centroids(session, collection_id) if self.size else {}
+        self.sums: dict[int, np.ndarray] = {}
+        self.counts: dict[int, int] = {}
+
+    def add(self, embeddings: list[list[float]] | np.ndarray) -> None:
+        """Assign embeddings to centroids"""
+        if not self.size or len(embeddings) == 0:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float64)
+        free = [pos for pos in range(self.size) if pos not in self.centroids]
+        for position, vector in zip(free, vectors):
+            self.centroids[position] = vector
+        self.assign(vectors)
+
+    def remove(self, embeddings: list[list[float]] | np.ndarray) -> None:
+        """Subtract removed embeddings from centroids"""
+        if not self.centroids or len(embeddings) == 0:
+            return
+        self.assign(np.asarray(embeddings, dtype=np.float64), sign=-1)
+
+    def assign(self, vectors: np.ndarray, sign: int = 1) -> None:
+        """Add, or subtract with negative `sign`, vectors to closest centroids"""
+        positions = sorted(self.centroids)
+        matrix = normalize(np.stack([self.centroids[pos] for pos in positions]))
+        assigned = np.argmax(normalize(vectors) @ matrix.T, axis=1)
+        for idx, position in enumerate(positions):
+            mask = assigned == idx
+            if not mask.any():
+                continue
+            vector_sum = sign * vectors[mask].sum(axis=0)
+            count = sign * int(mask.sum())
+            self.sums[position] = self.sums.get(position, 0) + vector_sum
+            self.counts[position] = self.counts.get(position, 0) + count
+
+    def save(self, session: Session) -> None:
+        """
+        Add assigned embeddings sums and counts to stored centroids,
+        centroids left without embeddings are deleted
+        """
+        if not self.counts:
+            return
+        removed = min(self.counts.values()) <= 0
+        statement = insert(CollectionCentroidStore).values([
+            {
+                'uuid': uuid4(),
+                'collection_id': self.collection_id,
+                'position': position,
+                'vector_sum': self.sums[position],
+                'count': count,
+            }
+            for position, count in self.counts.items()
+        ])
+        table = CollectionCentroidStore.__table__
+        statement = statement.on_conflict_do_update(
+            index_elements=['collection_id', 'position'],
+            set_={
+                'vector_sum': table.c.vector_sum + statement.excluded.vector_sum,
+                'count': table.c.count + statement.excluded.count,
+            },
+        )
+        session.execute(statement)
+        if removed:
+            session.execute(
+                sqlalchemy.delete(CollectionCentroidStore).where(
+                    CollectionCentroidStore.collection_id == self.collection_id,
+                    CollectionCentroidStore.count <= 0,
+                )
+            )
+        self.sums = {}
+        self.counts = {}
+
+
+def update_centroids(
+    session: Session,
+    collection_id: Any,
+    embeddings: list[list[float]],
+) -> None:
+    """Update a collection centroids with added embeddings, in current transaction"""
+    update = CentroidsUpdate(session=session, collection_id=collection_id)
+    update.add(embeddings)
+    update.save(session)
+
+
+def delete_embeddings(
+    session: Session,
+    update: CentroidsUpdate,
+    *criteria: Any,
+) -> None:
+    """
+    Delete embeddings matching `criteria`, in current transaction: deleted
+    embeddings are subtracted from centroids by `update`, saved by the caller
+    """
+    statement = sqlalchemy.delete(EmbeddingStore).where(*criteria)
+    if not update.centroids:
+        session.execute(statement)
+        return
+    embedding = sqlalchemy.type_coerce(EmbeddingStore.embedding, Vector())
+    removed = session.execute(statement.returning(embedding)).scalars().all()
+    if removed:
+        update.remove(np.stack(removed))
+
+
+def kmeans_centroids(vectors: np.ndarray, size: int, seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids of vectors, as unit length matrix rows"""
+    points = normalize(np.asarray(vectors, dtype=np.float64))
+    rng = np.random.default_rng(seed)
+    size = min(size, len(points))
+    centroids = points[rng.choice(len(points), size=size, replace=False)]
+    for _ in range(KMEANS_ITERATIONS):
+        assigned = np.argmax(points @ centroids.T, axis=1)
+        for idx in range(size):
+            members = points[assigned == idx]
+            if len(members):
+                centroids[idx] = members.sum(axis=0)
+        centroids = normalize(centroids)
+
+    return centroids
+
+
+def refresh_centroids(collection_name: str, size: int | None = None) -> int:
+    """
+    Recompute a collection centroids from all its embeddings, i.e. after
+    documents removal or to initialize centroids of an existing collection:
+    k-means centroids of a sample of embeddings are used as seeds.
+    Return the number of centroids.
+    """
+    collection = single_collection_by_name(collection_name)
+    if collection is None:
+        raise ValueError(f'Collection not found: {collection_name}')
+    size = get_settings().collection_centroids if size is None else size
+    with Session(connection.db_connection()) as session:
+        session.query(CollectionCentroidStore).filter(
+            CollectionCentroidStore.collection_id == collection.uuid
+        ).delete()
+        update = CentroidsUpdate(session, collection.uuid, size=size)
+        embedding = sqlalchemy.type_coerce(EmbeddingStore.embedding, Vector())
+        sample = session.execute(
+            sqlalchemy.select(embedding)
+            .where(EmbeddingStore.collection_id == collection.uuid)
+            .order_by(sqlalchemy.func.random())
+            .limit(KMEANS_SAMPLE_SIZE)
+        ).scalars().all()
+        if size and sample:
+            seeds = kmeans_centroids(np.stack(sample), size)
+            update.centroids = dict(enumerate(seeds))
+        query = (
+            sqlalchemy.select(embedding)
+            .where(EmbeddingStore.collection_id == collection.uuid)
+            .execution_options(yield_per=REFRESH_BATCH_SIZE)
+        )
+        for batch in session.execute(query).scalars().partitions():
+            update.add(np.stack(batch))
+        count = len(update.counts)
+        update.save(session)
+        session.commit()
+
+    return count
+
+
+def routing_statement(
+    collection_ids: list[list[str]],
+    embeddings: list[list[float]],
+) -> Any:
+    """
+    Cosine distance of each collection closest centroid from the query
+    embedding of its group, in a single query
+    """
+    # pylint: disable=not-callable
+    table = CollectionCentroidStore
+    statements = [
+        sqlalchemy.select(
+            table.collection_id,
+            sqlalchemy.func.min(
+                table.vector_sum.cosine_distance(embedding)
+            ).label('distance'),
+        )
+        .where(table.collection_id == sqlalchemy.any_(
+            sqlalchemy.cast(ids, ARRAY(UUID))
+        ))
+        .group_by(table.collection_id)
+        for ids, embedding in zip(collection_ids, embeddings)
+    ]
+
+    return sqlalchemy.union_all(*statements)
+
+
+def routed_collections(
+    rows: list[Any],
+    collection_ids: list[list[str]],
+    route_k: int,
+) -> set[str]:
+    """
+    Collections to search: the `route_k` collections closest to the query
+    and collections without centroids, not routed
+    """
+    distances = {str(row.collection_id): float(row.distance) for row in rows}
+    closest = sorted(distances, key=distances.get)[:route_k]
+    unknown = {cid for ids in collection_ids for cid in ids if cid not in distances}
+
+    return set(closest) | unknown
+
+
+def route_collections(
+    collection_ids: list[list[str]],
+    embeddings: list[list[float]],
+    route_k: int,
+) -> set[str]:
+    """Select collections to search with the query embeddings of their groups"""
+    statement = routing_statement(collection_ids, embeddings)
+    with Session(connection.db_connection()) as session:
+        rows = session.execute(statement).all()
+
+    return routed_collections(rows, collection_ids, route_k)
+
+
+async def aroute_collections(
+    collection_ids: list[list[str]],
+    embeddings: list[list[float]],
+    route_k: int,
+) -> set[str]:
+    """Select collections to search, using the async engine"""
+    statement = routing_statement(collection_ids, embeddings)
+    async with connection.async_db_session() as session:
+        rows = (await session.execute(statement)).all()
+
+    return routed_collections(rows, collection_ids, route_k)
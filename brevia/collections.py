@@ -1,5 +1,8 @@
 """Collections handling functions"""
+import asyncio
+from logging import getLogger
 from langchain_community.vectorstores.pgembedding import CollectionStore
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from brevia import connection
 from brevia.utilities.uuid import is_valid_uuid
@@ -56,6 +59,37 @@ def single_collection_by_name(name: str) -> (CollectionStore | None):
         return CollectionStore.get_by_name(session=session, name=name)
 
 
+async def async_single_collection_by_name(name: str) -> (CollectionStore | None):
+    """ Get single collection by name, using the async engine if available"""
+    session = connection.async_db_session()
+    if session is None:
+        return await asyncio.to_thread(single_collection_by_name, name)
+    async with session:
+        query = select(CollectionStore).where(CollectionStore.name == name)
+        return (await session.execute(query)).scalars().first()
+
+
+def collections_by_names(names: list[str]) -> list[CollectionStore]:
+    """ Get collections by names in a single query, in names order"""
+    with Session(connection.db_connection()) as session:
+        query = select(CollectionStore).where(CollectionStore.name.in_(names))
+        items = {item.name: item for item in session.execute(query).scalars()}
+
+    return [items[name] for name in names if name in items]
+
+
+async def async_collections_by_names(names: list[str]) -> list[CollectionStore]:
+    """ Get collections by names, using the async engine if available"""
+    session = connection.async_db_session()
+    if session is None:
+        return await asyncio.to_thread(collections_by_names, names)
+    async with session:
+        query = select(CollectionStore).where(CollectionStore.name.in_(names))
+        items = {item.name: item for item in (await session.execute(query)).scalars()}
+
+    return [items[name] for name in names if name in items]
+
+
 def create_collection(
     name: str,
     cmetadata: dict,
@@ -70,7 +104,11 @@ def create_collection(
         session.add(collection_store)
         session.commit()
 
-        return collection_store
+    # pylint: disable=import-outside-toplevel
+    from brevia.embedding_partitions import init_partition
+    init_partition(collection_store.uuid)
+
+    return collection_store
 
 
 def update_collection(
@@ -78,20 +116,63 @@ def update_collection(
     name: str,
     cmetadata: dict,
 ):
-    """ Update single collection """
+    """
+    Update single collection, documents text search vectors are not rebuilt
+    here: see `brevia.hybrid_search.refresh_documents_tsv`
+    """
     with Session(connection.db_connection()) as session:
         collection = session.get(CollectionStore, uuid)
+        old_name = collection.name
         collection.name = name
         collection.cmetadata = cmetadata
         session.add(collection)
         session.commit()
 
+    invalidate_stores(old_name, name)
+
 
 def delete_collection(
     uuid: str,
 ):
-    """ Delete single collection """
+    """
+    Delete single collection, with its embeddings: a collection partition
+    is emptied in the same transaction and dropped afterwards
+    """
+    # pylint: disable=import-outside-toplevel
+    from brevia.embedding_partitions import drop_partition, truncate_partition
     with Session(connection.db_connection()) as session:
         collection = session.get(CollectionStore, uuid)
+        name = collection.name
+        has_vector_index = bool((collection.cmetadata or {}).get('vector_index'))
+        has_prefix_index = bool((collection.cmetadata or {}).get('prefix_index'))
+        has_metadata_indexes = bool(
+            (collection.cmetadata or {}).get('filterable_metadata')
+        )
+        truncate_partition(session, uuid)
         session.delete(collection)
         session.commit()
+
+    invalidate_stores(name)
+    try:
+        drop_partition(uuid)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # collection is deleted, its empty partition can be dropped later on
+        getLogger(__name__).error('Error dropping partition of "%s" - %s', name, exc)
+    # pylint: disable=import-outside-toplevel
+    if has_vector_index:
+        from brevia.vector_index import drop_index
+        drop_index(uuid)
+    if has_prefix_index:
+        from brevia.vector_index import drop_index
+        drop_index(uuid, prefix=True)
+    if has_metadata_indexes:
+        from brevia.metadata_index import drop_metadata_indexes
+        drop_metadata_indexes(uuid)
+
+
+def invalidate_stores(*names: str):
+    """ Invalidate vector stores of changed collections """
+    # pylint: disable=import-outside-toplevel
+    from brevia.vector_store import invalidate_vector_stores
+    for name in names:
+        invalidate_vector_stores(name)
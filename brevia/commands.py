@@ -8,6 +8,14 @@ import click
 from brevia.alembic import current, upgrade, downgrade
 from brevia.alembic import revision as create_revision
 from brevia.async_jobs import cleanup_async_jobs
+from brevia.collections import collections_info, single_collection_by_name
+from brevia.hybrid_search import refresh_documents_tsv
+from brevia import (
+    collection_routing,
+    embedding_partitions,
+    metadata_index,
+    vector_index,
+)
 from brevia.index import update_links_documents
 from brevia.utilities import files_import, run_service, collections_io
 from brevia.tokens import create_token
@@ -164,13 +172,220 @@ def create_openapi(file_path: str, output: str):
 
 @click.command()
 @click.option("-c", "--collection", required=True, help="Collection name")
-def update_collection_links(collection: str):
+@click.option(
+    "--concurrency",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Max number of concurrent page fetches",
+)
+def update_collection_links(collection: str, concurrency: int):
     """Update index documents of a collection having `"type": "links"` in metadata."""
     init_logging()
-    num = update_links_documents(collection_name=collection)
+
+    def progress(done: int, total: int):
+        if done % 100 == 0 or done == total:
+            print(f'Processed {done}/{total} links')
+
+    num = update_links_documents(
+        collection_name=collection,
+        concurrency=concurrency,
+        progress=progress,
+    )
     print(f'Updated {num} links documents. Done!')
 
 
+def vector_index_options(func):
+    """Common vector index configuration options"""
+    options = [
+        click.option("-c", "--collection", required=True, help="Collection name"),
+        click.option(
+            "-t",
+            "--type",
+            "index_type",
+            type=click.Choice(['hnsw', 'ivfflat']),
+            help="Index type, defaults to hnsw",
+        ),
+        click.option(
+            "--dimension",
+            type=int,
+            help="Embeddings dimension, detected from collection data if missing",
+        ),
+        click.option(
+            "--distance",
+            type=click.Choice(['cosine', 'euclidean', 'max']),
+            help="Distance strategy, defaults to cosine",
+        ),
+        click.option("--m", type=int, help="HNSW max connections per layer"),
+        click.option("--ef-construction", type=int, help="HNSW build candidate list"),
+        click.option("--lists", type=int, help="IVFFlat number of lists"),
+        click.option("--ef-search", type=int, help="HNSW default query ef_search"),
+        click.option("--probes", type=int, help="IVFFlat default query probes"),
+        click.option(
+            "--storage",
+            type=click.Choice(['vector', 'halfvec', 'bit']),
+            help="Indexed vectors precision, defaults to vector (full precision)",
+        ),
+        click.option(
+            "--rerank-k",
+            type=int,
+            help="Candidates re-ranked with full precision vectors, "
+            "with halfvec or bit storage",
+        ),
+        click.option(
+            "--prefix",
+            is_flag=True,
+            default=False,
+            help="Truncated embeddings prefix index, dimension is the prefix length",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+
+    return func
+
+
+def index_options_conf(index_type: str | None, **kwargs) -> dict:
+    """Vector index configuration from command options"""
+    conf = {'type': index_type, **kwargs}
+
+    return {k: v for k, v in conf.items() if v is not None}
+
+
+@click.command()
+@vector_index_options
+def create_vector_index_cmd(
+    collection: str,
+    index_type: str | None,
+    prefix: bool,
+    **kwargs,
+):
+    """Create ANN vector index (HNSW or IVFFlat) of a collection."""
+    init_logging()
+    conf = vector_index.create_vector_index(
+        collection_name=collection,
+        conf=index_options_conf(index_type, **kwargs),
+        prefix=prefix,
+    )
+    print(f'Vector index created on "{collection}": {conf.model_dump_json()}')
+
+
+@click.command()
+@vector_index_options
+def rebuild_vector_index_cmd(
+    collection: str,
+    index_type: str | None,
+    prefix: bool,
+    **kwargs,
+):
+    """Rebuild ANN vector index of a collection, optionally with new options."""
+    init_logging()
+    conf = vector_index.rebuild_vector_index(
+        collection_name=collection,
+        conf=index_options_conf(index_type, **kwargs),
+        prefix=prefix,
+    )
+    print(f'Vector index rebuilt on "{collection}": {conf.model_dump_json()}')
+
+
+@click.command()
+@click.option("-c", "--collection", required=True, help="Collection name")
+@click.option(
+    "--prefix",
+    is_flag=True,
+    default=False,
+    help="Drop truncated embeddings prefix index",
+)
+def drop_vector_index_cmd(collection: str, prefix: bool):
+    """Drop ANN vector index of a collection."""
+    init_logging()
+    vector_index.drop_vector_index(collection_name=collection, prefix=prefix)
+    print(f'Vector index dropped on "{collection}"')
+
+
+@click.command()
+@click.option("-c", "--collection", required=True, help="Collection name")
+@click.option(
+    "-k",
+    "--key",
+    "keys",
+    multiple=True,
+    help="Filterable metadata key, read from collection metadata if missing",
+)
+def create_metadata_indexes_cmd(collection: str, keys: tuple[str, ...]):
+    """Create indexes on filterable metadata keys of a collection."""
+    init_logging()
+    keys = metadata_index.create_metadata_indexes(
+        collection_name=collection,
+        keys=list(keys) if keys else None,
+    )
+    print(f'Metadata indexes on "{collection}": {json.dumps(keys)}')
+
+
+@click.command()
+@click.option("-c", "--collection", required=True, help="Collection name")
+@click.option(
+    "--size",
+    default=None,
+    type=click.IntRange(min=0),
+    help="Number of centroids, defaults to COLLECTION_CENTROIDS setting",
+)
+def refresh_collection_centroids(collection: str, size: int | None):
+    """Recompute embeddings centroids of a collection, used in routing."""
+    init_logging()
+    num = collection_routing.refresh_centroids(collection_name=collection, size=size)
+    print(f'Centroids refreshed on "{collection}": {num}')
+
+
+@click.command()
+@click.option(
+    "-c",
+    "--collection",
+    "collections",
+    multiple=True,
+    help="Collection name, all collections if missing",
+)
+def refresh_documents_tsv_cmd(collections: tuple[str, ...]):
+    """Rebuild documents full-text search vectors, in batches."""
+    init_logging()
+    names = list(collections) or [item['name'] for item in collections_info()]
+    for name in names:
+        collection = single_collection_by_name(name)
+        if collection is None:
+            raise click.BadParameter(f'Collection not found: {name}')
+        num = refresh_documents_tsv(collection.uuid, collection.cmetadata)
+        print(f'Text search vectors rebuilt on "{name}": {num}')
+
+
+@click.command()
+@click.option(
+    "--revert",
+    is_flag=True,
+    default=False,
+    help="Convert back to a plain table",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Drop embeddings without a collection instead of aborting",
+)
+def partition_embeddings_cmd(revert: bool, force: bool):
+    """Convert the embeddings table to a partition per collection layout."""
+    init_logging()
+    try:
+        converted = embedding_partitions.convert_embeddings(
+            partitioned=not revert,
+            force=force,
+        )
+    except ValueError as exc:
+        raise click.ClickException(f'{exc}, use --force to drop them') from exc
+    layout = 'plain' if revert else 'partitioned'
+    if not converted:
+        print(f'Embeddings table is already {layout}')
+        return
+    print(f'Embeddings table converted to {layout} layout')
+
+
 @click.command()
 @click.option(
     '--before-date',
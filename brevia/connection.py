@@ -1,8 +1,10 @@
 """ DB connection utility functions """
+import re
 import subprocess
 from functools import lru_cache
 import sys
-from sqlalchemy import create_engine
+from typing import Any, Iterator
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Connection
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import DatabaseError
@@ -29,6 +31,105 @@ def db_connection() -> Connection:
     return get_engine().connect()
 
 
+def async_connection_string() -> str | None:
+    """ Postgres+pgvector async db connection string, if an async driver is set """
+    driver = get_settings().pgvector_async_driver
+    if not driver:
+        return None
+
+    return re.sub(r'^postgresql(\+\w+)?://', f'postgresql+{driver}://',
+                  connection_string())
+
+
+@lru_cache
+def get_async_engine() -> Any:
+    """
+    Return async db engine (using lru_cache), `None` if no async driver is set:
+    in this case async db calls run sync functions in a worker thread
+    """
+    url = async_connection_string()
+    if url is None:
+        return None
+    try:
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy.ext.asyncio import create_async_engine
+    except ImportError as exc:
+        raise ImportError(
+            'SQLAlchemy asyncio is not installed, use `sqlalchemy[asyncio]`'
+        ) from exc
+
+    engine = create_async_engine(url, pool_size=get_settings().pgvector_pool_size)
+    if engine.dialect.driver == 'asyncpg':
+        # asyncpg needs a codec for the `vector` type
+        event.listen(engine.sync_engine, 'connect', register_asyncpg_vector)
+
+    return engine
+
+
+def async_db_session() -> Any:
+    """ SQLAlchemy async db session, `None` if no async driver is set """
+    engine = get_async_engine()
+    if engine is None:
+        return None
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    return AsyncSession(engine, expire_on_commit=False)
+
+
+def register_asyncpg_vector(dbapi_connection: Any, _connection_record: Any) -> None:
+    """Register pgvector `vector` type codec on a new asyncpg connection"""
+    # pylint: disable=import-outside-toplevel
+    from pgvector.asyncpg import register_vector
+    dbapi_connection.run_async(register_vector)
+
+
+def execute_autocommit(statement: str) -> None:
+    """
+    Execute a SQL statement outside of a transaction block,
+    needed for statements like `CREATE INDEX CONCURRENTLY`
+    """
+    with get_engine().connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        conn.execute(text(statement))
+
+
+class CopyReader:
+    """File-like object reading `COPY` data lines lazily from an iterator"""
+
+    def __init__(self, lines: Iterator[str]):
+        self.lines = lines
+        self.buffer = ''
+
+    def read(self, size: int = -1) -> str:
+        """Read at most `size` characters, all remaining data if negative"""
+        while size < 0 or len(self.buffer) < size:
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.buffer += line
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+
+        return data
+
+
+def copy_from_stdin(session: Session, statement: str, file: Any) -> None:
+    """
+    Perform a `COPY ... FROM STDIN` statement in current session transaction,
+    reading data from a file-like object (psycopg2 and psycopg drivers)
+    """
+    dbapi_connection = session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        if hasattr(cursor, 'copy_expert'):
+            cursor.copy_expert(statement, file)
+            return
+        with cursor.copy(statement) as copy:
+            while data := file.read(65536):
+                copy.write(data)
+
+
 def test_connection() -> bool:
     """ Test db connection with a simple query """
     try:
@@ -59,6 +59,44 @@ def check_collection_name(name: str) -> CollectionStore:
     return collection
 
 
+async def async_check_collection_name(name: str) -> CollectionStore:
+    """Raise a 404 response if a collection name does not exist, async version"""
+    collection = await collections.async_single_collection_by_name(name)
+    if not collection:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"Collection name '{name}' was not found",
+        )
+
+    return collection
+
+
+def check_collection_names(names: list[str]) -> list[CollectionStore]:
+    """Raise a 404 response if some collection names do not exist"""
+    items = collections.collections_by_names(names)
+    missing_collections_error(names, items)
+
+    return items
+
+
+async def async_check_collection_names(names: list[str]) -> list[CollectionStore]:
+    """Raise a 404 response if some collection names do not exist, async version"""
+    items = await collections.async_collections_by_names(names)
+    missing_collections_error(names, items)
+
+    return items
+
+
+def missing_collections_error(names: list[str], items: list[CollectionStore]):
+    """Raise a 404 response listing missing collection names, if any"""
+    missing = sorted(set(names) - {item.name for item in items})
+    if missing:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND,
+            f"Collection names {', '.join(repr(n) for n in missing)} were not found",
+        )
+
+
 def check_collection_uuid(uuid: str):
     """Raise a 404 response if a collection uuid does not exist"""
     if not collections.collection_exists(uuid=uuid):
@@ -0,0 +1,376 @@
+"""
+Opt-in partitioned layout of the embeddings table: `langchain_pg_embedding`
+is LIST partitioned on `collection_id`, each collection has its own partition.
+The table layout is converted by `convert_embeddings`, see
+`partition_embeddings` command.
+"""
+import re
+from logging import getLogger
+from typing import Any
+from uuid import UUID
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+from brevia import connection
+
+EMBEDDING_TABLE = 'langchain_pg_embedding'
+# new embeddings table, filled and then swapped with the current one
+NEW_TABLE = f'{EMBEDDING_TABLE}_converted'
+# ids of rows changed while data are copied
+CHANGES_TABLE = f'{EMBEDDING_TABLE}_changes'
+# rows copied in a single transaction
+COPY_BATCH_SIZE = 10000
+# vector and metadata indexes of a collection, with collection id
+COLLECTION_INDEX = re.compile(r'^ix_embedding_(?:vec|pre|meta)_([0-9a-f]{32})')
+# index definition, as returned by `pg_get_indexdef`
+INDEX_DEFINITION = re.compile(r'^(CREATE (?:UNIQUE )?INDEX )\S+ ON (?:ONLY )?\S+ ')
+# table of a trigger definition, as returned by `pg_get_triggerdef`
+TRIGGER_TABLE = re.compile(r' ON \S+ ')
+
+
+def partition_name(collection_id: Any) -> str:
+    """Embeddings table partition name of a collection"""
+    return f"{EMBEDDING_TABLE}_{str(collection_id).replace('-', '')}"
+
+
+def partition_literal(collection_id: Any) -> str:
+    """Collection id as a SQL literal, validated as UUID"""
+    return f"'{UUID(str(collection_id))}'"
+
+
+def is_partitioned(session: Session | Connection) -> bool:
+    """Check if the embeddings table is partitioned"""
+    query = text('SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)')
+
+    return session.execute(query, {'table': EMBEDDING_TABLE}).scalar() == 'p'
+
+
+def has_partition(session: Session, collection_id: Any) -> bool:
+    """Check if a collection has its own embeddings table partition"""
+    query = text('SELECT to_regclass(:table) IS NOT NULL')
+    params = {'table': partition_name(collection_id)}
+
+    return bool(session.execute(query, params).scalar())
+
+
+def is_attached(session: Session, collection_id: Any) -> bool:
+    """Check if a collection partition is attached to the embeddings table"""
+    query = text(
+        'SELECT EXISTS (SELECT 1 FROM pg_inherits '
+        'WHERE inhrelid = to_regclass(:table))'
+    )
+    params = {'table': partition_name(collection_id)}
+
+    return bool(session.execute(query, params).scalar())
+
+
+def index_table(collection_id: Any) -> str:
+    """
+    Table where collection indexes are created: its own partition
+    or the embeddings table if not partitioned
+    """
+    with Session(connection.db_connection()) as session:
+        if is_partitioned(session) and has_partition(session, collection_id):
+            return partition_name(collection_id)
+
+    return EMBEDDING_TABLE
+
+
+def init_partition(collection_id: Any) -> None:
+    """
+    Create the empty partition of a new collection if the embeddings table
+    is partitioned, see `create_partition`
+    """
+    with Session(connection.db_connection()) as session:
+        create_partition(session, collection_id)
+        session.commit()
+
+
+def create_partition(session: Session, collection_id: Any) -> None:
+    """
+    Create the empty partition of a collection in the session transaction,
+    if the embeddings table is partitioned: the partition is attached,
+    not created as partition, to avoid an exclusive lock on the embeddings table
+    """
+    if not is_partitioned(session) or has_partition(session, collection_id):
+        return
+    name = partition_name(collection_id)
+    session.execute(text(
+        f'CREATE TABLE {name} (LIKE {EMBEDDING_TABLE} '
+        'INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)'
+    ))
+    session.execute(text(
+        f'ALTER TABLE {EMBEDDING_TABLE} ATTACH PARTITION {name} '
+        f'FOR VALUES IN ({partition_literal(collection_id)})'
+    ))
+
+
+def truncate_partition(session: Session, collection_id: Any) -> None:
+    """
+    Empty the partition of a collection, if any, in the session transaction:
+    a collection row is then deleted without a cascading `DELETE`
+    """
+    if has_partition(session, collection_id):
+        session.execute(text(f'TRUNCATE {partition_name(collection_id)}'))
+
+
+def drop_partition(collection_id: Any) -> None:
+    """
+    Drop the partition of a collection, if any: the partition is detached
+    concurrently, without locking the embeddings table, then dropped.
+    A partition left detached by a previous failure is dropped too.
+    """
+    with Session(connection.db_connection()) as session:
+        if not has_partition(session, collection_id):
+            return
+        attached = is_attached(session, collection_id)
+
+    name = partition_name(collection_id)
+    if attached:
+        connection.execute_autocommit(
+            f'ALTER TABLE {EMBEDDING_TABLE} DETACH PARTITION {name} CONCURRENTLY'
+        )
+    connection.execute_autocommit(f'DROP TABLE IF EXISTS {name}')
+
+
+def orphan_rows(conn: Connection) -> int:
+    """Number of embeddings without a collection, not kept by partitions"""
+    query = text(
+        f'SELECT count(*) FROM {EMBEDDING_TABLE} e WHERE e.collection_id IS NULL '
+        'OR NOT EXISTS (SELECT 1 FROM langchain_pg_collection c '
+        'WHERE c.uuid = e.collection_id)'
+    )
+
+    return conn.execute(query).scalar()
+
+
+def convert_embeddings(partitioned: bool, force: bool = False) -> bool:
+    """
+    Convert the embeddings table to the partitioned layout, or back to a
+    plain table, without locking it while data are copied: a new table is
+    filled in batches and indexed, rows changed meanwhile are logged by a
+    trigger and copied again when tables are swapped, in a short final
+    transaction. Indexes, constraints and triggers are created again from
+    current table definitions.
+    Embeddings without a collection cannot be partitioned: conversion
+    is aborted with a `ValueError`, with `force` they are dropped.
+    Return `False` if the table already has the requested layout.
+    """
+    log = getLogger(__name__)
+    engine = connection.get_engine()
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        if is_partitioned(conn) == partitioned:
+            return False
+        orphans = orphan_rows(conn) if partitioned else 0
+        if orphans:
+            log.warning('Embeddings without a collection: %d', orphans)
+            if not force:
+                raise ValueError(
+                    f'{orphans} embeddings without a collection would be dropped'
+                )
+        indexes, foreign_keys, triggers = table_definitions(conn)
+        # collections with a partition in the new layout
+        ids = collection_ids(conn) if partitioned else []
+        execute(conn, prepare_statements(ids, partitioned))
+        copy_rows(conn, ids, partitioned)
+        targets = index_targets(indexes, ids, partitioned)
+        execute(conn, index_statements(indexes, targets, partitioned))
+        execute(conn, [
+            f'ALTER TABLE {NEW_TABLE} ADD CONSTRAINT {name} {definition}'
+            for name, definition in foreign_keys
+        ] + [f'ANALYZE {NEW_TABLE}'])
+
+    with engine.begin() as conn:
+        swap_tables(conn, partitioned)
+        execute(conn, [
+            f'ALTER INDEX {temp_index_name(num)} RENAME TO {indexes[num][0]}'
+            for num in targets
+        ] + [
+            TRIGGER_TABLE.sub(f' ON {EMBEDDING_TABLE} ', definition, count=1)
+            for definition in triggers
+        ])
+    log.info('Embeddings table converted, partitioned: %s', partitioned)
+
+    return True
+
+
+def execute(conn: Connection, statements: list[str]) -> None:
+    """Execute SQL statements"""
+    for statement in statements:
+        conn.execute(text(statement))
+
+
+def table_definitions(conn: Connection) -> tuple[list, list, list]:
+    """
+    Definitions of indexes, foreign keys and triggers of the embeddings table:
+    indexes of the table and of its partitions, not inherited, except the
+    primary key
+    """
+    params = {'table': EMBEDDING_TABLE}
+    indexes = conn.execute(text(
+        'SELECT c.relname, pg_get_indexdef(x.indexrelid) FROM pg_index x '
+        'JOIN pg_class c ON c.oid = x.indexrelid '
+        'WHERE NOT x.indisprimary AND ('
+        'x.indrelid = CAST(:table AS regclass) '
+        'OR (x.indrelid IN (SELECT inhrelid FROM pg_inherits '
+        'WHERE inhparent = CAST(:table AS regclass)) '
+        'AND x.indexrelid NOT IN (SELECT inhrelid FROM pg_inherits))) '
+        'ORDER BY c.relname'
+    ), params).all()
+    foreign_keys = conn.execute(text(
+        'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+        "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'"
+    ), params).all()
+    triggers = conn.execute(text(
+        'SELECT pg_get_triggerdef(oid) FROM pg_trigger '
+        'WHERE tgrelid = CAST(:table AS regclass) AND NOT tgisinternal '
+        "AND tgname <> 'embedding_changes_log_trigger'"
+    ), params).scalars().all()
+
+    return list(indexes), list(foreign_keys), list(triggers)
+
+
+def collection_ids(conn: Connection) -> list[str]:
+    """Ids of all collections"""
+    query = text('SELECT uuid FROM langchain_pg_collection ORDER BY uuid')
+
+    return [str(item) for item in conn.execute(query).scalars()]
+
+
+def partition_statement(collection_id: str) -> str:
+    """Create a collection partition of the new table"""
+    return (
+        f'CREATE TABLE IF NOT EXISTS {partition_name(collection_id)} '
+        f'PARTITION OF {NEW_TABLE} FOR VALUES IN ({partition_literal(collection_id)})'
+    )
+
+
+def prepare_statements(ids: list[str], partitioned: bool) -> list[str]:
+    """
+    New table, with collections partitions, and changes log trigger;
+    leftovers of a failed conversion are removed first
+    """
+    statements = [
+        f'DROP TRIGGER IF EXISTS embedding_changes_log_trigger ON {EMBEDDING_TABLE}',
+        'DROP FUNCTION IF EXISTS embedding_changes_log()',
+        f'DROP TABLE IF EXISTS {CHANGES_TABLE}',
+        f'DROP TABLE IF EXISTS {NEW_TABLE} CASCADE',
+        f'CREATE TABLE {NEW_TABLE} (LIKE {EMBEDDING_TABLE} '
+        'INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)'
+        + (' PARTITION BY LIST (collection_id)' if partitioned else ''),
+        f'CREATE TABLE {CHANGES_TABLE} (uuid uuid NOT NULL)',
+        f"""
+        CREATE FUNCTION embedding_changes_log() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                INSERT INTO {CHANGES_TABLE} VALUES (OLD.uuid);
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO {CHANGES_TABLE} VALUES (NEW.uuid);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        'CREATE TRIGGER embedding_changes_log_trigger '
+        f'AFTER INSERT OR UPDATE OR DELETE ON {EMBEDDING_TABLE} '
+        'FOR EACH ROW EXECUTE FUNCTION embedding_changes_log()',
+    ]
+    if not partitioned:
+        # partition key is not null, being part of the primary key
+        return statements + [
+            f'ALTER TABLE {NEW_TABLE} ALTER COLUMN collection_id DROP NOT NULL'
+        ]
+
+    return statements + [partition_statement(item) for item in ids]
+
+
+def copy_rows(conn: Connection, ids: list[str], partitioned: bool) -> None:
+    """
+    Copy embeddings to the new table in batches, a transaction each; rows
+    of collections created meanwhile are copied when tables are swapped
+    """
+    condition = 'TRUE'
+    params = {'last': '00000000-0000-0000-0000-000000000000'}
+    if partitioned:
+        condition = 'collection_id = ANY(CAST(:ids AS uuid[]))'
+        params['ids'] = ids
+    statement = text(
+        f'WITH copied AS (INSERT INTO {NEW_TABLE} '
+        f'SELECT * FROM {EMBEDDING_TABLE} WHERE {condition} '
+        f'AND uuid > CAST(:last AS uuid) ORDER BY uuid LIMIT {COPY_BATCH_SIZE} '
+        'RETURNING uuid) SELECT max(CAST(uuid AS text)) FROM copied'
+    )
+    while params['last'] is not None:
+        params['last'] = conn.execute(statement, params).scalar()
+
+
+def temp_index_name(num: int) -> str:
+    """Temporary name of a new table index"""
+    return f'ix_embedding_converted_{num}'
+
+
+def index_targets(
+    indexes: list,
+    ids: list[str],
+    partitioned: bool,
+) -> dict[int, str]:
+    """
+    Tables of indexes in the new layout, by index position: collection
+    indexes are created on the collection partition, skipped if missing,
+    other indexes on the new table
+    """
+    partitions = {item.replace('-', '') for item in ids}
+    targets = {}
+    for num, (name, _) in enumerate(indexes):
+        match = COLLECTION_INDEX.match(name)
+        if not partitioned or match is None:
+            targets[num] = NEW_TABLE
+        elif match.group(1) in partitions:
+            targets[num] = partition_name(match.group(1))
+
+    return targets
+
+
+def index_statements(
+    indexes: list,
+    targets: dict[int, str],
+    partitioned: bool,
+) -> list[str]:
+    """Primary key and indexes of the new table, with temporary names"""
+    primary_key = '(uuid, collection_id)' if partitioned else '(uuid)'
+
+    return [
+        f'ALTER TABLE {NEW_TABLE} '
+        f'ADD CONSTRAINT {NEW_TABLE}_pkey PRIMARY KEY {primary_key}'
+    ] + [
+        INDEX_DEFINITION.sub(
+            f'\\g<1>{temp_index_name(num)} ON {table} ', indexes[num][1], count=1
+        )
+        for num, table in targets.items()
+    ]
+
+
+def swap_tables(conn: Connection, partitioned: bool) -> None:
+    """
+    Copy rows changed while copying data, then replace the embeddings table
+    with the new one; partitions of collections created meanwhile are added
+    """
+    execute(conn, [
+        'LOCK TABLE langchain_pg_collection IN SHARE MODE',
+        f'LOCK TABLE {EMBEDDING_TABLE} IN ACCESS EXCLUSIVE MODE',
+    ])
+    if partitioned:
+        execute(conn, [partition_statement(item) for item in collection_ids(conn)])
+    changed = f'uuid IN (SELECT uuid FROM {CHANGES_TABLE})'
+    execute(conn, [
+        f'DELETE FROM {NEW_TABLE} WHERE {changed}',
+        f'INSERT INTO {NEW_TABLE} SELECT * FROM {EMBEDDING_TABLE} WHERE {changed}'
+        + (' AND collection_id IS NOT NULL' if partitioned else ''),
+        f'DROP TABLE {EMBEDDING_TABLE} CASCADE',
+        f'DROP TABLE {CHANGES_TABLE}',
+        'DROP FUNCTION embedding_changes_log()',
+        f'ALTER TABLE {NEW_TABLE} RENAME TO {EMBEDDING_TABLE}',
+        f'ALTER TABLE {EMBEDDING_TABLE} RENAME CONSTRAINT '
+        f'{NEW_TABLE}_pkey TO {EMBEDDING_TABLE}_pkey',
+    ])
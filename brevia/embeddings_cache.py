@@ -0,0 +1,248 @@
+"""
+Embeddings caches: persistent cache of text chunks embeddings, to avoid
+re-embedding unchanged chunks, and in-process cache of query embeddings
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from sqlalchemy import Column, String, TIMESTAMP, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from langchain_community.vectorstores.pgembedding import BaseModel
+from langchain_core.embeddings import Embeddings
+from pgvector.sqlalchemy import Vector
+from brevia.connection import db_connection
+from brevia.models import load_embeddings
+from brevia.settings import get_settings
+
+# max number of hashes per cache lookup or insert query
+LOOKUP_BATCH_SIZE = 500
+
+
+class EmbeddingsCacheStore(BaseModel):
+    # pylint: disable=too-few-public-methods,not-callable
+    """ Embeddings cache table """
+    __tablename__ = "embeddings_cache"
+    __table_args__ = (
+        UniqueConstraint('model_hash', 'text_hash', name='uq_embeddings_cache_key'),
+    )
+
+    model_hash = Column(
+        String(), nullable=False, comment='Embeddings model configuration hash'
+    )
+    text_hash = Column(String(), nullable=False, comment='Text content hash')
+    embedding = Column(Vector(), nullable=False, comment='Text embedding')
+    created = Column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.current_timestamp(),
+        comment='Creation timestamp',
+    )
+
+
+def embeddings_conf_hash(embeddings_conf: dict | None = None) -> str:
+    """Hash of an embeddings model configuration, default settings if missing"""
+    conf = embeddings_conf or get_settings().embeddings
+    data = json.dumps(conf, sort_keys=True, default=str)
+
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """Hash of a text chunk content"""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def read_cached_embeddings(
+    model_hash: str,
+    hashes: list[str],
+) -> dict[str, list[float]]:
+    """Read cached embeddings of a list of text hashes, in bulk"""
+    result = {}
+    with Session(db_connection()) as session:
+        for i in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            query = session.query(
+                EmbeddingsCacheStore.text_hash,
+                EmbeddingsCacheStore.embedding,
+            ).filter(
+                EmbeddingsCacheStore.model_hash == model_hash,
+                EmbeddingsCacheStore.text_hash.in_(hashes[i:i + LOOKUP_BATCH_SIZE]),
+            )
+            result.update({
+                row.text_hash: [float(val) for val in row.embedding]
+                for row in query
+            })
+
+    return result
+
+
+def save_cached_embeddings(
+    model_hash: str,
+    embeddings: dict[str, list[float]],
+) -> None:
+    """Save text hashes embeddings in cache, existing items are left untouched"""
+    if not embeddings:
+        return
+    values = [
+        {'model_hash': model_hash, 'text_hash': key, 'embedding': value}
+        for key, value in embeddings.items()
+    ]
+    with Session(db_connection()) as session:
+        # stay below Postgres bind parameters limit on big batches
+        for i in range(0, len(values), LOOKUP_BATCH_SIZE):
+            statement = insert(EmbeddingsCacheStore).values(
+                values[i:i + LOOKUP_BATCH_SIZE]
+            )
+            statement = statement.on_conflict_do_nothing(
+                constraint='uq_embeddings_cache_key'
+            )
+            session.execute(statement)
+        session.commit()
+
+
+def clear_embeddings_cache(embeddings_conf: dict | None = None) -> int:
+    """
+    Remove cached embeddings of an embeddings configuration,
+    or the whole cache if no configuration is passed
+    """
+    with Session(db_connection()) as session:
+        query = session.query(EmbeddingsCacheStore)
+        if embeddings_conf is not None:
+            model_hash = embeddings_conf_hash(embeddings_conf)
+            query = query.filter(EmbeddingsCacheStore.model_hash == model_hash)
+        count = query.delete()
+        session.commit()
+
+    return count
+
+
+class QueryEmbeddingsCache:
+    """
+    Bounded in-process LRU cache of query embeddings with a time to live,
+    keyed by (model configuration hash, normalized query text).
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[tuple, tuple[float, list[float]]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: tuple) -> list[float] | None:
+        """Get cached embedding, if any and not expired"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or (self.ttl and item[0] < time.monotonic()):
+                self._items.pop(key, None)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+
+            return item[1]
+
+    def set(self, key: tuple, embedding: list[float]) -> None:
+        """Add embedding to cache, removing least recently used items"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, embedding)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all items and reset counters"""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Cache counters, for monitoring"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._items),
+            'max_size': self.max_size,
+        }
+
+
+_QUERY_CACHE: QueryEmbeddingsCache | None = None
+
+
+def query_embeddings_cache() -> QueryEmbeddingsCache:
+    """Process-wide query embeddings cache, sized using settings"""
+    global _QUERY_CACHE  # pylint: disable=global-statement
+    settings = get_settings()
+    size = settings.query_embeddings_cache_size
+    ttl = settings.query_embeddings_cache_ttl
+    if _QUERY_CACHE is None:
+        _QUERY_CACHE = QueryEmbeddingsCache(max_size=size, ttl=ttl)
+    _QUERY_CACHE.max_size = size
+    _QUERY_CACHE.ttl = ttl
+
+    return _QUERY_CACHE
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text used as cache key, collapsing whitespaces"""
+    return ' '.join(text.split())
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper: documents embeddings are looked up in the persistent
+    cache by (model configuration hash, text hash) before calling the provider,
+    query embeddings in the in-process query embeddings cache.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_hash: str, persistent=True):
+        self.embeddings = embeddings
+        self.model_hash = model_hash
+        self.persistent = persistent
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if not self.persistent:
+            return self.embeddings.embed_documents(texts)
+        hashes = [text_hash(text) for text in texts]
+        cached = read_cached_embeddings(self.model_hash, list(set(hashes)))
+        missing = {}
+        for key, text in zip(hashes, texts):
+            if key not in cached:
+                missing[key] = text
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            new_items = dict(zip(missing.keys(), vectors))
+            save_cached_embeddings(self.model_hash, new_items)
+            cached.update(new_items)
+
+        return [cached[key] for key in hashes]
+
+    def embed_query(self, text: str) -> list[float]:
+        cache = query_embeddings_cache()
+        key = (self.model_hash, normalize_query(text))
+        embedding = cache.get(key)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(text)
+            cache.set(key, embedding)
+
+        return embedding
+
+
+def load_cached_embeddings(embeddings_conf: dict | None = None) -> CachedEmbeddings:
+    """
+    Load embeddings engine using the in-process query embeddings cache
+    and the persistent cache on documents embeddings,
+    unless disabled via `EMBEDDINGS_CACHE` setting
+    """
+    return CachedEmbeddings(
+        embeddings=load_embeddings(deepcopy(embeddings_conf)),
+        model_hash=embeddings_conf_hash(embeddings_conf),
+        persistent=get_settings().embeddings_cache,
+    )
@@ -1,9 +1,11 @@
 """ Event handling for Brevia. """
 from fastapi import FastAPI
 
+from brevia.index import init_splitting_data
 from brevia.providers import update_providers
 
 
 def app_events(app: FastAPI) -> None:
     """Add event handlers to FastAPI instance."""
     app.add_event_handler('startup', update_providers)
+    app.add_event_handler('startup', init_splitting_data)
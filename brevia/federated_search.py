@@ -0,0 +1,390 @@
+"""Federated vector search across multiple collections in a single query"""
+import json
+from typing import Any
+import sqlalchemy
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session
+from langchain_community.vectorstores.pgembedding import CollectionStore
+from langchain_community.vectorstores.pgvector import DistanceStrategy
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables.config import run_in_executor
+from brevia.collection_routing import aroute_collections, route_collections
+from brevia.connection import async_db_session, get_async_engine, get_engine
+from brevia.vector_index import rerank_k, search_settings
+from brevia.vector_store import BreviaPGVector, vector_store
+
+
+def embeddings_key(cmetadata: dict | None) -> str:
+    """Key of a collection embeddings configuration, used to group collections"""
+    return json.dumps((cmetadata or {}).get('embeddings'), sort_keys=True)
+
+
+def group_collections(
+    collections: list[CollectionStore],
+) -> dict[str, list[CollectionStore]]:
+    """Group collections sharing the same embeddings configuration"""
+    groups: dict[str, list[CollectionStore]] = {}
+    for collection in collections:
+        groups.setdefault(embeddings_key(collection.cmetadata), []).append(collection)
+
+    return groups
+
+
+def collection_stores(
+    collections: list[CollectionStore],
+    distance_strategy: DistanceStrategy = DistanceStrategy.COSINE,
+) -> list[list[BreviaPGVector]]:
+    """Vector stores of collections, grouped by embeddings configuration"""
+    return [
+        [
+            vector_store(
+                collection_name=collection.name,
+                collection_metadata=collection.cmetadata,
+                distance_strategy=distance_strategy,
+                collection_id=collection.uuid,
+            )
+            for collection in group
+        ]
+        for group in group_collections(collections).values()
+    ]
+
+
+def has_vector_index(store: BreviaPGVector, prefix: bool = False) -> bool:
+    """Check if a collection has its own vector index used in searches"""
+    if prefix and store.prefix_conf is not None:
+        return True
+
+    return store.index_conf is not None
+
+
+def group_nearest_statements(
+    stores: list[BreviaPGVector],
+    embedding: list[float],
+    k: int = 4,
+    filter: dict | None = None,  # pylint: disable=redefined-builtin
+    prefix: bool = False,
+) -> list[Any]:
+    """
+    Nearest items statements of collections sharing an embeddings configuration:
+    collections with a vector index are searched on their own to use it, others
+    are searched together with a `collection_id = ANY(...)` condition
+    """
+    # pylint: disable=protected-access
+    statements = []
+    pooled = []
+    for store in stores:
+        if not has_vector_index(store, prefix=prefix):
+            pooled.append(store)
+            continue
+        statements.append(store.nearest_statement(
+            [store.EmbeddingStore.uuid],
+            embedding,
+            k=k,
+            filter=filter,
+            prefix=prefix,
+        ))
+    if not pooled:
+        return statements
+
+    store = pooled[0]
+    table = store.EmbeddingStore
+    distance = store.column_distance(table.embedding)(embedding)
+    ids = [str(item.collection_id) for item in pooled]
+    filter_by = [table.collection_id == sqlalchemy.any_(
+        sqlalchemy.cast(ids, ARRAY(UUID))
+    )]
+    if filter:
+        filter_clauses = store._create_filter_clause(filter)
+        if filter_clauses is not None:
+            filter_by.append(filter_clauses)
+    statements.append(
+        sqlalchemy.select(table.uuid, distance.label('distance'))
+        .where(*filter_by)
+        .order_by(distance)
+        .limit(k)
+    )
+
+    return statements
+
+
+def federated_statement(
+    stores: list[list[BreviaPGVector]],
+    embeddings: list[list[float]],
+    k: int = 4,
+    filter: dict | None = None,  # pylint: disable=redefined-builtin
+    prefix: bool = False,
+) -> Any:
+    """
+    Single query of nearest items in collections groups, each group is searched
+    with its own query embedding; up to `k` items are read from each search
+    """
+    statements = []
+    for group, embedding in zip(stores, embeddings):
+        statements += group_nearest_statements(
+            group, embedding, k=k, filter=filter, prefix=prefix
+        )
+    table = stores[0][0].EmbeddingStore
+    nearest = sqlalchemy.union_all(*statements).subquery('nearest')
+
+    return (
+        sqlalchemy.select(table, nearest.c.distance)
+        .join(nearest, table.uuid == nearest.c.uuid)
+        .order_by(nearest.c.distance)
+    )
+
+
+def federated_settings_statements(
+    stores: list[list[BreviaPGVector]],
+    k: int = 4,
+    prefix: bool = False,
+    ef_search: int | None = None,
+    probes: int | None = None,
+) -> list[Any]:
+    """
+    `SET LOCAL` statements of vector index search settings of all collections,
+    the highest value is used when collections settings differ
+    """
+    values: dict[str, int] = {}
+    for store in [item for group in stores for item in group]:
+        conf = store.prefix_conf if prefix else store.index_conf
+        candidates = rerank_k(conf, k, prefix=prefix)
+        settings = search_settings(
+            conf, ef_search=ef_search, probes=probes, candidates=candidates
+        )
+        for name, value in settings.items():
+            values[name] = max(value, values.get(name, 0))
+
+    return [
+        sqlalchemy.text(f'SET LOCAL {name} = {int(value)}')
+        for name, value in values.items()
+    ]
+
+
+def routing_groups(stores: list[list[BreviaPGVector]]) -> list[list[str]]:
+    """Collection ids of each collections group"""
+    return [[str(store.collection_id) for store in group] for group in stores]
+
+
+def routed_stores(
+    stores: list[list[BreviaPGVector]],
+    embeddings: list[list[float]],
+    routed: set[str],
+) -> tuple[list[list[BreviaPGVector]], list[list[float]]]:
+    """Keep only routed collections stores, with their groups query embeddings"""
+    groups = [
+        ([store for store in group if str(store.collection_id) in routed], embedding)
+        for group, embedding in zip(stores, embeddings)
+    ]
+    groups = [(group, embedding) for group, embedding in groups if group]
+
+    return [group for group, _ in groups], [embedding for _, embedding in groups]
+
+
+def needs_routing(stores: list[list[BreviaPGVector]], route_k: int | None) -> bool:
+    """Check if collections should be routed, i.e. more than `route_k`"""
+    return bool(route_k) and sum(len(group) for group in stores) > route_k
+
+
+def normalize_scores(scores: list[float]) -> list[float]:
+    """
+    Min-max normalization of scores in the [0, 1] range,
+    all scores are 1.0 if they are equal
+    """
+    low = min(scores, default=0.0)
+    spread = max(scores, default=0.0) - low
+    if not spread:
+        return [1.0] * len(scores)
+
+    return [(score - low) / spread for score in scores]
+
+
+def federated_results(
+    results: list[Any],
+    stores: list[list[BreviaPGVector]],
+    k: int = 4,
+) -> list[tuple[Document, float]]:
+    """
+    Merge federated search results: distances are converted to relevance
+    scores by the vector store of each collections group, higher for more
+    relevant documents. Scores of different embeddings configurations are
+    not comparable, so with many groups they are min-max normalized within
+    each group before merging. The top `k` documents are returned with the
+    collection name in `collection` metadata.
+    """
+    # pylint: disable=protected-access
+    names = {
+        str(store.collection_id): store.collection_name
+        for group in stores for store in group
+    }
+    group_nums = {
+        str(store.collection_id): num
+        for num, group in enumerate(stores) for store in group
+    }
+    groups: dict[int, list[tuple[Document, float]]] = {}
+    for result in results:
+        collection_id = str(result.EmbeddingStore.collection_id)
+        num = group_nums.get(collection_id, 0)
+        relevance = stores[num][0]._select_relevance_score_fn()
+        doc = Document(
+            page_content=result.EmbeddingStore.document,
+            metadata={
+                **(result.EmbeddingStore.cmetadata or {}),
+                'collection': names.get(collection_id),
+            },
+        )
+        groups.setdefault(num, []).append((doc, relevance(float(result.distance))))
+
+    docs_and_scores = []
+    for items in groups.values():
+        scores = [score for _, score in items]
+        if len(groups) > 1:
+            scores = normalize_scores(scores)
+        docs_and_scores += [(doc, score) for (doc, _), score in zip(items, scores)]
+    docs_and_scores.sort(key=lambda item: item[1], reverse=True)
+
+    return docs_and_scores[:k]
+
+
+def federated_search_with_score(
+    query: str,
+    collections: list[CollectionStore],
+    k: int = 4,
+    distance_strategy: DistanceStrategy = DistanceStrategy.COSINE,
+    filter: dict | None = None,  # pylint: disable=redefined-builtin
+    prefix: bool = False,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    route_k: int | None = None,
+) -> list[tuple[Document, float]]:
+    """
+    Vector search across multiple collections in a single query: the query is
+    embedded once per embeddings configuration shared by collections.
+    With `route_k` only the `route_k` collections whose centroids are closest
+    to the query are searched, along with collections without centroids.
+    """
+    stores = collection_stores(collections, distance_strategy=distance_strategy)
+    embeddings = [group[0].embedding_function.embed_query(query) for group in stores]
+    if needs_routing(stores, route_k):
+        routed = route_collections(routing_groups(stores), embeddings, route_k)
+        stores, embeddings = routed_stores(stores, embeddings, routed)
+    statement = federated_statement(
+        stores, embeddings, k=k, filter=filter, prefix=prefix
+    )
+    settings = federated_settings_statements(
+        stores, k=k, prefix=prefix, ef_search=ef_search, probes=probes
+    )
+    with Session(get_engine()) as session:
+        for settings_statement in settings:
+            session.execute(settings_statement)
+        results = session.execute(statement).all()
+
+    return federated_results(results, stores, k=k)
+
+
+async def afederated_search_with_score(
+    query: str,
+    collections: list[CollectionStore],
+    k: int = 4,
+    distance_strategy: DistanceStrategy = DistanceStrategy.COSINE,
+    filter: dict | None = None,  # pylint: disable=redefined-builtin
+    prefix: bool = False,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    route_k: int | None = None,
+) -> list[tuple[Document, float]]:
+    """
+    Async federated vector search, using the async engine if available,
+    otherwise in a worker thread
+    """
+    search_kwargs = {
+        'k': k,
+        'distance_strategy': distance_strategy,
+        'filter': filter,
+        'prefix': prefix,
+        'ef_search': ef_search,
+        'probes': probes,
+        'route_k': route_k,
+    }
+    if get_async_engine() is None:
+        return await run_in_executor(
+            None, federated_search_with_score, query, collections, **search_kwargs
+        )
+    stores = collection_stores(collections, distance_strategy=distance_strategy)
+    embeddings = [
+        await group[0].embedding_function.aembed_query(query) for group in stores
+    ]
+    if needs_routing(stores, route_k):
+        routed = await aroute_collections(routing_groups(stores), embeddings, route_k)
+        stores, embeddings = routed_stores(stores, embeddings, routed)
+    statement = federated_statement(
+        stores, embeddings, k=k, filter=filter, prefix=prefix
+    )
+    settings = federated_settings_statements(
+        stores, k=k, prefix=prefix, ef_search=ef_search, probes=probes
+    )
+    async with async_db_session() as session:
+        for settings_statement in settings:
+            await session.execute(settings_statement)
+        results = (await session.execute(statement)).all()
+
+    return federated_results(results, stores, k=k)
+
+
+class FederatedRetriever(BaseRetriever):
+    """
+    Retriever of documents across multiple collections, documents below
+    `score_threshold` relevance score are discarded
+    """
+
+    collections: list[Any]
+    """Collections searched."""
+
+    search_kwargs: dict = {}
+    """
+    Search arguments: `k`, `filter`, `prefix`, `ef_search`, `probes`
+    and `route_k`.
+    """
+
+    distance_strategy: DistanceStrategy = DistanceStrategy.COSINE
+    """Distance strategy used in vector search."""
+
+    score_threshold: float = 0.0
+    """Min relevance score of retrieved documents."""
+
+    def _filter_documents(
+        self, docs_and_scores: list[tuple[Document, float]]
+    ) -> list[Document]:
+        """Add relevance score in metadata and apply score threshold"""
+        for doc, score in docs_and_scores:
+            doc.metadata['score'] = score
+
+        return [doc for doc, score in docs_and_scores if score >= self.score_threshold]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        docs_and_scores = federated_search_with_score(
+            query,
+            self.collections,
+            distance_strategy=self.distance_strategy,
+            **self.search_kwargs,
+        )
+
+        return self._filter_documents(docs_and_scores)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        docs_and_scores = await afederated_search_with_score(
+            query,
+            self.collections,
+            distance_strategy=self.distance_strategy,
+            **self.search_kwargs,
+        )
+
+        return self._filter_documents(docs_and_scores)
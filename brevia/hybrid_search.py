@@ -0,0 +1,104 @@
+"""Hybrid lexical + vector search configuration and full-text utilities"""
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from brevia import connection
+
+# full-text search vector column of embeddings table, handled by a trigger
+DOCUMENT_TSV_COLUMN = 'document_tsv'
+# session setting read by the trigger: text search configuration of written
+# rows, `off` skips the trigger; if missing it's read from the collection
+TEXT_SEARCH_SETTING = 'brevia.text_search_config'
+TEXT_SEARCH_OFF = 'off'
+# embeddings updated per transaction when text search vectors are rebuilt
+TSV_BATCH_SIZE = 1000
+
+
+class HybridSearchConf(BaseModel):
+    """
+    Hybrid search configuration, stored in collection `cmetadata`
+    under the `hybrid_search` key: documents text search vectors are
+    built only for collections having this key, even if empty.
+
+    Attributes:
+        language (str): Postgres text search configuration used to build
+            documents `tsvector` and queries, defaults to 'simple'.
+        vector_weight (float): Reciprocal-rank fusion weight of vector results.
+        text_weight (float): Reciprocal-rank fusion weight of full-text results.
+        rrf_k (int): Reciprocal-rank fusion smoothing constant.
+        fetch_k (int | None): Number of candidates read from each search,
+            defaults to four times the number of requested documents.
+    """
+    language: str = Field(default='simple', pattern=r'^[a-z_]+$')
+    vector_weight: float = Field(default=1.0, ge=0)
+    text_weight: float = Field(default=1.0, ge=0)
+    rrf_k: int = Field(default=60, ge=1)
+    fetch_k: int | None = Field(default=None, ge=1, le=1000)
+
+    def fetch_size(self, k: int) -> int:
+        """Number of candidates read from each search to return `k` documents"""
+        return self.fetch_k or 4 * k
+
+
+def hybrid_search_conf(cmetadata: dict | None) -> HybridSearchConf:
+    """Read hybrid search configuration from collection metadata"""
+    return HybridSearchConf(**((cmetadata or {}).get('hybrid_search') or {}))
+
+
+def text_search_config(cmetadata: dict | None) -> str | None:
+    """
+    Text search configuration of collection documents,
+    None if hybrid search is not enabled on the collection
+    """
+    if 'hybrid_search' not in (cmetadata or {}):
+        return None
+
+    return hybrid_search_conf(cmetadata).language
+
+
+def set_text_search_config(session: Session, cmetadata: dict | None) -> None:
+    """
+    Set text search configuration of a collection for rows written in
+    current transaction, so that the trigger does not read the collection
+    for every row and is skipped if hybrid search is not enabled
+    """
+    value = text_search_config(cmetadata) or TEXT_SEARCH_OFF
+    session.execute(
+        text('SELECT set_config(:name, :value, true)'),
+        {'name': TEXT_SEARCH_SETTING, 'value': value},
+    )
+
+
+def refresh_documents_tsv(collection_id: str, cmetadata: dict | None) -> int:
+    """
+    Rebuild full-text search vectors of a collection documents, in
+    transactions of `TSV_BATCH_SIZE` rows, i.e. after a change of the
+    collection text search language: vectors are removed if hybrid search
+    is not enabled. Return the number of updated rows.
+    """
+    config = text_search_config(cmetadata)
+    value = 'NULL'
+    if config is not None:
+        value = f"to_tsvector('{config}'::regconfig, COALESCE(e.document, ''))"
+    query = text(
+        'WITH batch AS ('
+        'SELECT uuid FROM langchain_pg_embedding '
+        'WHERE collection_id = :collection_id AND uuid > :last '
+        'ORDER BY uuid LIMIT :limit) '
+        f'UPDATE langchain_pg_embedding e SET document_tsv = {value} '
+        'FROM batch WHERE e.uuid = batch.uuid RETURNING e.uuid'
+    )
+    count = 0
+    params = {
+        'collection_id': str(collection_id),
+        'last': '00000000-0000-0000-0000-000000000000',
+        'limit': TSV_BATCH_SIZE,
+    }
+    while True:
+        with Session(connection.db_connection()) as session:
+            updated = list(session.execute(query, params).scalars())
+            session.commit()
+        if not updated:
+            return count
+        count += len(updated)
+        params['last'] = str(max(updated))
@@ -1,22 +1,58 @@
 """Index document with embeddings in vector database."""
+import asyncio
+import json
 from functools import lru_cache
+import itertools
 from os import path
+from typing import Any, Callable, Iterable, Iterator
+from urllib.parse import urlparse
+from uuid import uuid4
 from logging import getLogger
 from warnings import warn
 from langchain_community.vectorstores.pgembedding import CollectionStore
 from langchain_community.vectorstores.pgembedding import EmbeddingStore
-from langchain_community.vectorstores.pgvector import PGVector
 from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
 from langchain_text_splitters import NLTKTextSplitter
 from langchain_text_splitters.base import TextSplitter
-from requests import HTTPError
+import httpx
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from brevia import connection, load_file
+from brevia.collection_routing import (
+    CentroidsUpdate,
+    delete_embeddings,
+    update_centroids,
+)
 from brevia.collections import single_collection_by_name
-from brevia.models import load_embeddings
+from brevia.hybrid_search import set_text_search_config
 from brevia.settings import get_settings
-from brevia.utilities.json_api import query_data_pagination
+from brevia.text_splitters import ContentDefinedTextSplitter, RegexTextSplitter
+from brevia.utilities.json_api import (
+    CountMode, query_data_cursor, query_data_pagination,
+)
 from brevia.utilities.types import load_type
+from brevia.vector_store import invalidate_vector_stores, vector_store
+
+# embeddings table columns written by `copy_embeddings`
+EMBEDDING_COLUMNS = [
+    'uuid', 'collection_id', 'embedding', 'document', 'cmetadata', 'custom_id',
+]
+# special characters escaped in `COPY` text format
+COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+})
+# rows fetched per round trip when streaming documents metadata
+METADATA_BATCH_SIZE = 1000
+# text buffered before an incremental split, as a number of chunk sizes
+STREAM_SPLIT_CHUNKS = 20
+# NLTK sentence tokenizer data used by the default text splitter
+NLTK_PUNKT_RESOURCE = 'tokenizers/punkt_tab'
+# max number of text splitter instances kept in memory
+SPLITTERS_CACHE_SIZE = 32
 
 
 def init_index():
@@ -27,16 +63,27 @@ def init_index():
 
 @lru_cache
 def init_splitting_data() -> bool:
-    """Init splitting tools data (NLTK for now)"""
+    """
+    Init splitting tools data (NLTK for now): data are read from
+    `NLTK_DATA_PATH` local path or NLTK default paths if available,
+    downloaded otherwise
+    """
     try:
         import nltk  # pylint: disable=import-outside-toplevel
-        return nltk.download('punkt_tab')
-
     except ImportError as exc:
         raise ImportError(
             "NLTK is not installed!"
         ) from exc
 
+    data_path = get_settings().nltk_data_path
+    if data_path and data_path not in nltk.data.path:
+        nltk.data.path.insert(0, data_path)
+    try:
+        nltk.data.find(NLTK_PUNKT_RESOURCE)
+        return True
+    except LookupError:
+        return nltk.download('punkt_tab', download_dir=data_path or None)
+
 
 def load_pdf_file(
     # pylint: disable=too-many-arguments
@@ -54,7 +101,7 @@ def load_pdf_file(
     if not path.isfile(file_path):
         raise FileNotFoundError(file_path)
 
-    text = load_file.read_pdf_file(
+    pages = load_file.iter_pdf_pages(
         file_path=file_path,
         page_from=page_from,
         page_to=page_to,
@@ -62,13 +109,11 @@ def load_pdf_file(
     if metadata is None:
         metadata = {'source': path.basename(file_path)}
 
-    return add_document(
-        document=Document(
-            page_content=text,
-            metadata=metadata,
-        ),
+    return add_document_stream(
+        texts=pages,
         collection_name=collection_name,
         document_id=document_id,
+        metadata=metadata,
     )
 
 
@@ -80,23 +125,439 @@ def add_document(
     """ Add document to index and return number of splitted text chunks"""
     collection = single_collection_by_name(collection_name)
     coll_meta = collection.cmetadata if collection and collection.cmetadata else {}
-    embed_conf = coll_meta.get('embeddings', None)
     texts = split_document(
         document=document,
         collection_meta=coll_meta,
     )
-    PGVector.from_documents(
-        embedding=load_embeddings(embed_conf),
-        documents=texts,
+    if collection is None:
+        # collection will be created by the new vector store
+        invalidate_vector_stores(collection_name)
+    store = vector_store(
+        collection_name=collection_name,
+        collection_metadata=coll_meta,
+        collection_id=collection.uuid if collection else None,
+    )
+    embeddings = embed_texts(store=store, texts=texts)
+    with Session(connection.db_connection()) as session:
+        set_text_search_config(session, coll_meta)
+        copy_embeddings(
+            session=session,
+            rows=embedding_rows(
+                collection_id=store.collection_id,
+                chunks=[(document_id, text) for text in texts],
+                embeddings=embeddings,
+            ),
+        )
+        update_centroids(session, store.collection_id, embeddings)
+        session.commit()
+
+    return len(texts)
+
+
+def add_document_stream(
+    texts: Iterable[str],
+    collection_name: str,
+    document_id: str | None = None,
+    metadata: dict | None = None,
+    replace: bool = False,
+) -> int:
+    """
+    Add a document read as a stream of texts, like PDF pages, to index:
+    text chunks are split incrementally, embedded and written in batches of
+    `INDEX_BATCH_SIZE` items, so memory usage does not depend on document size.
+    With `replace` already indexed chunks of `document_id` are removed
+    in the same transaction. Return number of splitted text chunks.
+    """
+    collection = single_collection_by_name(collection_name)
+    coll_meta = collection.cmetadata if collection and collection.cmetadata else {}
+    if collection is None:
+        # collection will be created by the new vector store
+        invalidate_vector_stores(collection_name)
+    store = vector_store(
         collection_name=collection_name,
-        connection_string=connection.connection_string(),
-        ids=[document_id] * len(texts),
-        use_jsonb=True,
+        collection_metadata=coll_meta,
+        collection_id=collection.uuid if collection else None,
+    )
+    chunks = split_text_stream(
+        texts=texts,
+        metadata=metadata,
+        collection_meta=coll_meta,
+    )
+    count = 0
+    with Session(connection.db_connection()) as session:
+        set_text_search_config(session, coll_meta)
+        centroids = CentroidsUpdate(session, store.collection_id)
+        if replace and collection is not None:
+            delete_embeddings(
+                session,
+                centroids,
+                EmbeddingStore.collection_id == collection.uuid,
+                EmbeddingStore.custom_id == document_id,
+            )
+        for batch in batched(chunks, get_settings().index_batch_size):
+            embeddings = store.embeddings.embed_documents(
+                [text.page_content for text in batch]
+            )
+            copy_embeddings(
+                session=session,
+                rows=embedding_rows(
+                    collection_id=store.collection_id,
+                    chunks=[(document_id, text) for text in batch],
+                    embeddings=embeddings,
+                ),
+            )
+            centroids.add(embeddings)
+            count += len(batch)
+        centroids.save(session)
+        session.commit()
+
+    return count
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Group items of an iterable in lists of `size` items, last may be shorter"""
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def update_document(
+    document: Document,
+    collection_name: str,
+    document_id: str,
+    texts: list[Document] | None = None,
+) -> int:
+    """
+    Add or replace a document in index, only new or changed text chunks
+    are embedded and written; already splitted `texts` chunks can be passed.
+    Return number of splitted text chunks
+    """
+    collection = single_collection_by_name(collection_name)
+    if collection is None:
+        return add_document(
+            document=document,
+            collection_name=collection_name,
+            document_id=document_id,
+        )
+    coll_meta = collection.cmetadata or {}
+    if texts is None:
+        texts = split_document(document=document, collection_meta=coll_meta)
+    store = vector_store(
+        collection_name=collection.name,
+        collection_metadata=coll_meta,
+        collection_id=collection.uuid,
+    )
+    sync_documents_chunks(
+        collection_id=collection.uuid,
+        store=store,
+        chunks={document_id: texts},
     )
 
     return len(texts)
 
 
+def update_document_stream(
+    texts: Iterable[str],
+    collection_name: str,
+    document_id: str,
+    metadata: dict | None = None,
+) -> int:
+    """
+    Add or replace a document read as a stream of texts, like PDF pages:
+    texts are split incrementally and compared with stored chunks in batches
+    of `INDEX_BATCH_SIZE` items, only new chunks are embedded and written,
+    so memory usage does not depend on document size.
+    Stale chunks are removed in the same transaction.
+    Return number of splitted text chunks
+    """
+    collection = single_collection_by_name(collection_name)
+    if collection is None:
+        return add_document_stream(
+            texts=texts,
+            collection_name=collection_name,
+            document_id=document_id,
+            metadata=metadata,
+        )
+    coll_meta = collection.cmetadata or {}
+    store = vector_store(
+        collection_name=collection.name,
+        collection_metadata=coll_meta,
+        collection_id=collection.uuid,
+    )
+    stored = stored_chunks(collection.uuid, [document_id]).get(document_id, [])
+    available = available_chunks(stored)
+    chunks = split_text_stream(
+        texts=texts,
+        metadata=metadata,
+        collection_meta=coll_meta,
+    )
+    result = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    with Session(connection.db_connection()) as session:
+        set_text_search_config(session, coll_meta)
+        centroids = CentroidsUpdate(session, collection.uuid)
+        for batch in batched(chunks, get_settings().index_batch_size):
+            to_add, to_update = match_chunks(available, batch)
+            if to_update:
+                session.execute(update(EmbeddingStore), to_update)
+            if to_add:
+                embeddings = embed_texts(store=store, texts=to_add)
+                copy_embeddings(
+                    session=session,
+                    rows=embedding_rows(
+                        collection_id=collection.uuid,
+                        chunks=[(document_id, text) for text in to_add],
+                        embeddings=embeddings,
+                    ),
+                )
+                centroids.add(embeddings)
+            result['added'] += len(to_add)
+            result['updated'] += len(to_update)
+            result['unchanged'] += len(batch) - len(to_add) - len(to_update)
+        to_remove = [row['uuid'] for rows in available.values() for row in rows]
+        if to_remove:
+            delete_embeddings(session, centroids, EmbeddingStore.uuid.in_(to_remove))
+        centroids.save(session)
+        session.commit()
+
+    result['removed'] = len(to_remove)
+    getLogger(__name__).info('Documents chunks sync: %s', result)
+
+    return result['added'] + result['updated'] + result['unchanged']
+
+
+def add_documents_batch(
+    documents: dict[str, Document],
+    collection: CollectionStore,
+) -> dict[str, int | str]:
+    """
+    Add many documents to a collection index, replacing already indexed ones:
+    only new or changed text chunks are embedded and written.
+    Return number of text chunks per document id, or an error message;
+    on embeddings or database errors all documents are marked as failed.
+    """
+    log = getLogger(__name__)
+    coll_meta = collection.cmetadata or {}
+    results = {}
+    chunks = {}
+    for document_id, document in documents.items():
+        try:
+            texts = split_document(document=document, collection_meta=coll_meta)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            log.error('Error splitting document "%s" - %s', document_id, exc)
+            results[document_id] = str(exc)
+            continue
+        results[document_id] = len(texts)
+        chunks[document_id] = texts
+
+    try:
+        store = vector_store(
+            collection_name=collection.name,
+            collection_metadata=coll_meta,
+            collection_id=collection.uuid,
+        )
+        sync_documents_chunks(
+            collection_id=collection.uuid,
+            store=store,
+            chunks=chunks,
+        )
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        log.error('Error indexing documents of "%s" - %s', collection.name, exc)
+        results |= {document_id: str(exc) for document_id in chunks}
+
+    return results
+
+
+def available_chunks(stored: list[dict]) -> dict[str, list[dict]]:
+    """Stored chunks of a document grouped by content"""
+    available: dict[str, list[dict]] = {}
+    for row in stored:
+        available.setdefault(row['document'], []).append(row)
+
+    return available
+
+
+def match_chunks(
+    available: dict[str, list[dict]],
+    texts: list[Document],
+) -> tuple[list[Document], list[dict]]:
+    """
+    Match new text chunks with `available` stored chunks by content, matched
+    chunks are removed from `available`. Return new chunks to add and stored
+    chunks whose metadata must be updated (e.g. `part` renumbering)
+    """
+    to_add = []
+    to_update = []
+    for text in texts:
+        matches = available.get(text.page_content)
+        if not matches:
+            to_add.append(text)
+            continue
+        row = matches.pop(0)
+        if row['cmetadata'] != text.metadata:
+            to_update.append({'uuid': row['uuid'], 'cmetadata': text.metadata})
+
+    return to_add, to_update
+
+
+def chunks_diff(
+    stored: list[dict],
+    texts: list[Document],
+) -> tuple[list[Document], list[dict], list[Any]]:
+    """
+    Compare stored chunks of a document with new text chunks, matched by content.
+    Return new chunks to add, stored chunks whose metadata must be updated
+    (e.g. `part` renumbering) and stored chunks UUIDs to remove
+    """
+    available = available_chunks(stored)
+    to_add, to_update = match_chunks(available, texts)
+    to_remove = [row['uuid'] for rows in available.values() for row in rows]
+
+    return to_add, to_update, to_remove
+
+
+def stored_chunks(
+    collection_id: str,
+    document_ids: list[str],
+) -> dict[str, list[dict]]:
+    """Stored chunks of documents, without embeddings, by document id"""
+    stored: dict[str, list[dict]] = {}
+    with Session(connection.db_connection()) as session:
+        query = session.query(
+            EmbeddingStore.uuid,
+            EmbeddingStore.custom_id,
+            EmbeddingStore.document,
+            EmbeddingStore.cmetadata,
+        ).filter(
+            EmbeddingStore.collection_id == collection_id,
+            EmbeddingStore.custom_id.in_(document_ids),
+        )
+        for row in query.all():
+            stored.setdefault(row.custom_id, []).append(row._asdict())
+
+    return stored
+
+
+def sync_documents_chunks(
+    collection_id: str,
+    store: VectorStore,
+    chunks: dict[str, list[Document]],
+) -> dict[str, int]:
+    """
+    Replace indexed chunks of documents with new text chunks, in a single
+    transaction: unchanged chunks are kept, only new chunks are embedded and
+    written, metadata is updated in place and stale chunks are removed.
+    Return the number of added, updated, removed and unchanged chunks.
+    """
+    stored = stored_chunks(collection_id, list(chunks.keys()))
+    to_add = []
+    to_update = []
+    to_remove = []
+    for document_id, texts in chunks.items():
+        new_chunks, changed, stale = chunks_diff(stored.get(document_id, []), texts)
+        to_add.extend((document_id, text) for text in new_chunks)
+        to_update.extend(changed)
+        to_remove.extend(stale)
+
+    embeddings = embed_texts(store=store, texts=[text for _, text in to_add])
+    with Session(connection.db_connection()) as session:
+        set_text_search_config(session, store.collection_metadata)
+        centroids = CentroidsUpdate(session, collection_id)
+        if to_remove:
+            delete_embeddings(
+                session, centroids, EmbeddingStore.uuid.in_(to_remove)
+            )
+        if to_update:
+            session.execute(update(EmbeddingStore), to_update)
+        if to_add:
+            copy_embeddings(
+                session=session,
+                rows=embedding_rows(
+                    collection_id=collection_id,
+                    chunks=to_add,
+                    embeddings=embeddings,
+                ),
+            )
+            centroids.add(embeddings)
+        centroids.save(session)
+        session.commit()
+
+    total = sum(len(texts) for texts in chunks.values())
+    result = {
+        'added': len(to_add),
+        'updated': len(to_update),
+        'removed': len(to_remove),
+        'unchanged': total - len(to_add) - len(to_update),
+    }
+    getLogger(__name__).info('Documents chunks sync: %s', result)
+
+    return result
+
+
+def embed_texts(store: VectorStore, texts: list[Document]) -> list[list[float]]:
+    """Embed text chunks in batches of `INDEX_BATCH_SIZE` items"""
+    batch_size = get_settings().index_batch_size
+    result = []
+    for i in range(0, len(texts), batch_size):
+        result.extend(store.embeddings.embed_documents(
+            [text.page_content for text in texts[i:i + batch_size]]
+        ))
+
+    return result
+
+
+def embedding_rows(
+    collection_id: str,
+    chunks: list[tuple[str | None, Document]],
+    embeddings: list[list[float]],
+) -> Iterator[dict]:
+    """Embeddings table rows of (document id, text chunk) items"""
+    for (document_id, text), embedding in zip(chunks, embeddings):
+        yield {
+            'uuid': uuid4(),
+            'collection_id': collection_id,
+            'embedding': embedding,
+            'document': text.page_content,
+            'cmetadata': text.metadata,
+            'custom_id': document_id,
+        }
+
+
+def copy_value(value: Any) -> str:
+    """Format a single value using `COPY` text format"""
+    if value is None:
+        return '\\N'
+    if hasattr(value, 'tolist'):
+        value = value.tolist()
+    if isinstance(value, dict):
+        value = json.dumps(value)
+    elif isinstance(value, (list, tuple)):
+        value = '[' + ','.join(str(float(v)) for v in value) + ']'
+    else:
+        value = str(value)
+
+    return value.translate(COPY_ESCAPES)
+
+
+def copy_embeddings(session: Session, rows: Iterable[dict]) -> None:
+    """
+    Bulk write rows in embeddings table using `COPY FROM STDIN`,
+    rows are streamed in the current session transaction
+    """
+    lines = (
+        '\t'.join(copy_value(row[col]) for col in EMBEDDING_COLUMNS) + '\n'
+        for row in rows
+    )
+    statement = (
+        f"COPY {EmbeddingStore.__tablename__} ({', '.join(EMBEDDING_COLUMNS)}) "
+        'FROM STDIN'
+    )
+    connection.copy_from_stdin(
+        session=session,
+        statement=statement,
+        file=connection.CopyReader(lines),
+    )
+
+
 def split_document(
     document: Document, collection_meta: dict = {}
 ) -> list[Document]:
@@ -111,8 +572,50 @@ def split_document(
     return texts
 
 
+def split_text_stream(
+    texts: Iterable[str],
+    metadata: dict | None = None,
+    collection_meta: dict = {},
+) -> Iterator[Document]:
+    """
+    Split a stream of texts, like PDF pages, into text chunks incrementally.
+    Texts are joined in a buffer split once it exceeds `STREAM_SPLIT_CHUNKS`
+    chunk sizes: the last chunk is kept at the head of the next buffer
+    so that chunks do not depend on pages boundaries, unless it still
+    exceeds the buffer size.
+    """
+    init_splitting_data()
+    text_splitter = create_splitter(collection_meta)
+    chunk_size = getattr(text_splitter, '_chunk_size', get_settings().text_chunk_size)
+    window = STREAM_SPLIT_CHUNKS * chunk_size
+    meta = metadata or {}
+    parts = itertools.count(1)
+    buffer = ''
+    for text in texts:
+        if not text:
+            continue
+        buffer = f'{buffer} {text}' if buffer else text
+        if len(buffer) < window:
+            continue
+        splits = text_splitter.split_text(buffer)
+        buffer = splits.pop() if splits else ''
+        if len(buffer) >= window:
+            # splitter could not cut the last chunk: flush it to bound the buffer
+            splits.append(buffer)
+            buffer = ''
+        for split in splits:
+            yield Document(page_content=split, metadata={**meta, 'part': next(parts)})
+
+    buffer = buffer.strip()
+    for split in text_splitter.split_text(buffer) if buffer else []:
+        yield Document(page_content=split, metadata={**meta, 'part': next(parts)})
+
+
 def create_splitter(collection_meta: dict) -> TextSplitter:
-    """ Create text splitter"""
+    """
+    Create text splitter, instances are reused for the same splitter
+    configuration, chunk size and overlap
+    """
     settings = get_settings()
     custom_splitter = collection_meta.get(
         'text_splitter',
@@ -122,23 +625,35 @@ def create_splitter(collection_meta: dict) -> TextSplitter:
     chunk_overlap = int(
         collection_meta.get('chunk_overlap', settings.text_chunk_overlap)
     )
+    chunk_conf = {'chunk_size': chunk_size, 'chunk_overlap': chunk_overlap}
+    if custom_splitter:
+        chunk_conf.update(custom_splitter)
 
-    if not custom_splitter:
-        return NLTKTextSplitter(
-            separator="\n",
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
+    return cached_splitter(json.dumps(chunk_conf, sort_keys=True, default=str))
 
-    chunk_conf = {'chunk_size': chunk_size, 'chunk_overlap': chunk_overlap}
 
-    return create_custom_splitter({**chunk_conf, **custom_splitter})
+@lru_cache(maxsize=SPLITTERS_CACHE_SIZE)
+def cached_splitter(split_conf: str) -> TextSplitter:
+    """Create text splitter from a JSON configuration, once per configuration"""
+    conf = json.loads(split_conf)
+    if 'splitter' not in conf:
+        return NLTKTextSplitter(separator="\n", **conf)
+
+    return create_custom_splitter(conf)
 
 
 def create_custom_splitter(split_conf: dict) -> TextSplitter:
     """ Create custom text splitter"""
+    splitter_aliases = {
+        'regex': RegexTextSplitter,
+        'cdc': ContentDefinedTextSplitter,
+    }
+    split_conf = dict(split_conf)
     splitter_name = split_conf.pop('splitter', '')
-    splitter_class = load_type(splitter_name, TextSplitter)
+    if splitter_name in splitter_aliases:
+        splitter_class = splitter_aliases[splitter_name]
+    else:
+        splitter_class = load_type(splitter_name, TextSplitter)
 
     return splitter_class(**split_conf)
 
@@ -151,8 +666,9 @@ def remove_document(
     filter_document = EmbeddingStore.custom_id == document_id
     filter_collection = EmbeddingStore.collection_id == collection_id
     with Session(connection.db_connection()) as session:
-        query = session.query(EmbeddingStore).filter(filter_collection, filter_document)
-        query.delete()
+        centroids = CentroidsUpdate(session, collection_id)
+        delete_embeddings(session, centroids, filter_collection, filter_document)
+        centroids.save(session)
         session.commit()
 
 
@@ -184,8 +700,13 @@ def collection_documents(
     filter: dict[str, str] = {},
     page: int = 1,
     page_size: int = 50,
+    cursor: str | None = None,
+    count: CountMode = 'exact',
 ):
-    """ Read document `document_id` from collection index"""
+    """
+    Read documents chunks of a collection index, using keyset pagination
+    on chunk uuid if `cursor` is set
+    """
     query_filters = [EmbeddingStore.collection_id == collection_id]
     query_filters.extend(metadata_filters(filter=filter))
     with Session(connection.db_connection()) as session:
@@ -195,7 +716,21 @@ def collection_documents(
             EmbeddingStore.custom_id
         )
         query = query.filter(*query_filters)
-        return query_data_pagination(query=query, page=page, page_size=page_size)
+        if cursor is not None:
+            return query_data_cursor(
+                query=query,
+                keys=[EmbeddingStore.uuid],
+                cursor=cursor,
+                page_size=page_size,
+                count=count,
+                descending=False,
+            )
+        return query_data_pagination(
+            query=query,
+            page=page,
+            page_size=page_size,
+            count=count,
+        )
 
 
 def update_metadata(
@@ -212,32 +747,72 @@ def update_metadata(
         session.commit()
 
 
-def documents_metadata(
+def documents_metadata_query(
+    session: Session,
     collection_id: str,
     filter: dict[str, str] = {},
     document_id: str = None,
 ):
-    """ Read documents metadata of a collection"""
+    """Query unique documents metadata, one row per `custom_id`"""
     query_filters = [EmbeddingStore.collection_id == collection_id]
     if document_id:
         query_filters.append(EmbeddingStore.custom_id == document_id)
     query_filters.extend(metadata_filters(filter=filter))
+    query = session.query(EmbeddingStore.custom_id, EmbeddingStore.cmetadata)
+    query = query.filter(*query_filters)
+
+    return query.distinct(EmbeddingStore.custom_id).order_by(EmbeddingStore.custom_id)
+
+
+def documents_metadata(
+    collection_id: str,
+    filter: dict[str, str] = {},
+    document_id: str = None,
+):
+    """
+    Read documents metadata of a collection, deduplicated by document id
+    in the database and streamed with a server-side cursor
+    """
     with Session(connection.db_connection()) as session:
-        query = session.query(EmbeddingStore.custom_id, EmbeddingStore.cmetadata)
-        query = query.filter(*query_filters)
-        result = []
-        docs = []
-        for row in query.all():
-            item = row._asdict()
-            if item['custom_id'] not in docs:
-                docs.append(item['custom_id'])
-                result.append(item)
+        query = documents_metadata_query(
+            session=session,
+            collection_id=collection_id,
+            filter=filter,
+            document_id=document_id,
+        )
+
+        return [row._asdict() for row in query.yield_per(METADATA_BATCH_SIZE)]
+
+
+def documents_metadata_page(
+    collection_id: str,
+    filter: dict[str, str] = {},
+    document_id: str = None,
+    page: int = 1,
+    page_size: int = 50,
+):
+    """Read a page of documents metadata of a collection"""
+    with Session(connection.db_connection()) as session:
+        query = documents_metadata_query(
+            session=session,
+            collection_id=collection_id,
+            filter=filter,
+            document_id=document_id,
+        )
 
-        return result
+        return query_data_pagination(query=query, page=page, page_size=page_size)
 
 
-def update_links_documents(collection_name: str) -> int:
-    """ Update links document contents of a collection, if changed"""
+def update_links_documents(
+    collection_name: str,
+    concurrency: int = 10,
+    progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """
+    Update links document contents of a collection, if changed.
+    Pages are fetched concurrently using conditional requests, an optional
+    `progress` callback is invoked with processed and total links number
+    """
     log = getLogger(__file__)
     log.info('Updating links contents in "%s"', collection_name)
     collection = single_collection_by_name(collection_name)
@@ -246,29 +821,126 @@ def update_links_documents(collection_name: str) -> int:
         return 0
     docs_meta = documents_metadata(collection_id=collection.uuid,
                                    filter={'type': 'links'})
+
+    return asyncio.run(refresh_links(
+        collection=collection,
+        docs_meta=docs_meta,
+        concurrency=concurrency,
+        progress=progress,
+    ))
+
+
+def links_http_client(concurrency: int) -> httpx.AsyncClient:
+    """Pooled HTTP client used to refresh links"""
+    return httpx.AsyncClient(
+        timeout=get_settings().links_request_timeout,
+        limits=httpx.Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+        ),
+        follow_redirects=True,
+    )
+
+
+async def refresh_links(
+    collection: CollectionStore,
+    docs_meta: list[dict],
+    concurrency: int = 10,
+    progress: Callable[[int, int], None] | None = None,
+) -> int:
+    """
+    Refresh links documents with a bounded number of concurrent fetches,
+    globally and per host; return the number of updated documents
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    host_limit = get_settings().links_host_concurrency
+    hosts: dict[str, asyncio.Semaphore] = {}
+
+    async def refresh(client: httpx.AsyncClient, doc: dict) -> bool:
+        host = urlparse(doc['cmetadata'].get('url') or '').netloc
+        host_semaphore = hosts.setdefault(host, asyncio.Semaphore(host_limit))
+        return await refresh_link(
+            client=client,
+            collection=collection,
+            document_id=doc['custom_id'],
+            metadata=doc['cmetadata'],
+            semaphores=[semaphore, host_semaphore],
+        )
+
     count = 0
-    for doc in docs_meta:
-        try:
-            res = update_collection_link(
-                collection=collection,
-                document_id=doc['custom_id'],
-                document_medatata=doc['cmetadata']
-            )
-        except HTTPError as exc:
-            log.error('HTTP Error updating document "%s" - %s', doc['custom_id'], exc)
-            doc['cmetadata'] |= {'http_error': str(exc.response.status_code)}
-            update_metadata(collection_id=collection.uuid,
-                            document_id=doc['custom_id'],
-                            metadata=doc['cmetadata'])
-            res = False
-        count += 1 if res else 0
+    async with links_http_client(concurrency) as client:
+        tasks = [refresh(client, doc) for doc in docs_meta]
+        for num, task in enumerate(asyncio.as_completed(tasks), start=1):
+            count += 1 if await task else 0
+            if progress:
+                progress(num, len(tasks))
 
     return count
 
 
+async def refresh_link(
+    client: httpx.AsyncClient,
+    collection: CollectionStore,
+    document_id: str,
+    metadata: dict,
+    semaphores: list[asyncio.Semaphore],
+) -> bool:
+    """
+    Refresh a single link document: `ETag` and `Last-Modified` response headers
+    are saved in document metadata and used in the next conditional request,
+    unchanged pages are not downloaded nor parsed
+    """
+    log = getLogger(__file__)
+    url = metadata.get('url')
+    if not url:
+        log.error('Document "%s" has no URL metadata', document_id)
+        return False
+
+    html = None
+    if urlparse(url).scheme in ['http', 'https']:
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        try:
+            # per host slot first: tasks waiting on a busy host
+            # must not hold global slots
+            async with semaphores[1], semaphores[0]:
+                response = await client.get(url, headers=headers)
+        except httpx.HTTPError as exc:
+            log.error('Error fetching document "%s" - %s', document_id, exc)
+            return False
+        if response.status_code == 304:
+            return False
+        if response.is_error:
+            log.error('HTTP Error updating document "%s" - %s',
+                      document_id, response.status_code)
+            metadata |= {'http_error': str(response.status_code)}
+            await asyncio.to_thread(update_metadata,
+                                    collection_id=collection.uuid,
+                                    document_id=document_id,
+                                    metadata=metadata)
+            return False
+        for header, key in [('etag', 'etag'), ('last-modified', 'last_modified')]:
+            if response.headers.get(header):
+                metadata[key] = response.headers[header]
+        html = response.text
+
+    try:
+        return await asyncio.to_thread(update_collection_link,
+                                       collection=collection,
+                                       document_id=document_id,
+                                       document_medatata=metadata,
+                                       html=html)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        log.error('Error updating document "%s" - %s', document_id, exc)
+        return False
+
+
 def update_collection_link(collection: CollectionStore, document_id: str,
-                           document_medatata: dict) -> bool:
-    """ Update a document link in a collection"""
+                           document_medatata: dict, html: str | None = None) -> bool:
+    """ Update a document link in a collection, using `html` content if provided"""
     log = getLogger(__file__)
     url = document_medatata.get('url')
     if not url:
@@ -279,25 +951,33 @@ def update_collection_link(collection: CollectionStore, document_id: str,
         url=url,
         options=collection.cmetadata.get('link_load_options', [])
     )
-    text = load_file.read_html_url(url=url, **options)
+    if html is None:
+        text = load_file.read_html_url(url=url, **options)
+    else:
+        text = load_file.read_html(html=html, **options)
+    document_medatata.pop('http_error', None)
     document = Document(page_content=text, metadata=document_medatata)
+    # split once, chunks are used both to detect changes and to update index
+    texts = split_document(
+        document=document,
+        collection_meta=collection.cmetadata or {},
+    )
     if document_has_changed(document=document, collection_id=collection.uuid,
-                            document_id=document_id):
-        remove_document(collection_id=collection.uuid, document_id=document_id)
-        document.metadata.pop('http_error', None)
-        add_document(document=document, collection_name=collection.name,
-                     document_id=document_id)
+                            document_id=document_id, texts=texts):
+        update_document(document=document, collection_name=collection.name,
+                        document_id=document_id, texts=texts)
         return True
 
     return False
 
 
-def document_has_changed(document: Document, collection_id: str, document_id: str):
-    """ Check if a document has changed """
+def document_has_changed(document: Document, collection_id: str, document_id: str,
+                         texts: list[Document] | None = None):
+    """ Check if a document, or its already splitted `texts`, has changed """
     stored_docs = read_document(collection_id=collection_id, document_id=document_id)
     stored_docs.sort(key=lambda x: x['cmetadata'].get('part', 0))
 
-    splitted = split_document(document)
+    splitted = split_document(document) if texts is None else texts
     if len(stored_docs) != len(splitted):
         return True
     for i, stored_doc in enumerate(stored_docs):
@@ -1,10 +1,15 @@
 """Read text from a file with different formats"""
+import logging
 import os
 import re
 from importlib import import_module
 import mimetypes
 import tempfile
-from typing import List, Any
+import time
+from collections import deque
+from concurrent import futures
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Any, Iterable, Iterator
 from urllib.parse import urlparse
 from pathlib import Path
 import requests
@@ -14,6 +19,13 @@ from langchain_community.document_loaders.csv_loader import CSVLoader
 from langchain_community.document_loaders.pdf import PyPDFLoader, UnstructuredPDFLoader
 from langchain_community.document_loaders.text import TextLoader
 from langchain_core.documents import Document
+import pypdf
+from brevia.settings import get_settings
+
+# number of PDF pages extracted by a worker process in a single task
+PDF_PAGES_PER_TASK = 8
+# PDF file reader of a worker process, see `init_pdf_worker`
+_PDF_READER: pypdf.PdfReader | None = None
 
 
 def cleanup_text(text_in: str) -> str:
@@ -34,40 +46,324 @@ def read_pdf_file(
     """
     Load PDF file and return its textual content
     """
-    docs = load_documents_pdf(file_path=file_path, **loader_kwargs)
-    if page_from is not None:
-        docs = [x for x in docs if x.metadata['page'] >= (page_from - 1)]
-    if page_to is not None:
-        docs = [x for x in docs if x.metadata['page'] <= (page_to - 1)]
+    pages = iter_pdf_pages(
+        file_path=file_path,
+        page_from=page_from,
+        page_to=page_to,
+        **loader_kwargs,
+    )
 
-    return ' '.join([cleanup_text(item.page_content) for item in docs]).strip()
+    return ' '.join(pages).strip()
 
 
-def load_documents_pdf(file_path: str, **kwargs: Any) -> List[Document]:
+def iter_pdf_pages(
+    file_path: str,
+    page_from: int = None,  # from page, used in PDF
+    page_to: int = None,  # to page, used in PDF
+    **loader_kwargs: Any,
+) -> Iterator[str]:
     """
-    Load documents from PDF file, first try to extract text with PyPDF,
-    then use Unstructured and OCR to read
+    Read PDF file lazily and yield the cleaned up text of each page,
+    only a few pages at a time are kept in memory
     """
-    loader = PyPDFLoader(file_path=file_path)
-    docs = loader.load()
+    docs = iter_pdf_documents(
+        file_path=file_path,
+        page_from=page_from,
+        page_to=page_to,
+        **loader_kwargs,
+    )
+    for doc in docs:
+        yield cleanup_text(doc.page_content)
+
+
+def iter_pdf_documents(
+    file_path: str,
+    page_from: int = None,  # from page, used in PDF
+    page_to: int = None,  # to page, used in PDF
+    **kwargs: Any,
+) -> Iterator[Document]:
+    """
+    Read PDF file lazily and yield a document per page in page order,
+    pages text is extracted with PyPDF, serially or in parallel, then
+    with `ocr` option pages with too short text are read with OCR
+    """
+    workers = pdf_workers(kwargs.get('workers'))
+    if workers > 1:
+        docs = iter_pdf_documents_parallel(
+            file_path=file_path,
+            workers=workers,
+            page_from=page_from,
+            page_to=page_to,
+        )
+    else:
+        docs = iter_pdf_documents_serial(
+            file_path=file_path,
+            page_from=page_from,
+            page_to=page_to,
+        )
 
     # check if `ocr` argument is passed and not falsy
-    if 'ocr' not in kwargs or not kwargs['ocr']:
+    if not kwargs.get('ocr'):
         return docs
 
-    # try with OCR if extracted text is too short - optional 'min_text_len' parameter
-    min_text_len = kwargs['min_text_len'] if 'min_text_len' in kwargs else 100
-    text = ' '.join([cleanup_text(item.page_content) for item in docs]).strip()
-    if len(text) > min_text_len:
-        return docs
+    return ocr_pdf_documents(
+        file_path=file_path,
+        docs=docs,
+        workers=workers,
+        min_text_len=kwargs.get('min_text_len', 100),
+        ocr_languages=kwargs.get('ocr_languages'),
+        timeout=kwargs.get('ocr_timeout', get_settings().pdf_ocr_timeout),
+    )
+
+
+def iter_pdf_documents_serial(
+    file_path: str,
+    page_from: int = None,
+    page_to: int = None,
+) -> Iterator[Document]:
+    """Extract PDF pages text with PyPDF in current process"""
+    for doc in PyPDFLoader(file_path=file_path).lazy_load():
+        page = doc.metadata.get('page', 0)
+        if page_from is not None and page < (page_from - 1):
+            continue
+        if page_to is not None and page > (page_to - 1):
+            break
+        yield doc
+
+
+def pdf_workers(workers: int | None = None) -> int:
+    """
+    Number of processes used to extract PDF pages text, read from
+    `PDF_EXTRACT_WORKERS` setting if not set; 1 or less means no parallelism
+    """
+    if workers is None:
+        workers = get_settings().pdf_extract_workers
+
+    return max(1, int(workers))
 
-    ocr_languages = kwargs['ocr_languages'] if 'ocr_languages' in kwargs else None
-    loader = UnstructuredPDFLoader(
-        file_path=file_path, mode='elements', strategy='ocr_only',
+
+def init_pdf_worker(file_path: str) -> None:
+    """Open the PDF file reader once in each worker process"""
+    global _PDF_READER  # pylint: disable=global-statement
+    _PDF_READER = pypdf.PdfReader(file_path)
+
+
+def extract_pdf_pages(start: int, stop: int) -> list[str]:
+    """
+    Extract text of PDF pages from `start` to `stop` (excluded, zero based),
+    run in worker processes initialized by `init_pdf_worker`
+    """
+    return [_PDF_READER.pages[num].extract_text().strip() for num in range(start, stop)]
+
+
+def iter_pdf_documents_parallel(
+    file_path: str,
+    workers: int,
+    page_from: int = None,
+    page_to: int = None,
+) -> Iterator[Document]:
+    """
+    Extract PDF pages text in a pool of `workers` processes, in ranges of
+    `PDF_PAGES_PER_TASK` pages, and yield a document per page in page order.
+    Only a limited number of ranges is submitted ahead, to bound memory usage.
+    """
+    total = len(pypdf.PdfReader(file_path).pages)
+    first = max(0, page_from - 1) if page_from is not None else 0
+    last = min(total, page_to) if page_to is not None else total
+    meta = {'source': file_path, 'total_pages': total}
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_pdf_worker,
+        initargs=(file_path,),
+    )
+    pending = deque()
+    try:
+        for start in range(first, last, PDF_PAGES_PER_TASK):
+            stop = min(start + PDF_PAGES_PER_TASK, last)
+            future = executor.submit(extract_pdf_pages, start, stop)
+            pending.append((start, future))
+            if len(pending) >= 2 * workers:
+                yield from pdf_range_documents(*pending.popleft(), meta)
+        while pending:
+            yield from pdf_range_documents(*pending.popleft(), meta)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def pdf_range_documents(start: int, future, meta: dict) -> Iterator[Document]:
+    """Yield documents of a pages range extracted by a worker process"""
+    for num, text in enumerate(future.result(), start=start):
+        yield Document(page_content=text, metadata={**meta, 'page': num})
+
+
+def ocr_pdf_page(
+    file_path: str,
+    page: int,
+    ocr_languages: list[str] | None = None,
+) -> str:
+    """
+    Read a single PDF page (zero based) text with Unstructured and OCR,
+    run in worker processes
+    """
+    writer = pypdf.PdfWriter()
+    writer.add_page(pypdf.PdfReader(file_path).pages[page])
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as tmp_file:
+        writer.write(tmp_file)
+        tmp_file.flush()
+        loader = UnstructuredPDFLoader(
+            file_path=tmp_file.name, mode='single', strategy='ocr_only',
+            ocr_languages=ocr_languages,
+        )
+        docs = loader.load()
+
+    return ' '.join([doc.page_content for doc in docs]).strip()
+
+
+class OcrPool:
+    """
+    Pool of worker processes running PDF pages OCR: pages are submitted only
+    to idle workers and must complete within `timeout` seconds from their
+    submission, otherwise the pool is recycled terminating stuck workers
+    and other running pages are submitted again
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        workers: int = 1,
+        ocr_languages: list[str] | None = None,
+        timeout: float | None = None,
+    ):
+        self.file_path = file_path
+        self.workers = workers
+        self.ocr_languages = ocr_languages
+        self.timeout = timeout
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        # submitted pages OCR, page number => (future, deadline)
+        self.tasks: dict[int, tuple[Future, float | None]] = {}
+
+    def submit(self, page: int) -> None:
+        """Submit OCR of a page"""
+        future = self.executor.submit(
+            ocr_pdf_page, self.file_path, page, self.ocr_languages
+        )
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        self.tasks[page] = (future, deadline)
+
+    def running(self) -> dict[int, tuple[Future, float | None]]:
+        """Submitted pages whose OCR is not completed"""
+        return {page: task for page, task in self.tasks.items() if not task[0].done()}
+
+    def full(self) -> bool:
+        """Check if all workers are busy"""
+        return len(self.running()) >= self.workers
+
+    def wait(self) -> None:
+        """Wait until a running page OCR completes or times out"""
+        running = self.running()
+        deadlines = [item for _, item in running.values() if item is not None]
+        timeout = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+        futures.wait(
+            [future for future, _ in running.values()],
+            timeout=timeout,
+            return_when=futures.FIRST_COMPLETED,
+        )
+        now = time.monotonic()
+        expired = [
+            page for page, (future, deadline) in running.items()
+            if not future.done() and deadline is not None and deadline <= now
+        ]
+        if expired:
+            self.recycle(expired)
+
+    def recycle(self, expired: list[int]) -> None:
+        """Replace the executor terminating its workers, `expired` pages are dropped"""
+        log = logging.getLogger(__name__)
+        for page in expired:
+            log.warning(
+                'OCR of page %d timed out after %s seconds', page + 1, self.timeout
+            )
+            del self.tasks[page]
+        restart = list(self.running())
+        self.terminate()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        for page in restart:
+            self.submit(page)
+
+    def result(self, page: int) -> str | None:
+        """Wait for a page OCR text, None if timed out"""
+        while page in self.tasks and not self.tasks[page][0].done():
+            self.wait()
+        if page not in self.tasks:
+            return None
+
+        return self.tasks.pop(page)[0].result()
+
+    def terminate(self) -> None:
+        """Shutdown the executor terminating running workers"""
+        # pylint: disable=protected-access
+        for process in list((self.executor._processes or {}).values()):
+            process.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def ocr_pdf_documents(
+    file_path: str,
+    docs: Iterable[Document],
+    workers: int = 1,
+    min_text_len: int = 100,
+    ocr_languages: list[str] | None = None,
+    timeout: float | None = None,
+) -> Iterator[Document]:
+    """
+    Read with OCR only PDF pages whose extracted text is not longer than
+    `min_text_len`: OCR runs in a pool of `workers` processes and documents
+    are yielded in page order. If OCR of a page does not complete within
+    `timeout` seconds extracted text is kept, see `OcrPool`.
+    """
+    pool = OcrPool(
+        file_path=file_path,
+        workers=workers,
         ocr_languages=ocr_languages,
+        timeout=timeout,
     )
+    pending = deque()
+    try:
+        for doc in docs:
+            page = None
+            if len(cleanup_text(doc.page_content).strip()) <= min_text_len:
+                page = doc.metadata.get('page', 0)
+                pool.submit(page)
+            pending.append((doc, page))
+            # yield pages not waiting for OCR, submit OCR pages to idle workers
+            while pending and (pending[0][1] is None or pool.full()):
+                yield ocr_page_document(*pending.popleft(), pool)
+        while pending:
+            yield ocr_page_document(*pending.popleft(), pool)
+    finally:
+        pool.terminate()
+
+
+def ocr_page_document(
+    doc: Document,
+    page: int | None,
+    pool: OcrPool,
+) -> Document:
+    """Replace PDF page document text with OCR result, if available"""
+    text = None if page is None else pool.result(page)
+    if text is None:
+        return doc
+
+    return Document(page_content=text, metadata={**doc.metadata, 'ocr': True})
 
-    return loader.load()
+
+def load_documents_pdf(file_path: str, **kwargs: Any) -> List[Document]:
+    """
+    Load documents from PDF file, first try to extract text with PyPDF,
+    then use Unstructured and OCR to read pages with too short text
+    """
+    return list(iter_pdf_documents(file_path=file_path, **kwargs))
 
 
 def read_txt_file(
@@ -113,6 +409,23 @@ def read(
     return read_function(file_path, **loader_kwargs)
 
 
+def iter_texts(
+    file_path: str,
+    **loader_kwargs: Any,
+) -> Iterator[str]:
+    """
+    Read text from a file as a stream of texts: PDF files are read page by page,
+    other supported files in a single text
+    """
+    if not os.path.isfile(file_path):
+        raise FileNotFoundError(file_path)
+
+    if mimetypes.guess_type(file_path)[0] == 'application/pdf':
+        return iter_pdf_pages(file_path=file_path, **loader_kwargs)
+
+    return iter([read(file_path=file_path, **loader_kwargs)])
+
+
 def read_html_url(
     url: str,
     **loader_kwargs: Any,
@@ -122,17 +435,27 @@ def read_html_url(
     """
     parsed_url = urlparse(url)
     remote = True if parsed_url.scheme not in ['file', ''] else False
-    temp_file = tempfile.NamedTemporaryFile(delete=False)
     if remote:
-        response = requests.get(url)
+        response = requests.get(url, timeout=get_settings().links_request_timeout)
         response.raise_for_status()
         text = response.text
     else:
         text = Path(url).read_text()
 
-    with open(temp_file.name, 'w') as file:  # pylint: disable=missing-timeout
+    return read_html(html=text, **loader_kwargs)
+
+
+def read_html(
+    html: str,
+    **loader_kwargs: Any,
+) -> str:
+    """
+    Load text from HTML content
+    """
+    temp_file = tempfile.NamedTemporaryFile(delete=False)
+    with open(temp_file.name, 'w') as file:
         content = filter_html(
-            html=text, selector=loader_kwargs.pop('selector', ''),
+            html=html, selector=loader_kwargs.pop('selector', ''),
             callback=loader_kwargs.pop('callback', ''))
         file.write(content)
     loader = BSHTMLLoader(file_path=temp_file.name, **loader_kwargs)
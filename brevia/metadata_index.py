@@ -0,0 +1,112 @@
+"""Embeddings metadata expression indexes, used by documents metadata filters"""
+import hashlib
+import logging
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from brevia import connection, collections
+from brevia.embedding_partitions import EMBEDDING_TABLE, index_table
+from brevia.vector_index import load_collection
+
+
+def filterable_metadata(cmetadata: dict | None) -> list[str]:
+    """Filterable metadata keys declared in collection metadata, if any"""
+    return list((cmetadata or {}).get('filterable_metadata', []))
+
+
+def metadata_index_prefix(collection_id: str) -> str:
+    """Metadata indexes names prefix of a collection"""
+    return f"ix_embedding_meta_{str(collection_id).replace('-', '')}_"
+
+
+def metadata_index_name(collection_id: str, key: str) -> str:
+    """Metadata index name of a collection metadata key"""
+    suffix = hashlib.md5(key.encode()).hexdigest()[:8]
+
+    return f'{metadata_index_prefix(collection_id)}{suffix}'
+
+
+def create_index_statement(
+    collection_id: str,
+    key: str,
+    table: str = EMBEDDING_TABLE,
+) -> str:
+    """
+    Build `CREATE INDEX CONCURRENTLY` statement for a metadata key,
+    on `table`: the embeddings table or one of its partitions
+    """
+    literal = key.replace("'", "''")
+
+    return (
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS '
+        f'{metadata_index_name(collection_id, key)} '
+        f"ON {table} ((cmetadata ->> '{literal}')) "
+        f"WHERE collection_id = '{collection_id}'"
+    )
+
+
+def metadata_indexes(collection_id: str) -> list[str]:
+    """Names of existing metadata indexes of a collection"""
+    query = text(
+        'SELECT indexname FROM pg_indexes '
+        'WHERE tablename = :table AND indexname LIKE :prefix'
+    )
+    params = {
+        'table': index_table(collection_id),
+        'prefix': f'{metadata_index_prefix(collection_id)}%',
+    }
+    with Session(connection.db_connection()) as session:
+        return list(session.execute(query, params).scalars())
+
+
+def drop_index(name: str) -> None:
+    """Drop a metadata index, if it exists"""
+    connection.execute_autocommit(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def create_metadata_indexes(
+    collection_name: str,
+    keys: list[str] | None = None,
+) -> list[str]:
+    """
+    Create expression indexes, without locking writes, on filterable metadata
+    keys of a collection, read from `filterable_metadata` in collection metadata
+    if missing; indexes of keys no longer filterable are dropped.
+    """
+    collection = load_collection(collection_name)
+    current = filterable_metadata(collection.cmetadata)
+    keys = current if keys is None else list(dict.fromkeys(keys))
+    expected = {metadata_index_name(collection.uuid, key): key for key in keys}
+
+    log = logging.getLogger(__name__)
+    for name in metadata_indexes(collection.uuid):
+        if name not in expected:
+            log.info('Dropping metadata index "%s"', name)
+            drop_index(name)
+    table = index_table(collection.uuid)
+    for name, key in expected.items():
+        log.info('Creating metadata index on "%s" key "%s"', collection_name, key)
+        try:
+            connection.execute_autocommit(
+                create_index_statement(collection.uuid, key, table=table)
+            )
+        except Exception:
+            # a failed concurrent build leaves an invalid index behind
+            drop_index(name)
+            raise
+
+    if keys != current:
+        cmetadata = dict(collection.cmetadata or {})
+        cmetadata['filterable_metadata'] = keys
+        collections.update_collection(
+            uuid=collection.uuid,
+            name=collection.name,
+            cmetadata=cmetadata,
+        )
+
+    return keys
+
+
+def drop_metadata_indexes(collection_id: str) -> None:
+    """Drop all metadata indexes of a collection"""
+    for name in metadata_indexes(collection_id):
+        drop_index(name)
@@ -1,9 +1,11 @@
 """Question-answering and search functions against a vector database."""
+from functools import partial
+from typing import Literal
 from langchain.retrievers.multi_query import MultiQueryRetriever
 from langchain.chains.base import Chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from langchain_community.vectorstores.pgembedding import CollectionStore
-from langchain_community.vectorstores.pgvector import DistanceStrategy, PGVector
+from langchain_community.vectorstores.pgvector import DistanceStrategy
 from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -12,14 +14,22 @@ from langchain_core.retrievers import BaseRetriever
 from langchain_core.vectorstores import VectorStore
 from langchain_core.language_models import BaseChatModel
 from langchain_core.documents import Document
-from pydantic import BaseModel
-from brevia.connection import connection_string
-from brevia.collections import single_collection_by_name
-from brevia.models import load_chatmodel, load_embeddings, get_model_config
+from pydantic import BaseModel, model_validator
+from typing_extensions import Self
+from brevia.collections import collections_by_names, single_collection_by_name
+from brevia.federated_search import FederatedRetriever, federated_search_with_score
+from brevia.models import load_chatmodel, get_model_config
 from brevia.prompts import load_qa_prompt, load_condense_prompt
+from brevia.rerank import (
+    RerankRetriever,
+    load_scorer,
+    rerank_conf,
+    rerank_docs_and_scores,
+)
 from brevia.settings import get_settings
 from brevia.utilities.types import load_type
 from brevia.base_retriever import BreviaBaseRetriever
+from brevia.vector_store import vector_store
 
 
 DISTANCE_MAP = {
@@ -35,16 +45,43 @@ class SearchQuery(BaseModel):
 
     Attributes:
         query (str): The search query text.
-        collection (str): The collection name or identifier.
+        collection (str | None): The collection name or identifier.
+        collections (list[str]): Other collection names, to search multiple
+            collections at once.
         docs_num (int | None): Max number of documents to retrieve.
         distance_strategy_name (str): Distance strategy, defaults to 'cosine'.
         filter (dict[str, str | dict | list] | None): Optional filter criteria.
+        ef_search (int | None): Optional HNSW index `ef_search` for this query.
+        probes (int | None): Optional IVFFlat index `probes` for this query.
+        search_type (str): `similarity` (default), `hybrid` full-text and
+            vector search or `prefix` two-stage search on truncated embeddings.
+        route_collections (int | None): Optional number of collections searched
+            in a multiple collections search, the closest to the query by
+            centroids; defaults to `SEARCH_ROUTE_COLLECTIONS`, 0 searches all.
     """
     query: str
-    collection: str
+    collection: str | None = None
+    collections: list[str] = []
     docs_num: int | None = None
     distance_strategy_name: str = 'cosine'
     filter: dict[str, str | dict | list] | None = None
+    ef_search: int | None = None
+    probes: int | None = None
+    search_type: Literal['similarity', 'hybrid', 'prefix'] = 'similarity'
+    route_collections: int | None = None
+
+    @model_validator(mode='after')
+    def check_collections(self) -> Self:
+        """Validate collection names"""
+        if not self.collection_names():
+            raise ValueError('Collection required')
+        return self
+
+    def collection_names(self) -> list[str]:
+        """Names of searched collections, without duplicates"""
+        names = [self.collection] if self.collection else []
+
+        return list(dict.fromkeys(names + self.collections))
 
 
 class ChatParams(BaseModel):
@@ -60,6 +97,12 @@ class ChatParams(BaseModel):
         multiquery (bool): Flag for executing multiple queries for retrieval.
         search_type (str): Type of search algorithm (default is "similarity").
         score_threshold (float): Threshold for filtering documents by relevance scores.
+        ef_search (int | None): Optional HNSW index `ef_search` for retrieval.
+        probes (int | None): Optional IVFFlat index `probes` for retrieval.
+        collections (list[str] | None): Optional collection names, to retrieve
+            documents from multiple collections at once.
+        route_collections (int | None): Optional number of collections searched
+            with multiple collections, the closest to the query by centroids.
     """
     docs_num: int | None = None
     streaming: bool = False
@@ -70,14 +113,21 @@ class ChatParams(BaseModel):
     config: dict | None = None
     search_type: str = "similarity"
     score_threshold: float = 0.0
+    ef_search: int | None = None
+    probes: int | None = None
+    collections: list[str] | None = None
+    route_collections: int | None = None
 
     def get_search_kwargs(self) -> dict:
         """ Construct and return keyword arguments needed for search methods. """
-        return {
+        search_kwargs = {
             'k': self.docs_num,
             'filter': self.filter,
             'score_threshold': self.score_threshold,
         }
+        index_params = {'ef_search': self.ef_search, 'probes': self.probes}
+
+        return search_kwargs | {k: v for k, v in index_params.items() if v}
 
 
 def search_vector_qa(
@@ -89,30 +139,107 @@ def search_vector_qa(
     This function uses the provided search parameters to perform a similarity search
     on the designated collection's vector index. It retrieves a list of document-score
     tuples that best match the input query.
+    With multiple collections a federated search is performed.
     """
-    collection_store = single_collection_by_name(search.collection)
+    names = search.collection_names()
+    if len(names) > 1:
+        return search_federated_qa(search)
+    collection_store = single_collection_by_name(names[0])
     if not collection_store:
-        raise ValueError(f'Collection not found: {search.collection}')
+        raise ValueError(f'Collection not found: {names[0]}')
     if search.docs_num is None:
         default_num = get_settings().search_docs_num
         search.docs_num = int(collection_store.cmetadata.get('docs_num', default_num))
     strategy = DISTANCE_MAP.get(search.distance_strategy_name, DistanceStrategy.COSINE)
-    embeddings_conf = collection_store.cmetadata.get('embeddings', None)
-    docsearch = PGVector(
-        connection_string=connection_string(),
-        embedding_function=load_embeddings(embeddings_conf),
-        collection_name=search.collection,
+    docsearch = vector_store(
+        collection_name=collection_store.name,
+        collection_metadata=collection_store.cmetadata,
         distance_strategy=strategy,
-        use_jsonb=True,
+        collection_id=collection_store.uuid,
     )
 
-    return docsearch.similarity_search_with_score(
+    search_function = docsearch.similarity_search_with_score
+    if search.search_type == 'hybrid':
+        search_function = docsearch.hybrid_search_with_score
+    elif search.search_type == 'prefix':
+        search_function = partial(search_function, prefix=True)
+
+    retriever_conf = collection_store.cmetadata.get(
+        'qa_retriever',
+        get_settings().qa_retriever,
+    )
+    rerank = rerank_conf(collection_store.cmetadata, retriever_conf)
+    k = search.docs_num if rerank is None else rerank.fetch_size(search.docs_num)
+    results = search_function(
         query=search.query,
+        k=k,
+        filter=search.filter,
+        ef_search=search.ef_search,
+        probes=search.probes,
+    )
+    if rerank is None:
+        return results
+
+    return rerank_docs_and_scores(
+        query=search.query,
+        docs_and_scores=results,
+        scorer=load_scorer(rerank),
         k=search.docs_num,
+    )
+
+
+def search_federated_qa(
+    search: SearchQuery,
+) -> list[tuple[Document, float]]:
+    """
+    Execute a vector search across multiple collections in a single query,
+    matching documents are returned with relevance scores, higher is better.
+    Re-ranking is configured by `QA_RERANK` setting only.
+    """
+    names = search.collection_names()
+    collections = collections_by_names(names)
+    missing = sorted(set(names) - {item.name for item in collections})
+    if missing:
+        raise ValueError(f'Collection not found: {", ".join(missing)}')
+    if search.search_type == 'hybrid':
+        raise ValueError('Hybrid search is not supported with multiple collections')
+    if search.docs_num is None:
+        search.docs_num = get_settings().search_docs_num
+
+    rerank = rerank_conf()
+    k = search.docs_num if rerank is None else rerank.fetch_size(search.docs_num)
+    results = federated_search_with_score(
+        query=search.query,
+        collections=collections,
+        k=k,
+        distance_strategy=DISTANCE_MAP.get(
+            search.distance_strategy_name, DistanceStrategy.COSINE
+        ),
         filter=search.filter,
+        prefix=search.search_type == 'prefix',
+        ef_search=search.ef_search,
+        probes=search.probes,
+        route_k=route_k(search.route_collections),
+    )
+    if rerank is None:
+        return results
+
+    return rerank_docs_and_scores(
+        query=search.query,
+        docs_and_scores=results,
+        scorer=load_scorer(rerank),
+        k=search.docs_num,
     )
 
 
+def route_k(route_collections: int | None) -> int:
+    """Number of routed collections, `SEARCH_ROUTE_COLLECTIONS` by default"""
+    if route_collections is None:
+        return get_settings().search_route_collections
+
+    return route_collections
+
+
 def create_custom_retriever(
         store: VectorStore,
         search_kwargs: dict,
@@ -153,48 +280,117 @@ def create_default_retriever(
     return retriever
 
 
+def create_federated_retriever(
+    collections: list[CollectionStore],
+    chat_params: ChatParams,
+    llm: BaseChatModel,
+) -> BaseRetriever:
+    """
+    Create a retriever of documents across multiple collections,
+    re-ranking is configured by `QA_RERANK` setting only
+    """
+    search_types = ('similarity', 'similarity_score_threshold', 'prefix')
+    if chat_params.search_type not in search_types:
+        raise ValueError(
+            f'Search type {chat_params.search_type} is not supported '
+            'with multiple collections'
+        )
+    search_kwargs = chat_params.get_search_kwargs()
+    score_threshold = search_kwargs.pop('score_threshold', 0.0) or 0.0
+    if chat_params.search_type != 'similarity_score_threshold':
+        score_threshold = 0.0
+    docs_num = search_kwargs.get('k') or get_settings().search_docs_num
+    rerank = rerank_conf()
+    search_kwargs['k'] = docs_num if rerank is None else rerank.fetch_size(docs_num)
+    search_kwargs['prefix'] = chat_params.search_type == 'prefix'
+    search_kwargs['route_k'] = route_k(chat_params.route_collections)
+    retriever = FederatedRetriever(
+        collections=collections,
+        search_kwargs=search_kwargs,
+        distance_strategy=DISTANCE_MAP.get(
+            chat_params.distance_strategy_name,
+            DistanceStrategy.COSINE
+        ),
+        score_threshold=score_threshold,
+    )
+    if chat_params.multiquery:
+        retriever = MultiQueryRetriever.from_llm(retriever=retriever, llm=llm)
+    if rerank is None:
+        return retriever
+
+    return RerankRetriever(
+        retriever=retriever,
+        scorer=load_scorer(rerank),
+        k=docs_num,
+    )
+
+
 def create_conversation_retriever(
     collection: CollectionStore,
     chat_params: ChatParams,
     llm: BaseChatModel,
+    collections: list[CollectionStore] | None = None,
 ) -> BaseRetriever:
-    """ Create a retriever for a collection with chat parameters """
+    """
+    Create a retriever for a collection with chat parameters,
+    or for multiple `collections` if more than one is passed
+    """
+    if collections and len(collections) > 1:
+        return create_federated_retriever(
+            collections=collections,
+            chat_params=chat_params,
+            llm=llm,
+        )
     strategy = DISTANCE_MAP.get(
         chat_params.distance_strategy_name,
         DistanceStrategy.COSINE
     )
-
-    embeddings_conf = collection.cmetadata.get('embeddings', None)
-    document_search = PGVector(
-        connection_string=connection_string(),
-        embedding_function=load_embeddings(embeddings_conf),
+    document_search = vector_store(
         collection_name=collection.name,
+        collection_metadata=collection.cmetadata,
         distance_strategy=strategy,
-        use_jsonb=True,
+        collection_id=collection.uuid,
     )
     search_kwargs = chat_params.get_search_kwargs()
-    retriever_conf = collection.cmetadata.get(
+    retriever_conf = dict(collection.cmetadata.get(
         'qa_retriever',
-        dict(get_settings().qa_retriever).copy()
-    )
+        get_settings().qa_retriever,
+    ))
+    rerank = rerank_conf(collection.cmetadata, retriever_conf)
+    retriever_conf.pop('rerank', None)
+    docs_num = search_kwargs.get('k') or get_settings().search_docs_num
+    if rerank is not None:
+        # over-fetch candidates to re-rank
+        search_kwargs['k'] = rerank.fetch_size(docs_num)
+
     if not retriever_conf:
-        return create_default_retriever(
+        retriever = create_default_retriever(
             store=document_search,
             search_kwargs=search_kwargs,
             llm=llm,
             search_type=chat_params.search_type,
             multiquery=chat_params.multiquery,
         )
-
-    # custom retriever
-    return create_custom_retriever(
-        document_search, search_kwargs, retriever_conf)
+    else:
+        # custom retriever
+        retriever = create_custom_retriever(
+            document_search, search_kwargs, retriever_conf)
+
+    if rerank is None:
+        return retriever
+
+    return RerankRetriever(
+        retriever=retriever,
+        scorer=load_scorer(rerank),
+        k=docs_num,
+    )
 
 
 def conversation_rag_chain(
     collection: CollectionStore,
     chat_params: ChatParams,
     answer_callbacks: list[BaseCallbackHandler] | None = None,
+    collections: list[CollectionStore] | None = None,
 ) -> Chain:
     """
     Create and return a conversation chain for Q&A with embedded dataset knowledge.(RAG)
@@ -218,10 +414,17 @@ def conversation_rag_chain(
             - search_type (str): Type of search algorithm to use (def is 'similarity').
             - score_threshold (float): Threshold for filtering documents based on
               relevance scores (default is 0.0).
+            - ef_search (int | None): HNSW index `ef_search` override.
+            - probes (int | None): IVFFlat index `probes` override.
+            - route_collections (int | None): Collections searched with
+              multiple `collections`, the closest to the query.
             - config (dict | None): Optional configuration dict that can contain
               completion_llm and followup_llm configs to override defaults.
         answer_callbacks (list[BaseCallbackHandler] | None): List of callback handlers
             for the final LLM answer to enable streaming (default is None).
+        collections (list[CollectionStore] | None): Collections to retrieve
+            documents from, if more than one; `collection` is used for prompts
+            and models configuration (default is None).
 
     Returns:
         Chain: A configured conversation chain for Q&A tasks.
@@ -249,7 +452,8 @@ def conversation_rag_chain(
     retriever = create_conversation_retriever(
         collection=collection,
         chat_params=chat_params,
-        llm=chatllm
+        llm=chatllm,
+        collections=collections,
     )
 
     # Chain to rewrite question with history using get_model_config
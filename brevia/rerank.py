@@ -0,0 +1,241 @@
+"""Re-ranking of retrieved documents with pluggable scorers"""
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from typing import Any
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables.config import run_in_executor
+from pydantic import BaseModel, ConfigDict, Field
+from brevia.models import test_models_in_use
+from brevia.settings import get_settings
+from brevia.utilities.types import load_type
+
+# default number of candidates fetched per document passed on
+RERANK_FACTOR = 4
+
+
+class RerankConf(BaseModel):
+    """
+    Re-ranking configuration, stored in collection `cmetadata` under the
+    `rerank` key, in the `rerank` key of a `qa_retriever` configuration
+    or in `QA_RERANK` setting.
+
+    Attributes:
+        scorer (str): Scorer alias, `lexical` (default), `cross-encoder` or
+            `fake`, or a class path of a `BaseScorer` implementation.
+        fetch_k (int | None): Number of candidates retrieved and re-scored,
+            defaults to four times the number of requested documents.
+    Other attributes are passed to the scorer constructor.
+    """
+    model_config = ConfigDict(extra='allow')
+
+    scorer: str = 'lexical'
+    fetch_k: int | None = Field(default=None, ge=1, le=1000)
+
+    def fetch_size(self, k: int) -> int:
+        """Number of candidates retrieved to pass on `k` documents"""
+        return max(k, self.fetch_k or RERANK_FACTOR * k)
+
+
+class BaseScorer(ABC):
+    """Base class of re-ranking scorers"""
+
+    @abstractmethod
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        """Relevance score of each document for a query, higher is better"""
+
+
+class FakeScorer(BaseScorer):
+    """Fake scorer for testing purposes: fixed scores or reversed order"""
+
+    def __init__(self, scores: list[float] | None = None):
+        self.scores = scores
+
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        """Fake for testing purposes."""
+        if self.scores is not None:
+            return self.scores[:len(documents)]
+
+        return [float(i) for i in range(len(documents))]
+
+
+class LexicalScorer(BaseScorer):
+    """Lightweight BM25 scorer, computed on the candidate documents only"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    @staticmethod
+    def tokenize(text: str) -> list[str]:
+        """Lowercase word tokens of a text"""
+        return re.findall(r'\w+', text.lower())
+
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        """BM25 score of each document for the query terms"""
+        docs_terms = [Counter(self.tokenize(doc.page_content)) for doc in documents]
+        if not docs_terms:
+            return []
+        avg_len = sum(sum(t.values()) for t in docs_terms) / len(docs_terms) or 1
+        num = len(docs_terms)
+        scores = []
+        for terms in docs_terms:
+            doc_len = sum(terms.values())
+            value = 0.0
+            for term in set(self.tokenize(query)):
+                freq = terms.get(term, 0)
+                if not freq:
+                    continue
+                docs_freq = sum(1 for t in docs_terms if term in t)
+                idf = math.log(1 + (num - docs_freq + 0.5) / (docs_freq + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * doc_len / avg_len)
+                value += idf * freq * (self.k1 + 1) / (freq + norm)
+            scores.append(value)
+
+        return scores
+
+
+@lru_cache
+def load_cross_encoder(model: str, device: str) -> Any:
+    """Load a cross-encoder model once per process"""
+    try:
+        # pylint: disable=import-outside-toplevel
+        from sentence_transformers import CrossEncoder
+    except ImportError as exc:
+        raise ImportError(
+            'Package "sentence-transformers" is needed by "cross-encoder" scorer, '
+            'please install it with `pip install sentence-transformers`'
+        ) from exc
+
+    return CrossEncoder(model, device=device)
+
+
+class CrossEncoderScorer(BaseScorer):
+    """Local cross-encoder scorer, using `sentence-transformers`"""
+
+    def __init__(
+        self,
+        model: str = 'cross-encoder/ms-marco-MiniLM-L-6-v2',
+        device: str = 'cpu',
+    ):
+        self.model = model
+        self.device = device
+
+    def score(self, query: str, documents: list[Document]) -> list[float]:
+        """Cross-encoder relevance score of each query and document pair"""
+        if not documents:
+            return []
+        encoder = load_cross_encoder(self.model, self.device)
+        pairs = [(query, doc.page_content) for doc in documents]
+
+        return [float(value) for value in encoder.predict(pairs)]
+
+
+def rerank_conf(
+    cmetadata: dict | None = None,
+    retriever_conf: dict | None = None,
+) -> RerankConf | None:
+    """
+    Read re-ranking configuration from a `qa_retriever` configuration,
+    from collection metadata or from `QA_RERANK` setting, if any
+    """
+    for source in [retriever_conf, cmetadata]:
+        conf = (source or {}).get('rerank')
+        if conf:
+            return RerankConf(**conf)
+    conf = dict(get_settings().qa_rerank)
+
+    return RerankConf(**conf) if conf else None
+
+
+def load_scorer(conf: RerankConf) -> BaseScorer:
+    """Load re-ranking scorer, use Fake scorer for models in test mode"""
+    scorer_aliases = {
+        'lexical': LexicalScorer,
+        'cross-encoder': CrossEncoderScorer,
+        'fake': FakeScorer,
+    }
+    if conf.scorer == 'cross-encoder' and test_models_in_use():
+        return FakeScorer()
+    scorer_cls = scorer_aliases.get(conf.scorer)
+    if scorer_cls is None:
+        scorer_cls = load_type(conf.scorer, BaseScorer)
+
+    return scorer_cls(**(conf.model_extra or {}))
+
+
+def rerank_documents(
+    query: str,
+    documents: list[Document],
+    scorer: BaseScorer,
+    k: int,
+) -> list[Document]:
+    """
+    Re-score documents and return the top `k` ones,
+    re-ranking score is added in `rerank_score` metadata
+    """
+    scores = scorer.score(query, documents)
+    ranked = sorted(zip(documents, scores), key=lambda item: item[1], reverse=True)
+    for doc, score in ranked:
+        doc.metadata['rerank_score'] = score
+
+    return [doc for doc, _ in ranked[:k]]
+
+
+def rerank_docs_and_scores(
+    query: str,
+    docs_and_scores: list[tuple[Document, float]],
+    scorer: BaseScorer,
+    k: int,
+) -> list[tuple[Document, float]]:
+    """Re-rank search results, keeping original search scores"""
+    scores = {id(doc): score for doc, score in docs_and_scores}
+    documents = [doc for doc, _ in docs_and_scores]
+
+    return [
+        (doc, scores[id(doc)])
+        for doc in rerank_documents(query, documents, scorer, k)
+    ]
+
+
+class RerankRetriever(BaseRetriever):
+    """
+    Retriever wrapper over-fetching candidates from a base retriever and
+    passing on only the top `k` documents re-scored by a scorer
+    """
+
+    retriever: BaseRetriever
+    """Base retriever, configured to fetch the candidates."""
+
+    scorer: BaseScorer
+    """Scorer used to re-rank candidates."""
+
+    k: int = 4
+    """Number of documents passed on."""
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        documents = self.retriever.invoke(
+            query, config={'callbacks': run_manager.get_child()}
+        )
+
+        return rerank_documents(query, documents, self.scorer, self.k)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        documents = await self.retriever.ainvoke(
+            query, config={'callbacks': run_manager.get_child()}
+        )
+        # scorers may be CPU bound, like cross-encoders
+        return await run_in_executor(
+            None, rerank_documents, query, documents, self.scorer, self.k
+        )
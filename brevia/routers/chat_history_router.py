@@ -20,7 +20,10 @@ router = APIRouter()
 )
 def read_chat_history(filter: Annotated[ChatHistoryFilter, Depends()]):
     """ /chat_history endpoint, read stored chat history """
-    return get_history(filter=filter)
+    try:
+        return get_history(filter=filter)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc)) from exc
 
 
 @router.get(
@@ -30,7 +33,10 @@ def read_chat_history(filter: Annotated[ChatHistoryFilter, Depends()]):
 )
 def read_chat_history_sessions(filter: Annotated[ChatHistoryFilter, Depends()]):
     """ /chat_history sessions endpoint, read stored chat history sessions"""
-    return get_history_sessions(filter=filter)
+    try:
+        return get_history_sessions(filter=filter)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc)) from exc
 
 
 class EvaluateBody(BaseModel):
@@ -1,12 +1,14 @@
 """API endpoints definitions to handle Collections"""
-from fastapi import APIRouter
+from fastapi import APIRouter, BackgroundTasks
 from pydantic import BaseModel
 from brevia.dependencies import (
     get_dependencies,
     check_collection_name_absent,
     check_collection_uuid
 )
-from brevia import collections
+from brevia import collections, vector_index
+from brevia.hybrid_search import refresh_documents_tsv, text_search_config
+from brevia.vector_index import VectorIndexConf
 
 router = APIRouter()
 
@@ -61,8 +63,16 @@ def create_collection(body: CollectionBody):
     dependencies=get_dependencies(),
     tags=['Collections'],
 )
-def update_collection(uuid: str, body: CollectionBody):
-    """ PATCH /collections endpoint"""
+def update_collection(
+    uuid: str,
+    body: CollectionBody,
+    background_tasks: BackgroundTasks,
+):
+    """
+    PATCH /collections endpoint
+    Documents text search vectors are rebuilt in background
+    when hybrid search is enabled or its language changes
+    """
     check_collection_uuid(uuid)
     current = collections.single_collection(uuid)
     if current.name != body.name:
@@ -70,6 +80,12 @@ def update_collection(uuid: str, body: CollectionBody):
         check_collection_name_absent(body.name)
 
     collections.update_collection(uuid=uuid, name=body.name, cmetadata=body.cmetadata)
+    if text_search_config(body.cmetadata) != text_search_config(current.cmetadata):
+        background_tasks.add_task(
+            refresh_documents_tsv,
+            collection_id=uuid,
+            cmetadata=body.cmetadata,
+        )
 
 
 @router.delete(
@@ -82,3 +98,70 @@ def delete_collection(uuid: str):
     """ DELETE /collections endpoint"""
     check_collection_uuid(uuid)
     collections.delete_collection(uuid)
+
+
+@router.post(
+    '/collections/{uuid}/vector_index',
+    status_code=202,
+    dependencies=get_dependencies(),
+    tags=['Collections'],
+)
+def create_vector_index(
+    uuid: str,
+    body: VectorIndexConf,
+    background_tasks: BackgroundTasks,
+    prefix: bool = False,
+):
+    """
+    POST /collections/{uuid}/vector_index endpoint
+    Create collection ANN vector index in background, without locking writes,
+    with `prefix` the truncated embeddings prefix index is created
+    """
+    check_collection_uuid(uuid)
+    collection = collections.single_collection(uuid)
+    background_tasks.add_task(
+        vector_index.create_vector_index,
+        collection_name=collection.name,
+        conf=body.model_dump(exclude_none=True),
+        prefix=prefix,
+    )
+
+
+@router.post(
+    '/collections/{uuid}/vector_index/rebuild',
+    status_code=202,
+    dependencies=get_dependencies(json_content_type=False),
+    tags=['Collections'],
+)
+def rebuild_vector_index(
+    uuid: str,
+    background_tasks: BackgroundTasks,
+    body: VectorIndexConf | None = None,
+    prefix: bool = False,
+):
+    """
+    POST /collections/{uuid}/vector_index/rebuild endpoint
+    Rebuild collection ANN vector index in background,
+    a new index configuration can be optionally passed
+    """
+    check_collection_uuid(uuid)
+    collection = collections.single_collection(uuid)
+    background_tasks.add_task(
+        vector_index.rebuild_vector_index,
+        collection_name=collection.name,
+        conf=body.model_dump(exclude_unset=True) if body else None,
+        prefix=prefix,
+    )
+
+
+@router.delete(
+    '/collections/{uuid}/vector_index',
+    status_code=204,
+    dependencies=get_dependencies(json_content_type=False),
+    tags=['Collections'],
+)
+def drop_vector_index(uuid: str, prefix: bool = False):
+    """ DELETE /collections/{uuid}/vector_index endpoint"""
+    check_collection_uuid(uuid)
+    collection = collections.single_collection(uuid)
+    vector_index.drop_vector_index(collection_name=collection.name, prefix=prefix)
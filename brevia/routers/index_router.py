@@ -1,11 +1,12 @@
 """API endpoints definitions for indexing actions"""
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 from os import path
 import json
 import re
 import logging
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from fastapi import APIRouter, HTTPException, Request, status, UploadFile, Form
+from fastapi.concurrency import run_in_threadpool
 from langchain_community.vectorstores.pgembedding import CollectionStore
 from langchain_core.documents import Document
 from brevia.dependencies import (
@@ -14,8 +15,11 @@ from brevia.dependencies import (
     check_collection_uuid,
 )
 from brevia import index, collections, load_file
+from brevia.utilities.json_api import CountMode
 
 router = APIRouter()
+# max number of documents indexed at once in `/index/batch`
+BATCH_DOCUMENTS = 100
 
 
 class IndexBody(BaseModel):
@@ -35,18 +39,135 @@ class IndexBody(BaseModel):
 def index_document(item: IndexBody):
     """ Add single document to collection index """
     collection = load_collection(collection_id=item.collection_id)
-    # remove same document if already indexed
-    index.remove_document(
-        collection_id=item.collection_id,
-        document_id=item.document_id,
-    )
-    index.add_document(
+    # replace same document if already indexed
+    index.update_document(
         document=Document(page_content=item.content, metadata=item.metadata),
         collection_name=collection.name,
         document_id=item.document_id,
     )
 
 
+@router.post(
+    '/index/batch',
+    dependencies=get_dependencies(json_content_type=False),
+    tags=['Index'],
+)
+async def index_documents_batch(request: Request):
+    """
+    Add many documents to collections index, replacing already indexed ones.
+    Request body is a JSON array or a NDJSON stream (`application/x-ndjson`)
+    of `/index` items; results for every document are returned.
+    """
+    content_type = request.headers.get('content-type', '').split(';')[0].strip()
+    if content_type not in ['application/json', 'application/x-ndjson']:
+        raise HTTPException(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            f"Unsupported media type: {content_type}."
+            " It must be application/json or application/x-ndjson",
+        )
+
+    results = []
+    items = []
+    indexed = set()
+    async for item in read_batch_items(request=request, content_type=content_type):
+        if isinstance(item, dict):
+            results.append(item)
+            continue
+        key = (item.collection_id, item.document_id)
+        if key in indexed:
+            results.append({
+                'collection_id': item.collection_id,
+                'document_id': item.document_id,
+                'error': 'Duplicate document id in request',
+            })
+            continue
+        indexed.add(key)
+        items.append(item)
+        if len(items) >= BATCH_DOCUMENTS:
+            results.extend(await run_in_threadpool(index_batch, items))
+            items = []
+    results.extend(await run_in_threadpool(index_batch, items))
+
+    return {'results': results}
+
+
+async def read_batch_items(
+    request: Request,
+    content_type: str,
+) -> AsyncIterator[IndexBody | dict]:
+    """
+    Read `/index/batch` items from request body, NDJSON lines are read
+    while streaming; an error dict is yielded for every invalid item
+    """
+    if content_type == 'application/json':
+        try:
+            data = json.loads(await request.body())
+        except json.JSONDecodeError as exc:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc)) from exc
+        if not isinstance(data, list):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                'Request body must be a JSON array',
+            )
+        for num, item in enumerate(data, start=1):
+            yield parse_batch_item(item, num)
+        return
+
+    num = 0
+    buffer = b''
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            num += 1
+            if line.strip():
+                yield parse_batch_item(line, num)
+    if buffer.strip():
+        yield parse_batch_item(buffer, num + 1)
+
+
+def parse_batch_item(item: dict | bytes, num: int) -> IndexBody | dict:
+    """Validate a single `/index/batch` item, return an error dict on failure"""
+    try:
+        if isinstance(item, bytes):
+            return IndexBody.model_validate_json(item)
+        return IndexBody.model_validate(item)
+    except ValidationError as exc:
+        return {'item': num, 'error': str(exc)}
+
+
+def index_batch(items: list[IndexBody]) -> list[dict]:
+    """
+    Index a batch of documents, grouped by collection: blocking database and
+    embeddings calls, run in a worker thread by `/index/batch`
+    """
+    by_collection: dict[str, dict[str, Document]] = {}
+    for item in items:
+        documents = by_collection.setdefault(item.collection_id, {})
+        documents[item.document_id] = Document(
+            page_content=item.content,
+            metadata=item.metadata,
+        )
+
+    results = []
+    for collection_id, documents in by_collection.items():
+        collection = collections.single_collection(collection_id)
+        if collection is None:
+            error = f"Collection id '{collection_id}' was not found"
+            docs_res = {document_id: error for document_id in documents}
+        else:
+            docs_res = index.add_documents_batch(
+                documents=documents,
+                collection=collection,
+            )
+        for document_id, res in docs_res.items():
+            item = {'collection_id': collection_id, 'document_id': document_id}
+            item |= {'chunks': res} if isinstance(res, int) else {'error': res}
+            results.append(item)
+
+    return results
+
+
 def load_collection(collection_id: str) -> CollectionStore:
     """ Load collection by ID and throw 404 if not found"""
     collection = collections.single_collection(collection_id)
@@ -89,20 +210,14 @@ def upload_and_index(
     else:
         metadata = {'source': path.basename(tmp_path)}
 
-    # remove same document if already indexed
-    index.remove_document(
-        collection_id=collection_id,
-        document_id=document_id,
-    )
     read_options = {} if options is None else json.loads(options)
-    text = load_file.read(file_path=tmp_path, **read_options)
-    index.add_document(
-        document=Document(
-            page_content=text,
-            metadata=metadata,
-        ),
+    # reader is selected by saved file type, PDF pages are streamed;
+    # only changed chunks are replaced if document is already indexed
+    index.update_document_stream(
+        texts=load_file.iter_texts(file_path=tmp_path, **read_options),
         collection_name=collection.name,
         document_id=document_id,
+        metadata=metadata,
     )
 
 
@@ -140,12 +255,8 @@ def parse_link_and_index(item: IndexLink):
     text = load_file.read_html_url(url=item.link, **item.options)
     if not text:
         return
-    # remove same document if already indexed
-    index.remove_document(
-        collection_id=item.collection_id,
-        document_id=item.document_id,
-    )
-    index.add_document(
+    # replace same document if already indexed
+    index.update_document(
         document=Document(
             page_content=text,
             metadata=item.metadata,
@@ -190,16 +301,23 @@ def index_docs(
     collection_id: str,
     request: Request,
     page: int = 1,
-    page_size: int = 50
+    page_size: int = 50,
+    cursor: str | None = None,
+    count: CountMode = 'exact',
 ):
     """ Read collection documents with metadata filter """
     load_collection(collection_id=collection_id)
-    return index.collection_documents(
-        collection_id=collection_id,
-        filter=read_filter(request=request),
-        page=page,
-        page_size=page_size,
-    )
+    try:
+        return index.collection_documents(
+            collection_id=collection_id,
+            filter=read_filter(request=request),
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            count=count,
+        )
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc)) from exc
 
 
 @router.get(
@@ -207,9 +325,25 @@ def index_docs(
     dependencies=get_dependencies(json_content_type=False),
     tags=['Index'],
 )
-def index_docs_metadata(collection_id: str, request: Request):
-    """ Read collection documents metadata"""
+def index_docs_metadata(
+    collection_id: str,
+    request: Request,
+    page: int | None = None,
+    page_size: int = 50
+):
+    """
+    Read collection documents metadata, paginated if `page` is set
+    """
     load_collection(collection_id=collection_id)
+    if page is not None:
+        return index.documents_metadata_page(
+            collection_id=collection_id,
+            filter=read_filter(request=request),
+            document_id=request.query_params.get('document_id'),
+            page=page,
+            page_size=page_size,
+        )
+
     return index.documents_metadata(
         collection_id=collection_id,
         filter=read_filter(request=request),
@@ -33,4 +33,7 @@ async def read_analysis_job(uuid: str):
 )
 async def list_analysis_jobs(filter: Annotated[JobsFilter, Depends()]):
     """ /jobs endpoint, list all analysis jobs """
-    return get_jobs(filter=filter)
+    try:
+        return get_jobs(filter=filter)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(exc)) from exc
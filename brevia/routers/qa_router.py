@@ -14,6 +14,9 @@ from brevia import chat_history
 from brevia.dependencies import (
     get_dependencies,
     check_collection_name,
+    check_collection_names,
+    async_check_collection_name,
+    async_check_collection_names,
 )
 from brevia.callback import (
     ConversationCallbackHandler,
@@ -46,7 +49,7 @@ class ChatBody(ChatParams):
     @model_validator(mode='after')
     def check_collection(self) -> Self:
         """Validate collection and mode"""
-        if not self.collection and self.mode == 'rag':
+        if not self.collection and not self.collections and self.mode == 'rag':
             raise ValueError('Collection required for rag mode')
         return self
 
@@ -59,14 +62,25 @@ async def chat_action(
 ):
     """
     /chat endpoint, ask chatbot about a collection of documents to perform a rag chat.
+    With `collections` documents are retrieved from multiple collections,
+    `collection` or the first of `collections` is used for configuration.
     If collection is not provided, it will use a simple completion chain.
     """
     # Check if collection is provided and valid
     collection = None
-    if chat_body.collection:
-        collection = check_collection_name(chat_body.collection)
-        if not collection.cmetadata:
-            collection.cmetadata = {}
+    collections = None
+    if chat_body.collections:
+        names = list(dict.fromkeys(
+            ([chat_body.collection] if chat_body.collection else [])
+            + chat_body.collections
+        ))
+        collections = await async_check_collection_names(names)
+        chat_body.collection = names[0]
+        collection = collections[0]
+    elif chat_body.collection:
+        collection = await async_check_collection_name(chat_body.collection)
+    if collection and not collection.cmetadata:
+        collection.cmetadata = {}
 
     lang = chat_language(
         chat_body=chat_body,
@@ -82,6 +96,7 @@ async def chat_action(
             collection=collection,
             chat_params=ChatParams(**chat_body.model_dump()),
             answer_callbacks=[stream_handler] if chat_body.streaming else [],
+            collections=collections,
         )
         embeddings = collection.cmetadata.get('embeddings', None)
     elif chat_body.mode == 'conversation':
@@ -128,7 +143,7 @@ async def chat_action(
 
             await conversation_callback.wait_conversation_done()
 
-            yield conversation_callback.chain_result(
+            yield await conversation_callback.async_chain_result(
                 callb=token_callback,
                 question=chat_body.question,
                 collection=chat_body.collection,
@@ -164,6 +179,25 @@ def retrieve_chat_history(history: list, question: str,
     return chat_hist
 
 
+async def async_retrieve_chat_history(
+    history: list,
+    question: str,
+    session: str = None,
+    embeddings: dict | None = None,
+) -> list:
+    """Retrieve chat history to be used in final prompt, not blocking the loop"""
+    chat_hist = await chat_history.async_history(
+        chat_history=history,
+        session=session,
+    )
+    if chat_hist and not await asyncio.to_thread(
+        chat_history.is_related, chat_hist, question, embeddings
+    ):
+        chat_hist = []
+
+    return chat_hist
+
+
 async def run_chain(
     chain: Chain,
     chat_body: ChatBody,
@@ -176,7 +210,7 @@ async def run_chain(
     """Run chain usign async methods and return result"""
     result = await chain.ainvoke({
         'question': chat_body.question,
-        'chat_history': retrieve_chat_history(
+        'chat_history': await async_retrieve_chat_history(
             history=chat_body.chat_history,
             question=chat_body.question,
             session=x_chat_session,
@@ -187,7 +221,7 @@ async def run_chain(
         config={'callbacks': chain_callbacks},
         return_only_outputs=True,
     )
-    return chat_result(
+    return await chat_result(
         result=result,
         callb=token_callback,
         chat_body=chat_body,
@@ -195,7 +229,7 @@ async def run_chain(
     )
 
 
-def chat_result(
+async def chat_result(
     result: dict | AIMessage,
     callb: TokensCallbackHandler,
     chat_body: ChatBody,
@@ -207,7 +241,7 @@ def chat_result(
 
     chat_history_id = None
     if not chat_body.streaming:
-        chat_hist = chat_history.add_history(
+        chat_hist = await chat_history.async_add_history(
             session_id=x_chat_session,
             collection=chat_body.collection,
             question=chat_body.question,
@@ -230,14 +264,19 @@ def chat_result(
 def search_documents(search: SearchQuery):
     """
         /search endpoint:
-        Search the first {docs_num} relevant documents for a question
+        Search the first {docs_num} relevant documents for a question,
+        in a single collection or in multiple `collections` at once
 
         Specify distance_strategy:
             EUCLIDEAN = EmbeddingStore.embedding.l2_distance (default)
             COSINE = EmbeddingStore.embedding.cosine_distance
             MAX_INNER_PRODUCT = EmbeddingStore.embedding.max_inner_product
     """
-    collection = check_collection_name(search.collection)
+    names = search.collection_names()
+    if len(names) > 1:
+        check_collection_names(names)
+        return extract_content_score(search_vector_qa(search=search))
+    collection = check_collection_name(names[0])
     if search.docs_num is None and 'docs_num' in collection.cmetadata:
         search.docs_num = int(collection.cmetadata['docs_num'])
     result = search_vector_qa(search=search)
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import APIRouter, Response, status, Header
 from brevia.dependencies import token_auth
 from brevia.connection import test_connection
+from brevia.embeddings_cache import query_embeddings_cache
 from brevia.settings import get_settings
 
 router = APIRouter()
@@ -40,3 +41,16 @@ def api_status(
     return {
         'db_status': 'OK' if db_status else 'KO'
     }
+
+
+@router.get('/status/embeddings_cache', tags=['Status'])
+def api_embeddings_cache_status(
+    token: str | None = None,
+    authorization: Annotated[str | None, Header()] = None
+):
+    """ /status/embeddings_cache endpoint, query embeddings cache counters """
+    check_authorization(token=token, authorization=authorization)
+
+    return {
+        'query_embeddings_cache': query_embeddings_cache().stats(),
+    }
@@ -33,6 +33,8 @@ class Settings(BaseSettings):
     pgvector_user: str = Field(default='', exclude=True)
     pgvector_password: str = Field(default='', exclude=True)
     pgvector_pool_size: int = Field(default=10, exclude=True)
+    # async driver (`psycopg` or `asyncpg`) used by async db calls, if set
+    pgvector_async_driver: str = Field(default='', exclude=True)
     # optional DSN URI, if set other pgvector_* settings are ignored
     pgvector_dsn_uri: str = Field(default='', exclude=True)
 
@@ -60,9 +62,26 @@ class Settings(BaseSettings):
     text_chunk_size: int = 2000
     text_chunk_overlap: int = 200
     text_splitter: Json[dict[str, Any]] = '{}'  # custom splitter settings
+    # local path of NLTK data, avoids downloads if data are already there
+    nltk_data_path: str = ''
+    # max number of text chunks embedded and inserted at once in batch indexing
+    index_batch_size: int = 500
+    # number of processes used to extract PDF pages text, 1 means no parallelism
+    pdf_extract_workers: int = 1
+    # max seconds to wait for OCR of a single PDF page
+    pdf_ocr_timeout: float = 120
+    # number of embeddings centroids kept per collection, 0 disables them
+    collection_centroids: int = 0
+
+    # Links: HTTP requests timeout (seconds) and max concurrent requests per host
+    links_request_timeout: float = 30
+    links_host_concurrency: int = 2
 
     # Search
     search_docs_num: int = 4
+    # collections searched in multiple collections search, closest to the
+    # query by centroids; 0 searches all collections
+    search_route_collections: int = 0
 
     # LLM settings
     qa_completion_llm: Json[dict[str, Any]] = """{
@@ -97,11 +116,17 @@ class Settings(BaseSettings):
         int,
         Field(deprecated='Define size in `embeddings` conf')
     ] = Field(default=1536, exclude=True)
+    # persistent cache of text chunks embeddings, used in indexing
+    embeddings_cache: bool = True
+    # in-process LRU cache of query embeddings: max items and time to live (seconds)
+    query_embeddings_cache_size: int = 1000
+    query_embeddings_cache_ttl: int = 3600
 
     # QA
     qa_no_chat_history: bool = False  # don't load chat history
     qa_followup_sim_threshold: float = 0.735  # similitude threshold in followup
     qa_retriever: Json[dict[str, Any]] = '{}'  # custom retriever settings
+    qa_rerank: Json[dict[str, Any]] = '{}'  # retrieved documents re-ranking
 
     # Summarization
     summ_default_chain: str = 'stuff'
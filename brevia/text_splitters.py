@@ -0,0 +1,149 @@
+"""Built-in text splitters, alternatives to NLTK based default splitter"""
+import re
+import zlib
+from collections import deque
+from typing import Any, Iterator
+from langchain_text_splitters.base import TextSplitter
+
+# sentence end punctuation, optional closing quotes or brackets and whitespace,
+# not after a single letter or digit like in initials or numbered lists;
+# or a paragraph break, i.e. an empty line. Patterns start with the same
+# characters class, to quickly skip text between boundaries
+SENTENCE_BOUNDARY = re.compile(
+    r'[.!?…\n](?:'
+    r'(?<=\n)[^\S\n]*\n\s*'
+    r'|(?<!\n)(?<!\b\w[.!?…])[.!?…]*["\'”’)\]]*(?P<space>\s+)'
+    r')'
+)
+# CRC32 hash values range, used to turn hashes into boundary probabilities
+HASH_RANGE = 2 ** 32
+
+
+def sentence_spans(text: str) -> Iterator[tuple[int, int]]:
+    """
+    Sentences `(start, end)` offsets in a text, without surrounding whitespace,
+    found in a single pass of `SENTENCE_BOUNDARY` regex
+    """
+    start = len(text) - len(text.lstrip())
+    stop = len(text.rstrip())
+    for match in SENTENCE_BOUNDARY.finditer(text, start, stop):
+        if match.group('space'):
+            end = match.start('space')
+        else:
+            end = match.start()
+            while end > start and text[end - 1].isspace():
+                end -= 1
+        if end > start:
+            yield start, end
+        start = match.end()
+    if stop > start:
+        yield start, stop
+
+
+class RegexTextSplitter(TextSplitter):
+    """
+    Fast sentence based splitter: sentence boundaries are found with a compiled
+    regex and merged into chunks using text offsets, chunks are slices of the
+    original text. Sentences are merged like in `NLTKTextSplitter`, following
+    `chunk_size` and `chunk_overlap` semantics; a sentence longer than
+    `chunk_size` is kept as a single chunk.
+    """
+
+    def span_length(self, text: str, start: int, end: int) -> int:
+        """Length of a text span, skip slicing with default `len` function"""
+        if self._length_function is len:
+            return end - start
+
+        return self._length_function(text[start:end])
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into chunks of sentences"""
+        chunks = []
+        window: deque[tuple[int, int]] = deque()
+        for start, end in sentence_spans(text):
+            if window and self.span_length(text, window[0][0], end) > self._chunk_size:
+                chunks.append(text[window[0][0]:window[-1][1]])
+                # keep `chunk_overlap` sentences at the head of next chunk
+                while window and (
+                    self.span_length(text, window[0][0], window[-1][1])
+                    > self._chunk_overlap
+                    or self.span_length(text, window[0][0], end) > self._chunk_size
+                ):
+                    window.popleft()
+            window.append((start, end))
+        if window:
+            chunks.append(text[window[0][0]:window[-1][1]])
+
+        return chunks
+
+
+class ContentDefinedTextSplitter(TextSplitter):
+    """
+    Content-defined chunking splitter: chunks end at sentence ends chosen by a
+    hash of the text right before them, instead of by character counts from
+    the text start, so that an edit only changes the neighbouring chunks.
+
+    A sentence end becomes a chunk boundary with a probability proportional to
+    the sentence length, to get chunks of `avg_size` characters on average,
+    once a chunk is at least `min_size` long; chunks are cut anyway before
+    exceeding `chunk_size` minus `chunk_overlap`. Trailing sentences of the
+    previous chunk, up to `chunk_overlap` characters, are then prepended to
+    each chunk without affecting boundaries.
+    """
+
+    def __init__(
+        self,
+        avg_size: int | None = None,
+        min_size: int | None = None,
+        window: int = 64,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._max_size = max(1, self._chunk_size - self._chunk_overlap)
+        self._avg_size = avg_size or max(1, self._max_size // 2)
+        self._min_size = self._max_size // 4 if min_size is None else min_size
+        self._window = window
+
+    def is_boundary(self, text: str, start: int, end: int) -> bool:
+        """
+        Check if the end of `text[start:end]` sentence is a chunk boundary,
+        using a CRC32 hash of the preceding `window` characters: unlike
+        python `hash()` it does not change between processes
+        """
+        digest = zlib.crc32(text[max(0, end - self._window):end].encode())
+
+        return digest < HASH_RANGE * (end - start) / self._avg_size
+
+    def chunk_sentences(self, text: str) -> Iterator[list[tuple[int, int]]]:
+        """Sentences `(start, end)` offsets of each content-defined chunk"""
+        current: list[tuple[int, int]] = []
+        for start, end in sentence_spans(text):
+            if current and end - current[0][0] > self._max_size:
+                yield current
+                current = []
+            current.append((start, end))
+            if (
+                end - current[0][0] >= self._min_size
+                and self.is_boundary(text, start, end)
+            ):
+                yield current
+                current = []
+        if current:
+            yield current
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into content-defined chunks of sentences"""
+        chunks = []
+        previous: list[tuple[int, int]] = []
+        for sentences in self.chunk_sentences(text):
+            start = sentences[0][0]
+            for sent_start, _ in reversed(previous):
+                if sentences[-1][1] - sent_start > self._chunk_size:
+                    break
+                if sentences[0][0] - sent_start > self._chunk_overlap:
+                    break
+                start = sent_start
+            chunks.append(text[start:sentences[-1][1]])
+            previous = sentences
+
+        return chunks
@@ -1,6 +1,9 @@
 """Utility functions to import/export collections using CSV postgres files."""
+import csv
 from os import path
+from sqlalchemy.orm import Session
 from brevia import connection, collections
+from brevia.embedding_partitions import create_partition
 
 
 def export_collection_data(
@@ -40,7 +43,7 @@ def import_collection_data(
     folder_path: str,
     collection: str,
 ):
-    """Import collection data using `psql`"""
+    """Import collection data with `COPY`, in a single transaction"""
     if collections.collection_name_exists(collection):
         raise ValueError(f"Collection '{collection}' already exists, exiting")
 
@@ -52,16 +55,27 @@ def import_collection_data(
     if not path.exists(csv_file_embedding):
         raise ValueError(f"CSV file {csv_file_embedding} not found, exiting")
 
-    table = 'langchain_pg_collection'
-    copy = f"\\copy {table} FROM '{csv_file_collection}' WITH DELIMITER ',' CSV HEADER"
-    res = connection.psql_command(cmd=copy)
-    if not res:
-        return
-
-    table = 'langchain_pg_embedding'
-    copy = f"\\copy {table} FROM '{csv_file_embedding}' WITH DELIMITER ',' CSV HEADER"
-    res = connection.psql_command(cmd=copy)
-    if not res:
-        return
+    with Session(connection.db_connection()) as session:
+        copy_csv_file(session, 'langchain_pg_collection', csv_file_collection)
+        # embeddings table partitions of imported collections, if partitioned
+        for collection_id in csv_column(csv_file_collection, 'uuid'):
+            create_partition(session, collection_id)
+        copy_csv_file(session, 'langchain_pg_embedding', csv_file_embedding)
+        session.commit()
 
     print(f"Collection '{collection}' imported")
+
+
+def copy_csv_file(session: Session, table: str, csv_file: str):
+    """Copy CSV file with header into a table using `COPY FROM STDIN`"""
+    with open(csv_file, encoding='utf-8') as file:
+        header = [col.strip().strip('"') for col in file.readline().split(',')]
+        columns = ', '.join(f'"{col}"' for col in header)
+        statement = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+        connection.copy_from_stdin(session=session, statement=statement, file=file)
+
+
+def csv_column(csv_file: str, column: str) -> list[str]:
+    """Values of a column of a CSV file with header"""
+    with open(csv_file, encoding='utf-8', newline='') as file:
+        return [row[column] for row in csv.DictReader(file)]
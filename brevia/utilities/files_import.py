@@ -2,8 +2,8 @@
 import os
 from typing import List, Any
 from langchain_core.documents import Document
-from brevia.index import add_document
-from brevia.load_file import read
+from brevia.index import add_document_stream
+from brevia.load_file import iter_texts, read
 
 
 def index_file_folder(
@@ -15,12 +15,17 @@ def index_file_folder(
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File {file_path} does not exist.")
 
+    files = [file_path]
+    if os.path.isdir(file_path):
+        files = [f'{file_path}/{file}' for file in os.listdir(file_path)]
+
     chunks_num = 0
-    docs = load_file_folder_documents(file_path=file_path, **kwargs)
-    for doc in docs:
-        chunks_num += add_document(
-            document=doc,
+    for file in files:
+        # file contents are streamed, i.e. PDF files page by page
+        chunks_num += add_document_stream(
+            texts=iter_texts(file_path=file, **kwargs),
             collection_name=collection,
+            metadata={'type': 'files', 'path': file_path},
         )
 
     return chunks_num
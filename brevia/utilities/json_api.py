@@ -1,8 +1,91 @@
 """Utility functions to format sqlalchemy query data as JSON API."""
+import base64
+import json
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+from sqlalchemy import ColumnElement, tuple_
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
+CountMode = Literal['exact', 'estimate', 'none']
+CURSOR_LABEL = 'pagination_cursor_'
 
-def query_data_pagination(query: Query, page: int = 1, page_size: int = 50):
+
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` statement, used to read planner estimates"""
+    # pylint: disable=too-few-public-methods,abstract-method
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def compile_explain(element, compiler, **kwargs):
+    """Compile `Explain` statement"""
+    return f'EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}'
+
+
+def query_count(query: Query, count: CountMode = 'exact') -> int | None:
+    """
+    Query rows number: `exact` runs a `COUNT(*)` query, `estimate` reads
+    the planner estimated rows, `none` skips counting
+    """
+    if count == 'none':
+        return None
+    if count == 'estimate':
+        plan = query.session.execute(Explain(query.statement)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    return query.count()
+
+
+def encode_cursor(values: list) -> str:
+    """Encode sort key values as an opaque cursor"""
+    items = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    data = json.dumps(items, default=str).encode()
+
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def cursor_value(column: ColumnElement, value):
+    """Convert a decoded cursor value to the sort key column python type"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None:
+        return value
+    if issubclass(python_type, datetime):
+        return datetime.fromisoformat(value)
+    if issubclass(python_type, UUID):
+        return UUID(value)
+
+    return value
+
+
+def decode_cursor(cursor: str, keys: list[ColumnElement]) -> list:
+    """Decode an opaque cursor into sort key values"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(data)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError('values mismatch')
+        return [cursor_value(key, val) for key, val in zip(keys, values)]
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f'Invalid pagination cursor: {cursor}') from exc
+
+
+def query_data_pagination(
+    query: Query,
+    page: int = 1,
+    page_size: int = 50,
+    count: CountMode = 'exact',
+):
     """
         Format query data with pagination
     """
@@ -10,16 +93,18 @@ def query_data_pagination(query: Query, page: int = 1, page_size: int = 50):
     page_size = min(1000, page_size)  # max page size is 1000
     offset = (page - 1) * page_size
 
-    count = query.count()
+    total = query_count(query=query, count=count)
     results = [u._asdict() for u in query.offset(offset).limit(page_size).all()]
-    pcount = int(count / page_size)
-    pcount += 0 if (count % page_size) == 0 else 1
+    pcount = None
+    if total is not None:
+        pcount = int(total / page_size)
+        pcount += 0 if (total % page_size) == 0 else 1
 
     return {
         'data': results,
         'meta': {
             'pagination': {
-                'count': count,
+                'count': total,
                 'page': page,
                 'page_count': pcount,
                 'page_items': len(results),
@@ -27,3 +112,54 @@ def query_data_pagination(query: Query, page: int = 1, page_size: int = 50):
             },
         }
     }
+
+
+def query_data_cursor(
+    query: Query,
+    keys: list[ColumnElement],
+    cursor: str | None = None,
+    page_size: int = 50,
+    count: CountMode = 'exact',
+    descending: bool = True,
+):
+    """
+        Format query data with keyset pagination: rows are sorted by `keys`,
+        unique as a whole (i.e. `created`, `uuid`), and the opaque
+        `next_cursor` in response is used to read the following page
+    """
+    page_size = max(1, min(1000, page_size))  # max page size is 1000
+    total = query_count(query=query, count=count)
+
+    query = query.add_columns(
+        *[key.label(f'{CURSOR_LABEL}{i}') for i, key in enumerate(keys)]
+    )
+    if cursor:
+        values = decode_cursor(cursor=cursor, keys=keys)
+        if descending:
+            query = query.filter(tuple_(*keys) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*keys) > tuple_(*values))
+    order = [key.desc() if descending else key.asc() for key in keys]
+    # one more row is read to know if a next page exists
+    rows = query.order_by(None).order_by(*order).limit(page_size + 1).all()
+
+    results = []
+    values = []
+    for row in rows[:page_size]:
+        item = row._asdict()
+        values = [item.pop(f'{CURSOR_LABEL}{i}') for i in range(len(keys))]
+        results.append(item)
+    next_cursor = encode_cursor(values) if len(rows) > page_size else None
+
+    return {
+        'data': results,
+        'meta': {
+            'pagination': {
+                'count': total,
+                'cursor': cursor or None,
+                'next_cursor': next_cursor,
+                'page_items': len(results),
+                'page_size': page_size,
+            },
+        }
+    }
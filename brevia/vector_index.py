@@ -0,0 +1,301 @@
+"""Approximate nearest neighbour (ANN) vector index handling for collections"""
+import logging
+from langchain_community.vectorstores.pgembedding import CollectionStore
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from brevia import connection, collections
+from brevia.embedding_partitions import EMBEDDING_TABLE, index_table
+
+# pgvector operator classes for every supported distance strategy
+DISTANCE_OPS = {
+    'cosine': 'vector_cosine_ops',
+    'euclidean': 'vector_l2_ops',
+    'max': 'vector_ip_ops',
+}
+# default number of candidates re-ranked per requested result,
+# for every reduced precision storage
+RERANK_FACTOR = {
+    'halfvec': 2,
+    'bit': 10,
+}
+# default number of candidates re-ranked per requested result
+# with the truncated embeddings prefix index
+PREFIX_RERANK_FACTOR = 4
+# pgvector default and max `hnsw.ef_search`
+HNSW_EF_SEARCH = 40
+HNSW_EF_SEARCH_MAX = 1000
+
+
+class VectorIndexConf(BaseModel):
+    """
+    Vector index configuration, stored in collection `cmetadata`
+    under the `vector_index` key.
+
+    Attributes:
+        type (str): Index type, `hnsw` (default) or `ivfflat`.
+        dimension (int | None): Embeddings vector dimension, read from
+            stored embeddings if missing.
+        distance (str): Distance strategy used in searches, defaults to 'cosine'.
+        m (int): HNSW max number of connections per layer.
+        ef_construction (int): HNSW size of the dynamic candidate list on build.
+        lists (int): IVFFlat number of inverted lists.
+        ef_search (int | None): Default HNSW `hnsw.ef_search` used in queries.
+        probes (int | None): Default IVFFlat `ivfflat.probes` used in queries.
+        storage (str): Indexed vectors precision: `vector` (default, float32),
+            `halfvec` (float16) or `bit` (binary quantized); with reduced
+            precision candidates are re-ranked using full precision vectors.
+        rerank_k (int | None): Number of candidates re-ranked with reduced
+            precision storage, defaults to a multiple of requested documents.
+    """
+    type: str = Field(pattern='^(hnsw|ivfflat)$', default='hnsw')
+    dimension: int | None = Field(default=None, gt=0, le=16000)
+    distance: str = Field(pattern='^(cosine|euclidean|max)$', default='cosine')
+    m: int = Field(default=16, ge=2, le=100)
+    ef_construction: int = Field(default=64, ge=4, le=1000)
+    lists: int = Field(default=100, ge=1, le=32768)
+    ef_search: int | None = Field(default=None, ge=1, le=1000)
+    probes: int | None = Field(default=None, ge=1, le=32768)
+    storage: str = Field(pattern='^(vector|halfvec|bit)$', default='vector')
+    rerank_k: int | None = Field(default=None, ge=1, le=HNSW_EF_SEARCH_MAX)
+
+
+def vector_index_key(prefix: bool = False) -> str:
+    """
+    Collection metadata key of the vector index configuration: with `prefix`
+    the index of truncated embeddings, where `dimension` is the prefix length
+    """
+    return 'prefix_index' if prefix else 'vector_index'
+
+
+def vector_index_name(collection_id: str, prefix: bool = False) -> str:
+    """Vector index name of a collection"""
+    name = 'pre' if prefix else 'vec'
+
+    return f"ix_embedding_{name}_{str(collection_id).replace('-', '')}"
+
+
+def vector_index_conf(
+    cmetadata: dict | None,
+    prefix: bool = False,
+) -> VectorIndexConf | None:
+    """Read vector index configuration from collection metadata, if any"""
+    conf = (cmetadata or {}).get(vector_index_key(prefix))
+    if not conf:
+        return None
+
+    return VectorIndexConf(**conf)
+
+
+def rerank_k(
+    conf: VectorIndexConf | None,
+    k: int,
+    prefix: bool = False,
+) -> int | None:
+    """
+    Number of candidates read from a reduced precision or prefix index and
+    re-ranked to return `k` documents, None if full vectors are indexed
+    """
+    if conf is None or (conf.storage == 'vector' and not prefix):
+        return None
+    factor = RERANK_FACTOR.get(conf.storage, 1)
+    if prefix:
+        factor = max(factor, PREFIX_RERANK_FACTOR)
+
+    return max(k, conf.rerank_k or factor * k)
+
+
+def search_settings(
+    conf: VectorIndexConf | None,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    candidates: int | None = None,
+) -> dict[str, int]:
+    """
+    Postgres settings to apply before a vector search query using the index,
+    query parameters override collection defaults.
+    HNSW `ef_search` is raised to read at least `candidates` items, if set.
+    """
+    if conf is None:
+        return {}
+    if conf.type == 'hnsw':
+        value = ef_search or conf.ef_search
+        if candidates and (value or HNSW_EF_SEARCH) < candidates:
+            value = min(candidates, HNSW_EF_SEARCH_MAX)
+        return {'hnsw.ef_search': int(value)} if value else {}
+
+    value = probes or conf.probes
+    return {'ivfflat.probes': int(value)} if value else {}
+
+
+def embeddings_dimension(collection_id: str) -> int | None:
+    """Read embeddings vector dimension of a collection from stored items"""
+    query = text(
+        'SELECT vector_dims(embedding) FROM langchain_pg_embedding '
+        'WHERE collection_id = :collection_id LIMIT 1'
+    )
+    with Session(connection.db_connection()) as session:
+        return session.execute(query, {'collection_id': collection_id}).scalar()
+
+
+def index_expression(conf: VectorIndexConf, prefix: bool = False) -> str:
+    """
+    Indexed expression and operator class of a vector index: the embedding
+    vector, or its first `dimension` items with `prefix`, casted to the
+    configured storage precision and dimension
+    """
+    source = f'subvector(embedding, 1, {conf.dimension})' if prefix else 'embedding'
+    if conf.storage == 'bit':
+        return f'(binary_quantize({source})::bit({conf.dimension})) bit_hamming_ops'
+    ops = DISTANCE_OPS[conf.distance]
+    if conf.storage == 'halfvec':
+        ops = ops.replace('vector_', 'halfvec_')
+
+    return f'({source}::{conf.storage}({conf.dimension})) {ops}'
+
+
+def create_index_statement(
+    collection_id: str,
+    conf: VectorIndexConf,
+    prefix: bool = False,
+    table: str = EMBEDDING_TABLE,
+) -> str:
+    """
+    Build `CREATE INDEX CONCURRENTLY` statement for a collection vector index,
+    on `table`: the embeddings table or one of its partitions
+    """
+    params = f'm = {conf.m}, ef_construction = {conf.ef_construction}'
+    if conf.type == 'ivfflat':
+        params = f'lists = {conf.lists}'
+
+    return (
+        f'CREATE INDEX CONCURRENTLY {vector_index_name(collection_id, prefix)} '
+        f'ON {table} USING {conf.type} '
+        f'({index_expression(conf, prefix)}) WITH ({params}) '
+        f"WHERE collection_id = '{collection_id}'"
+    )
+
+
+def load_collection(collection_name: str) -> CollectionStore:
+    """Load collection by name or raise a ValueError"""
+    collection = collections.single_collection_by_name(collection_name)
+    if collection is None:
+        raise ValueError(f'Collection not found: {collection_name}')
+
+    return collection
+
+
+def create_vector_index(
+    collection_name: str,
+    conf: dict | None = None,
+    prefix: bool = False,
+) -> VectorIndexConf:
+    """
+    Create the ANN vector index of a collection, without locking writes,
+    and save its configuration in collection metadata.
+    With `prefix` the index is created on the first `dimension` items of
+    embeddings, used to prefilter candidates in `prefix` searches.
+    """
+    collection = load_collection(collection_name)
+    index_conf = VectorIndexConf(**(conf or {}))
+    if prefix:
+        check_prefix_dimension(collection_name, collection.uuid, index_conf)
+    if index_conf.dimension is None:
+        index_conf.dimension = embeddings_dimension(collection.uuid)
+    if index_conf.dimension is None:
+        raise ValueError(
+            f'Unable to detect embeddings dimension of "{collection_name}", '
+            'please provide one'
+        )
+
+    log = logging.getLogger(__name__)
+    log.info('Creating %s vector index on "%s"', index_conf.type, collection_name)
+    drop_index(collection.uuid, prefix)
+    try:
+        connection.execute_autocommit(
+            create_index_statement(
+                collection.uuid, index_conf, prefix, table=index_table(collection.uuid)
+            )
+        )
+    except Exception:
+        # a failed concurrent build leaves an invalid index behind
+        drop_index(collection.uuid, prefix)
+        raise
+
+    cmetadata = dict(collection.cmetadata or {})
+    cmetadata[vector_index_key(prefix)] = index_conf.model_dump(exclude_none=True)
+    collections.update_collection(
+        uuid=collection.uuid,
+        name=collection.name,
+        cmetadata=cmetadata,
+    )
+    log.info('Vector index on "%s" created', collection_name)
+
+    return index_conf
+
+
+def check_prefix_dimension(
+    collection_name: str,
+    collection_id: str,
+    conf: VectorIndexConf,
+) -> None:
+    """Check that prefix index dimension is set and shorter than embeddings"""
+    if conf.dimension is None:
+        raise ValueError(
+            f'Missing prefix dimension of "{collection_name}" prefix index'
+        )
+    full_dimension = embeddings_dimension(collection_id)
+    if full_dimension is not None and conf.dimension >= full_dimension:
+        raise ValueError(
+            f'Prefix dimension {conf.dimension} of "{collection_name}" must be '
+            f'less than embeddings dimension {full_dimension}'
+        )
+
+
+def rebuild_vector_index(
+    collection_name: str,
+    conf: dict | None = None,
+    prefix: bool = False,
+) -> VectorIndexConf:
+    """
+    Rebuild the ANN vector index of a collection: with a new configuration
+    the index is recreated, otherwise it's rebuilt with `REINDEX CONCURRENTLY`
+    """
+    collection = load_collection(collection_name)
+    current = vector_index_conf(collection.cmetadata, prefix)
+    if current is None or conf:
+        new_conf = current.model_dump(exclude_none=True) if current else {}
+        return create_vector_index(
+            collection_name=collection_name,
+            conf=new_conf | (conf or {}),
+            prefix=prefix,
+        )
+
+    log = logging.getLogger(__name__)
+    log.info('Rebuilding vector index on "%s"', collection_name)
+    connection.execute_autocommit(
+        f'REINDEX INDEX CONCURRENTLY {vector_index_name(collection.uuid, prefix)}'
+    )
+
+    return current
+
+
+def drop_index(collection_id: str, prefix: bool = False) -> None:
+    """Drop vector index of a collection, if it exists"""
+    connection.execute_autocommit(
+        'DROP INDEX CONCURRENTLY IF EXISTS '
+        f'{vector_index_name(collection_id, prefix)}'
+    )
+
+
+def drop_vector_index(collection_name: str, prefix: bool = False) -> None:
+    """Drop the ANN vector index of a collection and remove its configuration"""
+    collection = load_collection(collection_name)
+    drop_index(collection.uuid, prefix)
+    cmetadata = dict(collection.cmetadata or {})
+    if cmetadata.pop(vector_index_key(prefix), None) is not None:
+        collections.update_collection(
+            uuid=collection.uuid,
+            name=collection.name,
+            cmetadata=cmetadata,
+        )
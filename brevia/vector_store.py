@@ -0,0 +1,678 @@
+"""Postgres+pgvector vector store used in index and search actions."""
+import json
+from copy import deepcopy
+from threading import Lock
+from typing import Any
+import sqlalchemy
+from langchain_community.vectorstores.pgvector import (
+    DistanceStrategy,
+    PGVector,
+    _get_embedding_collection_store,
+)
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
+from langchain_core.documents import Document
+from langchain_core.runnables.config import run_in_executor
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy.dialects.postgresql import JSONPATH, REGCONFIG, TSVECTOR
+from sqlalchemy.orm import Session
+import numpy as np
+from brevia.connection import (
+    async_db_session,
+    connection_string,
+    get_async_engine,
+    get_engine,
+)
+from brevia.embedding_partitions import init_partition
+from brevia.embeddings_cache import load_cached_embeddings
+from brevia.hybrid_search import (
+    DOCUMENT_TSV_COLUMN,
+    HybridSearchConf,
+    hybrid_search_conf,
+)
+from brevia.vector_index import (
+    VectorIndexConf,
+    rerank_k,
+    search_settings,
+    vector_index_conf,
+)
+
+# per query search parameters, passed as search keyword arguments
+SEARCH_PARAMS = ('ef_search', 'probes')
+
+
+class BreviaPGVector(PGVector):
+    """
+    PGVector store aware of collection specific configurations
+    in `collection_metadata`, like the ANN vector index.
+    """
+
+    collection_id: Any = None
+    """Collection UUID, read once on store creation"""
+
+    def __post_init__(self) -> None:
+        """
+        Initialize the store: db schema is handled by migrations,
+        extension and tables are not created here
+        """
+        embedding_store, collection_store = _get_embedding_collection_store(
+            self._embedding_length, use_jsonb=self.use_jsonb
+        )
+        self.CollectionStore = collection_store  # pylint: disable=invalid-name
+        self.EmbeddingStore = embedding_store  # pylint: disable=invalid-name
+        self.create_collection()
+
+    def create_collection(self) -> None:
+        if self.pre_delete_collection:
+            self.delete_collection()
+        with Session(self._bind) as session:
+            collection, created = self.CollectionStore.get_or_create(
+                session, self.collection_name, cmetadata=self.collection_metadata
+            )
+            self.collection_id = collection.uuid
+        if created:
+            init_partition(self.collection_id)
+
+    @property
+    def index_conf(self) -> VectorIndexConf | None:
+        """Collection vector index configuration, if any"""
+        return vector_index_conf(self.collection_metadata)
+
+    @property
+    def hybrid_conf(self) -> HybridSearchConf:
+        """Collection hybrid search configuration"""
+        return hybrid_search_conf(self.collection_metadata)
+
+    @property
+    def embedding_column(self) -> Any:
+        """
+        Embedding column expression, casted to the indexed vector dimension
+        so that the collection vector index can be used
+        """
+        conf = self.index_conf
+        if conf is None or not conf.dimension:
+            return self.EmbeddingStore.embedding
+
+        return sqlalchemy.cast(self.EmbeddingStore.embedding, Vector(conf.dimension))
+
+    @property
+    def prefix_conf(self) -> VectorIndexConf | None:
+        """Collection truncated embeddings prefix index configuration, if any"""
+        return vector_index_conf(self.collection_metadata, prefix=True)
+
+    @property
+    def distance_strategy(self) -> Any:
+        return self.column_distance(self.embedding_column)
+
+    def column_distance(self, column: Any) -> Any:
+        """Distance function of a vector column using store distance strategy"""
+        if self._distance_strategy == DistanceStrategy.EUCLIDEAN:
+            return column.l2_distance
+        if self._distance_strategy == DistanceStrategy.COSINE:
+            return column.cosine_distance
+        if self._distance_strategy == DistanceStrategy.MAX_INNER_PRODUCT:
+            return column.max_inner_product
+
+        return super().distance_strategy
+
+    def candidate_distance(
+        self,
+        embedding: list[float],
+        conf: VectorIndexConf,
+        prefix: bool = False,
+    ) -> Any:
+        """
+        Distance on reduced precision or truncated vectors, matching the
+        collection `halfvec`, `bit` or prefix vector index expression
+        """
+        source = self.EmbeddingStore.embedding
+        if prefix:
+            # inline literals, as in the prefix index expression
+            source = sqlalchemy.func.subvector(
+                source,
+                sqlalchemy.literal_column('1', sqlalchemy.Integer),
+                sqlalchemy.literal_column(str(conf.dimension), sqlalchemy.Integer),
+            )
+            embedding = embedding[:conf.dimension]
+        if conf.storage == 'bit':
+            column = sqlalchemy.cast(
+                sqlalchemy.func.binary_quantize(source),
+                BIT(conf.dimension),
+            )
+            bits = ''.join('1' if value > 0 else '0' for value in embedding)
+            return column.hamming_distance(
+                sqlalchemy.cast(bits, BIT(conf.dimension))
+            )
+
+        vector_type = HALFVEC if conf.storage == 'halfvec' else Vector
+        column = sqlalchemy.cast(source, vector_type(conf.dimension))
+
+        return self.column_distance(column)(embedding)
+
+    def candidates_subquery(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        prefix: bool = False,
+    ) -> Any | None:
+        """
+        Candidates of a vector search read from a `halfvec` or `bit` index,
+        or from the prefix index with `prefix`, to be re-ranked using full
+        precision vectors; None if candidates are not needed
+        """
+        conf = self.prefix_conf if prefix else self.index_conf
+        candidates_k = rerank_k(conf, k, prefix=prefix)
+        if candidates_k is None:
+            return None
+
+        return (
+            sqlalchemy.select(self.EmbeddingStore.uuid)
+            .where(*self.search_filters(filter=filter))
+            .order_by(self.candidate_distance(embedding, conf, prefix=prefix))
+            .limit(candidates_k)
+            .subquery('candidates')
+        )
+
+    def nearest_statement(
+        self,
+        columns: list[Any],
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        prefix: bool = False,
+        label: str = 'distance',
+    ) -> Any:
+        """
+        Select `columns` and vector distance, as `label`, of the `k` nearest
+        items, using the vector index if available: reduced precision or
+        prefix index candidates are re-ranked using full precision vectors
+        """
+        candidates = self.candidates_subquery(
+            embedding, k=k, filter=filter, prefix=prefix
+        )
+        distance = self.distance_strategy(embedding)
+        if candidates is not None:
+            # not casted, full precision vector index is not used in re-ranking
+            distance = self.column_distance(self.EmbeddingStore.embedding)(embedding)
+        statement = (
+            sqlalchemy.select(*columns, distance.label(label))
+            .where(*self.search_filters(filter=filter))
+            .order_by(distance)
+            .limit(k)
+        )
+        if candidates is None:
+            return statement
+
+        return statement.join(
+            candidates,
+            self.EmbeddingStore.uuid == candidates.c.uuid,
+        )
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[Document]:
+        embedding = self.embedding_function.embed_query(text=query)
+        return self.similarity_search_by_vector(
+            embedding=embedding,
+            k=k,
+            filter=filter,
+            **kwargs,
+        )
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        embedding = self.embedding_function.embed_query(query)
+        return self.similarity_search_with_score_by_vector(
+            embedding=embedding,
+            k=k,
+            filter=filter,
+            **kwargs,
+        )
+
+    def similarity_search_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[Document]:
+        docs_and_scores = self.similarity_search_with_score_by_vector(
+            embedding=embedding,
+            k=k,
+            filter=filter,
+            **kwargs,
+        )
+        return [doc for doc, _ in docs_and_scores]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        results = self._query_collection(
+            embedding=embedding,
+            k=k,
+            filter=filter,
+            **kwargs,
+        )
+        return self._results_to_docs_and_scores(results)
+
+    def max_marginal_relevance_search_with_score_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        results = self._query_collection(
+            embedding=embedding,
+            k=fetch_k,
+            filter=filter,
+            **kwargs,
+        )
+        embedding_list = [result.EmbeddingStore.embedding for result in results]
+        mmr_selected = maximal_marginal_relevance(
+            np.array(embedding, dtype=np.float32),
+            embedding_list,
+            k=k,
+            lambda_mult=lambda_mult,
+        )
+        candidates = self._results_to_docs_and_scores(results)
+
+        return [r for i, r in enumerate(candidates) if i in mmr_selected]
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[Document]:
+        """Hybrid full-text and vector search"""
+        docs_and_scores = self.hybrid_search_with_score(
+            query=query,
+            k=k,
+            filter=filter,
+            **kwargs,
+        )
+        return [doc for doc, _ in docs_and_scores]
+
+    def hybrid_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        """
+        Hybrid full-text and vector search, results are fused with
+        reciprocal-rank fusion and scores are higher for more relevant documents
+        """
+        embedding = self.embedding_function.embed_query(query)
+        results = self._query_collection_hybrid(
+            query=query,
+            embedding=embedding,
+            k=k,
+            filter=filter,
+            **kwargs,
+        )
+        return self._hybrid_results_to_docs_and_scores(results)
+
+    @staticmethod
+    def _hybrid_results_to_docs_and_scores(
+        results: list[Any],
+    ) -> list[tuple[Document, float]]:
+        """Return docs and rank fusion scores from hybrid search results"""
+        return [
+            (
+                Document(
+                    page_content=result.EmbeddingStore.document,
+                    metadata=result.EmbeddingStore.cmetadata,
+                ),
+                float(result.score),
+            )
+            for result in results
+        ]
+
+    async def ahybrid_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        """
+        Async hybrid full-text and vector search, using the async engine
+        if available, otherwise in a worker thread
+        """
+        if get_async_engine() is None:
+            return await run_in_executor(
+                None,
+                self.hybrid_search_with_score,
+                query,
+                k=k,
+                filter=filter,
+                **kwargs,
+            )
+        embedding = await self.embedding_function.aembed_query(query)
+        statement = self.hybrid_statement(
+            query=query,
+            embedding=embedding,
+            k=k,
+            filter=filter,
+        )
+        vector_k = self.hybrid_conf.fetch_size(k)
+        results = await self._aexecute_search(statement, vector_k=vector_k, **kwargs)
+
+        return self._hybrid_results_to_docs_and_scores(results)
+
+    async def asimilarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[Document]:
+        docs_and_scores = await self.asimilarity_search_with_score(
+            query=query,
+            k=k,
+            filter=filter,
+            **kwargs,
+        )
+        return [doc for doc, _ in docs_and_scores]
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        """
+        Async similarity search, using the async engine if available,
+        otherwise in a worker thread
+        """
+        if get_async_engine() is None:
+            return await super().asimilarity_search_with_score(
+                query, k=k, filter=filter, **kwargs
+            )
+        embedding = await self.embedding_function.aembed_query(query)
+        prefix = bool(kwargs.pop('prefix', False))
+        statement = self.search_statement(
+            embedding=embedding,
+            k=k,
+            filter=filter,
+            prefix=prefix,
+        )
+        results = await self._aexecute_search(
+            statement, vector_k=k, prefix=prefix, **kwargs
+        )
+
+        return self._results_to_docs_and_scores(results)
+
+    def search_filters(self, filter: dict | None) -> list:
+        # pylint: disable=redefined-builtin
+        """Collection and metadata filter clauses of a search query"""
+        filter_by = [self.EmbeddingStore.collection_id == self.collection_id]
+        if filter:
+            filter_clauses = self._create_filter_clause(filter)
+            if filter_clauses is not None:
+                filter_by.append(filter_clauses)
+
+        return filter_by
+
+    def _handle_field_filter(self, field: str, value: Any) -> Any:
+        """
+        Equality filters on scalar values use the jsonpath `@@` operator,
+        supported by the `jsonb_path_ops` GIN index on `cmetadata`
+        """
+        filter_value = value
+        if isinstance(value, dict) and list(value.keys()) == ['$eq']:
+            filter_value = value['$eq']
+        scalar = isinstance(filter_value, (str, int, float, bool))
+        if not scalar or not field.isidentifier() or field.startswith('$'):
+            return super()._handle_field_filter(field, value)
+
+        path = f'$.{field} == {json.dumps(filter_value)}'
+        return self.EmbeddingStore.cmetadata.op('@@')(
+            sqlalchemy.cast(path, JSONPATH)
+        )
+
+    def search_settings_statements(
+        self,
+        vector_k: int | None = None,
+        prefix: bool = False,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """
+        `SET LOCAL` statements of vector index search settings,
+        `vector_k` is the number of vector search results read,
+        with `prefix` settings of the prefix index are used
+        """
+        conf = self.prefix_conf if prefix else self.index_conf
+        params = {k: kwargs.get(k) for k in SEARCH_PARAMS}
+        candidates = rerank_k(conf, vector_k, prefix=prefix) if vector_k else None
+        settings = search_settings(conf, candidates=candidates, **params)
+        return [
+            sqlalchemy.text(f'SET LOCAL {name} = {int(value)}')
+            for name, value in settings.items()
+        ]
+
+    def apply_search_settings(self, session: Session, **kwargs: Any) -> None:
+        """Apply vector index search settings in current transaction"""
+        for statement in self.search_settings_statements(**kwargs):
+            session.execute(statement)
+
+    def search_statement(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        prefix: bool = False,
+    ) -> Any:
+        """
+        Vector search query, using the vector index if available:
+        with `prefix` candidates are read from truncated embeddings index
+        """
+        return self.nearest_statement(
+            [self.EmbeddingStore],
+            embedding,
+            k=k,
+            filter=filter,
+            prefix=prefix,
+        )
+
+    def hybrid_statement(
+        self,
+        query: str,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+    ) -> Any:
+        """
+        Full-text and vector searches in a single query fusing their rankings:
+        each result scores `weight / (rrf_k + rank)` per search
+        """
+        # pylint: disable=not-callable
+        conf = self.hybrid_conf
+        fetch_k = conf.fetch_size(k)
+        table = self.EmbeddingStore
+        tsv = sqlalchemy.literal_column(
+            f'{table.__tablename__}.{DOCUMENT_TSV_COLUMN}', TSVECTOR
+        )
+        tsquery = sqlalchemy.func.websearch_to_tsquery(
+            sqlalchemy.cast(conf.language, REGCONFIG), query
+        )
+        filter_by = self.search_filters(filter=filter)
+        vector = self.nearest_statement(
+            [table.uuid],
+            embedding,
+            k=fetch_k,
+            filter=filter,
+            label='value',
+        ).subquery('vector_results')
+        text_rank = sqlalchemy.func.ts_rank_cd(tsv, tsquery)
+        lexical = (
+            sqlalchemy.select(table.uuid, text_rank.label('value'))
+            .where(*filter_by, tsv.op('@@')(tsquery))
+            .order_by(text_rank.desc())
+            .limit(fetch_k)
+            .subquery('text_results')
+        )
+        ranked = sqlalchemy.union_all(
+            self._rrf_select(vector, vector.c.value, conf.vector_weight, conf),
+            self._rrf_select(lexical, lexical.c.value.desc(), conf.text_weight, conf),
+        ).subquery('ranked')
+        fused = (
+            sqlalchemy.select(
+                ranked.c.uuid,
+                sqlalchemy.func.sum(ranked.c.score).label('score'),
+            )
+            .group_by(ranked.c.uuid)
+            .subquery('fused')
+        )
+
+        return (
+            sqlalchemy.select(table, fused.c.score.label('score'))
+            .join(fused, table.uuid == fused.c.uuid)
+            .order_by(fused.c.score.desc())
+            .limit(k)
+        )
+
+    def _execute_search(self, statement: Any, **kwargs: Any) -> list[Any]:
+        """Execute a search query applying vector index search settings"""
+        with Session(self._bind) as session:
+            self.apply_search_settings(session=session, **kwargs)
+            results: list[Any] = session.execute(statement).all()
+
+        return results
+
+    async def _aexecute_search(self, statement: Any, **kwargs: Any) -> list[Any]:
+        """Execute a search query with the async engine"""
+        async with async_db_session() as session:
+            for settings_statement in self.search_settings_statements(**kwargs):
+                await session.execute(settings_statement)
+            results: list[Any] = (await session.execute(statement)).all()
+
+        return results
+
+    def _query_collection(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        prefix: bool = False,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """
+        Query the collection using the vector index, if available,
+        with `prefix` two-stage search on truncated embeddings is performed
+        """
+        statement = self.search_statement(
+            embedding=embedding,
+            k=k,
+            filter=filter,
+            prefix=prefix,
+        )
+
+        return self._execute_search(statement, vector_k=k, prefix=prefix, **kwargs)
+
+    def _query_collection_hybrid(
+        self,
+        query: str,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,  # pylint: disable=redefined-builtin
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Run full-text and vector searches in a single query"""
+        statement = self.hybrid_statement(
+            query=query,
+            embedding=embedding,
+            k=k,
+            filter=filter,
+        )
+        vector_k = self.hybrid_conf.fetch_size(k)
+
+        return self._execute_search(statement, vector_k=vector_k, **kwargs)
+
+    @staticmethod
+    def _rrf_select(
+        results: Any,
+        order_by: Any,
+        weight: float,
+        conf: HybridSearchConf,
+    ) -> Any:
+        """Reciprocal-rank fusion weighted score of a search results subquery"""
+        rank = sqlalchemy.func.row_number().over(order_by=order_by)
+        weight = sqlalchemy.literal(float(weight), sqlalchemy.Float)
+        score = weight / (conf.rrf_k + rank)
+
+        return sqlalchemy.select(results.c.uuid, score.label('score'))
+
+
+# process-wide registry of vector stores
+_STORES: dict[tuple, BreviaPGVector] = {}
+_STORES_LOCK = Lock()
+
+
+def vector_store(
+    collection_name: str,
+    collection_metadata: dict | None = None,
+    distance_strategy: DistanceStrategy = DistanceStrategy.COSINE,
+    collection_id: Any = None,
+) -> BreviaPGVector:
+    """
+    Return a long-lived vector store for a collection, keyed by collection name,
+    distance strategy and embeddings configuration.
+    Stores share the db engine connection pool and the embeddings client;
+    a store is recreated if collection metadata or UUID have changed.
+    """
+    metadata = collection_metadata or {}
+    embeddings_conf = metadata.get('embeddings')
+    key = (
+        collection_name,
+        distance_strategy,
+        json.dumps(embeddings_conf, sort_keys=True),
+    )
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is not None and store.collection_metadata == metadata and (
+            collection_id is None or str(store.collection_id) == str(collection_id)
+        ):
+            return store
+
+        store = BreviaPGVector(
+            connection_string=connection_string(),
+            embedding_function=load_cached_embeddings(embeddings_conf),
+            collection_name=collection_name,
+            collection_metadata=deepcopy(metadata),
+            distance_strategy=distance_strategy,
+            use_jsonb=True,
+            connection=get_engine(),
+            create_extension=False,
+        )
+        _STORES[key] = store
+
+    return store
+
+
+def invalidate_vector_stores(collection_name: str | None = None) -> None:
+    """Remove vector stores of a collection from registry, all stores if no name"""
+    with _STORES_LOCK:
+        for key in list(_STORES):
+            if collection_name is None or key[0] == collection_name:
+                del _STORES[key]
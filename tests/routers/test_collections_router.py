@@ -1,8 +1,9 @@
 """Collections router tests"""
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from brevia.routers import collections_router
-from brevia.collections import create_collection
+from brevia.collections import create_collection, single_collection
 
 app = FastAPI()
 app.include_router(collections_router.router)
@@ -55,6 +56,30 @@ def test_patch_collection():
     assert response.text == ''
 
 
+def test_patch_collection_text_search():
+    """Test PATCH /collections/{id} rebuilds text search vectors in background"""
+    collection = create_collection('test_collection', {})
+    with patch('brevia.routers.collections_router.refresh_documents_tsv') as mock:
+        response = client.patch(
+            f'/collections/{collection.uuid}',
+            headers={'Content-Type': 'application/json'},
+            content='{"name": "test_collection", "cmetadata": {"hybrid_search": {}}}',
+        )
+        assert response.status_code == 204
+        mock.assert_called_once_with(
+            collection_id=str(collection.uuid),
+            cmetadata={'hybrid_search': {}},
+        )
+
+        response = client.patch(
+            f'/collections/{collection.uuid}',
+            headers={'Content-Type': 'application/json'},
+            content='{"name": "new_name", "cmetadata": {"hybrid_search": {}}}',
+        )
+        assert response.status_code == 204
+        mock.assert_called_once()
+
+
 def test_delete_collection():
     """Test DELETE /collections endpoint"""
     collection = create_collection('test_collection', {})
@@ -63,3 +88,30 @@ def test_delete_collection():
     )
     assert response.status_code == 204
     assert response.text == ''
+
+
+def test_vector_index_endpoints():
+    """Test create, rebuild and drop vector index endpoints"""
+    collection = create_collection('test_collection', {})
+    response = client.post(
+        f'/collections/{collection.uuid}/vector_index',
+        headers={'Content-Type': 'application/json'},
+        content='{"type": "hnsw", "dimension": 1536}',
+    )
+    assert response.status_code == 202
+    conf = single_collection(collection.uuid).cmetadata['vector_index']
+    assert conf['type'] == 'hnsw'
+    assert conf['dimension'] == 1536
+
+    response = client.post(
+        f'/collections/{collection.uuid}/vector_index/rebuild',
+        headers={'Content-Type': 'application/json'},
+        content='{"type": "ivfflat", "lists": 10}',
+    )
+    assert response.status_code == 202
+    conf = single_collection(collection.uuid).cmetadata['vector_index']
+    assert conf['type'] == 'ivfflat'
+
+    response = client.delete(f'/collections/{collection.uuid}/vector_index')
+    assert response.status_code == 204
+    assert 'vector_index' not in single_collection(collection.uuid).cmetadata
@@ -46,6 +46,94 @@ def test_create_index_failure():
     assert response.status_code == 404
 
 
+def test_index_batch():
+    """Test POST /index/batch endpoint with JSON array"""
+    collection = create_collection('test_collection', {})
+    items = [
+        {'content': 'Lorem', 'collection_id': str(collection.uuid), 'document_id': '1'},
+        {'content': 'Ipsum', 'collection_id': str(collection.uuid), 'document_id': '2'},
+        {'content': 'Dolor', 'collection_id': str(uuid4()), 'document_id': '3'},
+        {'content': 'Sit'},
+    ]
+    response = client.post(
+        '/index/batch',
+        headers={'Content-Type': 'application/json'},
+        content=json.dumps(items),
+    )
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert len(results) == 4
+    assert results[0]['item'] == 4
+    assert results[1] == {
+        'collection_id': str(collection.uuid),
+        'document_id': '1',
+        'chunks': 1,
+    }
+    assert results[2]['chunks'] == 1
+    assert 'was not found' in results[3]['error']
+    docs = read_document(collection_id=collection.uuid, document_id='2')
+    assert docs == [{'document': 'Ipsum', 'cmetadata': {'part': 1}}]
+
+
+def test_index_batch_ndjson():
+    """Test POST /index/batch endpoint with NDJSON stream"""
+    collection = create_collection('test_collection', {})
+    lines = [
+        json.dumps({
+            'content': f'Lorem Ipsum {i}',
+            'collection_id': str(collection.uuid),
+            'document_id': str(i),
+        })
+        for i in range(3)
+    ]
+    response = client.post(
+        '/index/batch',
+        headers={'Content-Type': 'application/x-ndjson'},
+        content='\n'.join(lines) + '\n',
+    )
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert [item['chunks'] for item in results] == [1, 1, 1]
+
+
+def test_index_batch_duplicates():
+    """Test POST /index/batch endpoint with duplicate document ids"""
+    collection = create_collection('test_collection', {})
+    items = [
+        {'content': 'Lorem', 'collection_id': str(collection.uuid), 'document_id': '1'},
+        {'content': 'Ipsum', 'collection_id': str(collection.uuid), 'document_id': '1'},
+    ]
+    response = client.post(
+        '/index/batch',
+        headers={'Content-Type': 'application/json'},
+        content=json.dumps(items),
+    )
+    assert response.status_code == 200
+    results = response.json()['results']
+    assert len(results) == 2
+    assert results[0]['error'] == 'Duplicate document id in request'
+    assert results[1]['chunks'] == 1
+    docs = read_document(collection_id=collection.uuid, document_id='1')
+    assert docs == [{'document': 'Lorem', 'cmetadata': {'part': 1}}]
+
+
+def test_index_batch_failure():
+    """Test POST /index/batch failures"""
+    response = client.post(
+        '/index/batch',
+        headers={'Content-Type': 'text/plain'},
+        content='[]',
+    )
+    assert response.status_code == 415
+
+    response = client.post(
+        '/index/batch',
+        headers={'Content-Type': 'application/json'},
+        content='{"content": "Lorem"}',
+    )
+    assert response.status_code == 400
+
+
 def test_get_index_document():
     """Test GET /index/{collection_id}/{document_id} endpoint"""
     collection = create_collection('test_collection', {})
@@ -375,3 +463,14 @@ def test_get_index_documents_metadata():
         'cmetadata': {'type': 'documents', 'part': 1},
         'custom_id': '123'
     }]
+
+    query = 'page=2&page_size=1'
+    response = client.get(f'/index/{collection.uuid}/documents_metadata?{query}')
+    assert response.status_code == 200
+    data = response.json()
+    assert data['data'] == [{
+        'cmetadata': {'type': 'questions', 'part': 1},
+        'custom_id': '456'
+    }]
+    assert data['meta']['pagination']['count'] == 2
+    assert data['meta']['pagination']['page_count'] == 2
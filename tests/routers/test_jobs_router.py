@@ -161,3 +161,25 @@ def test_jobs_list_with_multiple_filters():
         if job_data['uuid'] == str(job.uuid):
             assert job_data['service'] == service_name
             assert job_data['completed'] is None  # Should be incomplete
+
+
+def test_jobs_list_cursor():
+    """Test /jobs endpoint with keyset pagination"""
+    create_job('TestService1', {'test': 'data1'})
+    create_job('TestService2', {'test': 'data2'})
+
+    response = client.get('/jobs?cursor=&page_size=1&count=none', headers={})
+    assert response.status_code == 200
+    pagination = response.json()['meta']['pagination']
+    assert pagination['count'] is None
+    assert pagination['page_items'] == 1
+
+    cursor = pagination['next_cursor']
+    response = client.get(f'/jobs?cursor={cursor}&page_size=1', headers={})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['data'][0]['service'] == 'TestService1'
+    assert data['meta']['pagination']['next_cursor'] is None
+
+    response = client.get('/jobs?cursor=invalid', headers={})
+    assert response.status_code == 400
@@ -70,6 +70,33 @@ def test_search():
     assert data is not None
 
 
+def test_search_collections():
+    """Test POST /search endpoint with multiple collections"""
+    create_collection('test_collection', {})
+    create_collection('other_collection', {})
+    add_document(
+        document=Document(page_content='Lorem ipsum'),
+        collection_name='other_collection',
+    )
+    body = {'query': 'How?', 'collections': ['test_collection', 'other_collection']}
+    response = client.post(
+        '/search',
+        headers={'Content-Type': 'application/json'},
+        content=dumps(body),
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item['content'] for item in data] == ['Lorem ipsum']
+
+    body = {'query': 'How?', 'collections': ['test_collection', 'missing']}
+    response = client.post(
+        '/search',
+        headers={'Content-Type': 'application/json'},
+        content=dumps(body),
+    )
+    assert response.status_code == 404
+
+
 def test_search_filter():
     """Test POST /search with metadata filter"""
     create_collection('test_collection', {})
@@ -20,6 +20,14 @@ def test_status_ok():
     }
 
 
+def test_status_embeddings_cache():
+    """Test /status/embeddings_cache endpoint"""
+    response = client.get('/status/embeddings_cache', headers={})
+    assert response.status_code == 200
+    data = response.json()['query_embeddings_cache']
+    assert list(data.keys()) == ['hits', 'misses', 'size', 'max_size']
+
+
 def test_status_fail():
     """Test /status failure"""
     settings = get_settings()
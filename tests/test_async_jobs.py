@@ -321,6 +321,25 @@ def test_get_jobs_with_pagination():
     assert pagination['page'] == 2
 
 
+def test_get_jobs_with_cursor():
+    """Test get_jobs function with keyset pagination"""
+    for i in range(3):
+        create_job(f'CursorTestService_{i}', {'test': f'cursor_{i}'})
+
+    result = get_jobs(JobsFilter(cursor='', page_size=2))
+    assert len(result['data']) == 2
+    cursor = result['meta']['pagination']['next_cursor']
+    assert cursor is not None
+
+    result = get_jobs(JobsFilter(cursor=cursor, page_size=2))
+    assert len(result['data']) == 1
+    assert result['meta']['pagination']['next_cursor'] is None
+
+    with pytest.raises(ValueError) as exc:
+        get_jobs(JobsFilter(cursor='invalid'))
+    assert str(exc.value) == 'Invalid pagination cursor: invalid'
+
+
 def test_get_jobs_with_multiple_filters():
     """Test get_jobs function with multiple filters combined"""
     # Create a specific job for this test
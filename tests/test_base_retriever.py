@@ -25,8 +25,22 @@ def mock_vectorstore():
             (Document(page_content="doc2"), 0.8)
         ]
     )
+    vectorstore.ahybrid_search_with_score = AsyncMock(
+        return_value=[
+            (Document(page_content="doc2"), 0.03),
+            (Document(page_content="doc1"), 0.01)
+        ]
+    )
     vectorstore.amax_marginal_relevance_search = AsyncMock(
         return_value=[Document(page_content="doc1"), Document(page_content="doc2")])
+    vectorstore.similarity_search = MagicMock(
+        return_value=[Document(page_content="doc1"), Document(page_content="doc2")])
+    vectorstore.hybrid_search_with_score = MagicMock(
+        return_value=[
+            (Document(page_content="doc2"), 0.03),
+            (Document(page_content="doc1"), 0.01)
+        ]
+    )
     return vectorstore
 
 
@@ -119,6 +133,45 @@ async def test_mmr_search(retriever):
     assert docs[1].page_content == "doc2"
 
 
+@pytest.mark.asyncio
+async def test_hybrid_search(retriever):
+    """
+    Test the hybrid full-text and vector search of BreviaBaseRetriever.
+
+    Args:
+        retriever (BreviaBaseRetriever): An instance of BreviaBaseRetriever.
+    """
+    retriever.search_type = "hybrid"
+    run_manager = MagicMock(CallbackManagerForRetrieverRun)
+    docs = await retriever._aget_relevant_documents(
+        query="test query",
+        run_manager=run_manager
+    )
+    assert len(docs) == 2
+    assert docs[0].page_content == "doc2"
+    assert docs[0].metadata["score"] == 0.03
+
+
+@pytest.mark.asyncio
+async def test_prefix_search(retriever, mock_vectorstore):
+    """
+    Test the truncated embeddings prefix search of BreviaBaseRetriever.
+
+    Args:
+        retriever (BreviaBaseRetriever): An instance of BreviaBaseRetriever.
+        mock_vectorstore (MagicMock): A mock instance of VectorStore.
+    """
+    retriever.search_type = "prefix"
+    run_manager = MagicMock(CallbackManagerForRetrieverRun)
+    docs = await retriever._aget_relevant_documents(
+        query="test query",
+        run_manager=run_manager
+    )
+    assert len(docs) == 2
+    _, kwargs = mock_vectorstore.asimilarity_search.call_args
+    assert kwargs['prefix'] is True
+
+
 @pytest.mark.asyncio
 async def test_invalid_search_type(retriever):
     """
@@ -134,3 +187,37 @@ async def test_invalid_search_type(retriever):
             query="test query",
             run_manager=run_manager
         )
+
+
+def test_sync_hybrid_and_prefix_search(retriever, mock_vectorstore):
+    """
+    Test hybrid and prefix search in the sync path of BreviaBaseRetriever.
+
+    Args:
+        retriever (BreviaBaseRetriever): An instance of BreviaBaseRetriever.
+        mock_vectorstore (MagicMock): A mock instance of VectorStore.
+    """
+    run_manager = MagicMock(CallbackManagerForRetrieverRun)
+    retriever.search_type = "hybrid"
+    docs = retriever._get_relevant_documents(
+        query="test query",
+        run_manager=run_manager
+    )
+    assert docs[0].page_content == "doc2"
+    assert docs[0].metadata["score"] == 0.03
+
+    retriever.search_type = "prefix"
+    docs = retriever._get_relevant_documents(
+        query="test query",
+        run_manager=run_manager
+    )
+    assert len(docs) == 2
+    _, kwargs = mock_vectorstore.similarity_search.call_args
+    assert kwargs['prefix'] is True
+
+    retriever.search_type = "invalid_type"
+    with pytest.raises(ValueError, match="search_type of invalid_type not allowed."):
+        retriever._get_relevant_documents(
+            query="test query",
+            run_manager=run_manager
+        )
@@ -1,14 +1,19 @@
 """chat_history module tests"""
 from datetime import datetime, timedelta
 import uuid
+import pytest
 from brevia.chat_history import (
     history,
     add_history,
+    async_add_history,
+    async_history_from_db,
     history_from_db,
     get_history,
     ChatHistoryFilter,
 )
 from brevia.collections import create_collection
+from brevia.connection import get_async_engine
+from brevia.settings import get_settings
 
 
 def test_history():
@@ -101,3 +106,62 @@ def test_history_from_db():
     result = history_from_db(session_id)
     assert len(result) == 1
     assert result[0] == ('who?', 'me')
+
+
+@pytest.mark.asyncio
+async def test_async_history():
+    """Test async_add_history and async_history_from_db functions"""
+    assert await async_add_history('123', 'test', 'who?', 'me') is None
+    collection = create_collection('test_collection', {})
+    session_id = uuid.uuid4()
+    item = await async_add_history(session_id, 'test_collection', 'who?', 'me')
+    assert item.collection_id == collection.uuid
+    result = await async_history_from_db(session_id)
+    assert result == [('who?', 'me')]
+
+
+@pytest.mark.asyncio
+async def test_async_history_native():
+    """Test async_add_history with the native async engine"""
+    pytest.importorskip('sqlalchemy.ext.asyncio', exc_type=ImportError)
+    pytest.importorskip('psycopg')
+    settings = get_settings()
+    current = settings.pgvector_async_driver
+    settings.pgvector_async_driver = 'psycopg'
+    get_async_engine.cache_clear()
+    try:
+        collection = create_collection('test_collection', {})
+        session_id = uuid.uuid4()
+        item = await async_add_history(session_id, 'test_collection', 'who?', 'me')
+        # attributes are available after commit, without lazy loading
+        assert item.uuid is not None
+        assert item.collection_id == collection.uuid
+        assert await async_history_from_db(session_id) == [('who?', 'me')]
+    finally:
+        settings.pgvector_async_driver = current
+        get_async_engine.cache_clear()
+
+
+def test_get_history_cursor():
+    """Test get_history with keyset pagination"""
+    create_collection('test_collection', {})
+    session_id = uuid.uuid4()
+    for num in range(3):
+        add_history(session_id, 'test_collection', f'question {num}', 'me')
+
+    result = get_history(ChatHistoryFilter(cursor='', page_size=2, count='none'))
+    pagination = result['meta']['pagination']
+    assert [item['question'] for item in result['data']] == [
+        'question 2', 'question 1',
+    ]
+    assert pagination['count'] is None
+    assert pagination['next_cursor'] is not None
+
+    cursor = pagination['next_cursor']
+    result = get_history(ChatHistoryFilter(cursor=cursor, page_size=2))
+    assert [item['question'] for item in result['data']] == ['question 0']
+    assert result['meta']['pagination']['count'] == 3
+    assert result['meta']['pagination']['next_cursor'] is None
+
+    result = get_history(ChatHistoryFilter(count='estimate'))
+    assert isinstance(result['meta']['pagination']['count'], int)
@@ -0,0 +1,153 @@
+"""collection_routing module tests"""
+from collections import namedtuple
+import numpy as np
+import pytest
+from langchain.docstore.document import Document
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+from brevia.collection_routing import (
+    CentroidsUpdate,
+    kmeans_centroids,
+    normalize,
+    read_centroids,
+    refresh_centroids,
+    route_collections,
+    routed_collections,
+    routing_statement,
+)
+from brevia.collections import create_collection
+from brevia.connection import db_connection
+from brevia.index import add_document, remove_document
+from brevia.settings import get_settings
+
+Row = namedtuple('Row', ['collection_id', 'distance'])
+
+
+@pytest.fixture
+def centroids_enabled():
+    """Keep a single embeddings centroid per collection"""
+    settings = get_settings()
+    current = settings.collection_centroids
+    settings.collection_centroids = 1
+    yield
+    settings.collection_centroids = current
+
+
+def test_normalize():
+    """Test normalize function"""
+    result = normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+    assert np.allclose(result, [[0.6, 0.8], [0.0, 0.0]])
+
+
+def test_kmeans_centroids():
+    """Test kmeans_centroids function"""
+    rng = np.random.default_rng(1)
+    vectors = np.concatenate([
+        rng.normal([10, 0, 0], 0.1, size=(50, 3)),
+        rng.normal([0, 10, 0], 0.1, size=(50, 3)),
+    ])
+    result = kmeans_centroids(vectors, 2)
+    assert result.shape == (2, 3)
+    assert np.allclose(np.linalg.norm(result, axis=1), 1)
+    closest = sorted(int(np.argmax(row)) for row in result)
+    assert closest == [0, 1]
+
+    assert kmeans_centroids(vectors[:1], 4).shape == (1, 3)
+
+
+def test_centroids_update_remove():
+    """Test CentroidsUpdate remove method"""
+    update = CentroidsUpdate(None, 'test', size=0)
+    update.remove([[1.0, 0.0]])
+    assert update.counts == {}
+
+    update.size = 2
+    update.centroids = {0: np.array([1.0, 0.0]), 1: np.array([0.0, 1.0])}
+    update.add([[2.0, 0.1], [0.1, 3.0]])
+    update.remove([[2.0, 0.1], [0.0, 1.0]])
+    assert update.counts == {0: 0, 1: 0}
+    assert np.allclose(update.sums[0], [0.0, 0.0])
+    assert np.allclose(update.sums[1], [0.1, 2.0])
+
+
+def test_remove_document_centroids(centroids_enabled):
+    """Test centroids update on remove_document"""
+    collection = create_collection('test_collection', {})
+    add_document(Document(page_content='some text'), 'test_collection', '1')
+    add_document(Document(page_content='other text'), 'test_collection', '2')
+    remove_document(collection.uuid, '1')
+    with Session(db_connection()) as session:
+        assert list(read_centroids(session, collection.uuid)) == [0]
+    remove_document(collection.uuid, '2')
+    with Session(db_connection()) as session:
+        assert read_centroids(session, collection.uuid) == {}
+
+
+def test_routed_collections():
+    """Test routed_collections function"""
+    rows = [Row('a', 0.5), Row('b', 0.1), Row('c', 0.3)]
+    result = routed_collections(rows, [['a', 'b'], ['c', 'd']], 2)
+    assert result == {'b', 'c', 'd'}
+
+
+def test_routing_statement():
+    """Test routing_statement function"""
+    statement = routing_statement([['a', 'b'], ['c']], [[1.0, 0.0], [0.0, 1.0]])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.count('GROUP BY collection_centroids.collection_id') == 2
+    assert 'UNION ALL' in sql
+
+
+def test_add_document_centroids_disabled():
+    """Test centroids are not updated by default"""
+    collection = create_collection('test_collection', {})
+    add_document(Document(page_content='some text'), 'test_collection')
+    with Session(db_connection()) as session:
+        assert read_centroids(session, collection.uuid) == {}
+
+
+def test_add_document_centroids(centroids_enabled):
+    """Test centroids update on add_document"""
+    collection = create_collection('test_collection', {})
+    add_document(Document(page_content='some text'), 'test_collection')
+    add_document(Document(page_content='other text'), 'test_collection')
+    with Session(db_connection()) as session:
+        centroids = read_centroids(session, collection.uuid)
+        update = CentroidsUpdate(session, collection.uuid, size=1)
+    assert list(centroids) == [0]
+    assert update.centroids.keys() == centroids.keys()
+
+
+def test_refresh_centroids():
+    """Test refresh_centroids function"""
+    collection = create_collection('test_collection', {})
+    for text in ['one', 'two', 'three']:
+        add_document(Document(page_content=text), 'test_collection')
+    assert refresh_centroids('test_collection', size=2) == 2
+    with Session(db_connection()) as session:
+        assert list(read_centroids(session, collection.uuid)) == [0, 1]
+
+    assert refresh_centroids('test_collection', size=0) == 0
+    with Session(db_connection()) as session:
+        assert read_centroids(session, collection.uuid) == {}
+
+
+def test_refresh_centroids_fail():
+    """Test refresh_centroids failure"""
+    with pytest.raises(ValueError) as exc:
+        refresh_centroids('not_existing')
+    assert str(exc.value) == 'Collection not found: not_existing'
+
+
+def test_route_collections(centroids_enabled):
+    """Test route_collections function"""
+    first = create_collection('first', {})
+    second = create_collection('second', {})
+    third = create_collection('third', {})
+    add_document(Document(page_content='one'), 'first')
+    add_document(Document(page_content='two'), 'second')
+    with Session(db_connection()) as session:
+        embedding = read_centroids(session, first.uuid)[0].tolist()
+    ids = [[str(first.uuid), str(second.uuid), str(third.uuid)]]
+    result = route_collections(ids, [embedding], 1)
+    assert result == {str(first.uuid), str(third.uuid)}
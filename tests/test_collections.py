@@ -1,6 +1,8 @@
 """collections module tests"""
 import uuid
+import pytest
 from brevia.collections import (
+    async_single_collection_by_name,
     collections_info,
     collection_name_exists,
     collection_exists,
@@ -53,3 +55,13 @@ def test_delete_collection():
     collection = create_collection('new_collection', {})
     delete_collection(collection.uuid)
     assert collection_name_exists('new_collection') is False
+
+
+@pytest.mark.asyncio
+async def test_async_single_collection_by_name():
+    """Test async_single_collection_by_name function"""
+    assert await async_single_collection_by_name('test') is None
+    collection = create_collection('test', {'key': 'value'})
+    result = await async_single_collection_by_name('test')
+    assert result.uuid == collection.uuid
+    assert result.cmetadata == {'key': 'value'}
@@ -18,8 +18,17 @@ from brevia.commands import (
     create_openapi,
     update_collection_links,
     cleanup_jobs,
+    create_vector_index_cmd,
+    rebuild_vector_index_cmd,
+    drop_vector_index_cmd,
+    create_metadata_indexes_cmd,
+    partition_embeddings_cmd,
+)
+from brevia.collections import (
+    create_collection,
+    collection_name_exists,
+    single_collection,
 )
-from brevia.collections import create_collection, collection_name_exists
 from brevia.settings import get_settings
 from brevia.index import add_document
 
@@ -146,8 +155,58 @@ def test_update_collection_links():
     result = runner.invoke(update_collection_links, [
         '--collection',
         collection.name,
+        '--concurrency',
+        '2',
+    ])
+    assert result.exit_code == 0
+    assert 'Processed 1/1 links' in result.output
+
+
+def test_vector_index_commands():
+    """ Test create, rebuild and drop vector index commands """
+    collection = create_collection('test', {})
+    runner = CliRunner()
+    result = runner.invoke(create_vector_index_cmd, [
+        '--collection',
+        collection.name,
+        '--type',
+        'hnsw',
+        '--dimension',
+        '1536',
+    ])
+    assert result.exit_code == 0
+    assert 'Vector index created on "test"' in result.output
+    assert 'vector_index' in single_collection(collection.uuid).cmetadata
+
+    result = runner.invoke(rebuild_vector_index_cmd, [
+        '--collection',
+        collection.name,
+    ])
+    assert result.exit_code == 0
+    assert 'Vector index rebuilt on "test"' in result.output
+
+    result = runner.invoke(drop_vector_index_cmd, [
+        '--collection',
+        collection.name,
     ])
     assert result.exit_code == 0
+    assert 'vector_index' not in single_collection(collection.uuid).cmetadata
+
+
+def test_partition_embeddings_cmd():
+    """ Test partition_embeddings command """
+    create_collection('test', {})
+    runner = CliRunner()
+    result = runner.invoke(partition_embeddings_cmd, [])
+    assert result.exit_code == 0
+    assert 'Embeddings table converted to partitioned layout' in result.output
+    result = runner.invoke(partition_embeddings_cmd, [])
+    assert result.exit_code == 0
+    assert 'Embeddings table is already partitioned' in result.output
+
+    result = runner.invoke(partition_embeddings_cmd, ['--revert'])
+    assert result.exit_code == 0
+    assert 'Embeddings table converted to plain layout' in result.output
 
 
 def test_db_revision_cmd():
@@ -345,3 +404,21 @@ def test_cleanup_jobs_cancelled_operation():
 
     # Verify job still exists
     assert single_job(job.uuid) is not None
+
+
+def test_create_metadata_indexes_cmd():
+    """ Test create_metadata_indexes_cmd function """
+    collection = create_collection('test', {})
+    runner = CliRunner()
+    result = runner.invoke(create_metadata_indexes_cmd, [
+        '--collection',
+        collection.name,
+        '-k',
+        'type',
+        '-k',
+        'url',
+    ])
+    assert result.exit_code == 0
+    assert 'Metadata indexes on "test": ["type", "url"]' in result.output
+    meta = single_collection(collection.uuid).cmetadata
+    assert meta['filterable_metadata'] == ['type', 'url']
@@ -0,0 +1,159 @@
+"""embedding_partitions module tests"""
+import pytest
+from langchain.docstore.document import Document
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from brevia.alembic import downgrade, upgrade
+from brevia.collections import (
+    create_collection,
+    delete_collection,
+    single_collection_by_name,
+)
+from brevia.connection import db_connection
+from brevia.embedding_partitions import (
+    EMBEDDING_TABLE,
+    convert_embeddings,
+    drop_partition,
+    has_partition,
+    index_table,
+    is_attached,
+    is_partitioned,
+    partition_literal,
+    partition_name,
+)
+from brevia.index import add_document
+from brevia.query import SearchQuery, search_vector_qa
+from brevia.vector_index import create_vector_index, vector_index_name
+
+# revision before partitioned embeddings table migration
+PARTITIONS_DOWN_REVISION = 'd8b2f6a4c9e1'
+
+
+@pytest.fixture
+def partitioned():
+    """Convert the embeddings table to partitions, plain table is restored"""
+    assert convert_embeddings(partitioned=True)
+    yield
+    convert_embeddings(partitioned=False)
+
+
+def index_tables(collection_id: str) -> list[str]:
+    """Tables of a collection vector index"""
+    query = text('SELECT tablename FROM pg_indexes WHERE indexname = :name')
+    params = {'name': vector_index_name(collection_id)}
+    with Session(db_connection()) as session:
+        return list(session.execute(query, params).scalars())
+
+
+def search_texts(collection: str) -> list[str]:
+    """Documents texts found in a collection"""
+    result = search_vector_qa(SearchQuery(query='test', collection=collection))
+
+    return [doc.page_content for doc, _ in result]
+
+
+def test_partition_name():
+    """Test partition_name function"""
+    name = partition_name('4f0a6b1e-2c3d-4e5f-8a9b-0c1d2e3f4a5b')
+    assert name == 'langchain_pg_embedding_4f0a6b1e2c3d4e5f8a9b0c1d2e3f4a5b'
+
+
+def test_partition_literal():
+    """Test partition_literal function"""
+    uuid = '4f0a6b1e-2c3d-4e5f-8a9b-0c1d2e3f4a5b'
+    assert partition_literal(uuid) == f"'{uuid}'"
+    with pytest.raises(ValueError):
+        partition_literal("x'; DROP TABLE y; --")
+
+
+def test_convert_embeddings():
+    """Test embeddings table conversion and back"""
+    first = create_collection('first', {})
+    second = create_collection('second', {})
+    add_document(Document(page_content='one'), 'first')
+    add_document(Document(page_content='two'), 'second')
+    create_vector_index('first', {'type': 'hnsw'})
+    with Session(db_connection()) as session:
+        assert not is_partitioned(session)
+    assert convert_embeddings(partitioned=False) is False
+
+    assert convert_embeddings(partitioned=True) is True
+    with Session(db_connection()) as session:
+        assert is_partitioned(session)
+        assert has_partition(session, first.uuid)
+        assert has_partition(session, second.uuid)
+    assert index_table(first.uuid) == partition_name(first.uuid)
+    assert index_tables(first.uuid) == [partition_name(first.uuid)]
+    assert search_texts('first') == ['one']
+    assert search_texts('second') == ['two']
+    assert convert_embeddings(partitioned=True) is False
+
+    assert convert_embeddings(partitioned=False) is True
+    with Session(db_connection()) as session:
+        assert not is_partitioned(session)
+    assert index_table(first.uuid) == EMBEDDING_TABLE
+    assert index_tables(first.uuid) == [EMBEDDING_TABLE]
+    assert search_texts('first') == ['one']
+
+
+def test_convert_embeddings_orphans():
+    """Test embeddings without a collection abort the conversion"""
+    create_collection('test', {})
+    add_document(Document(page_content='one'), 'test')
+    add_document(Document(page_content='two'), 'test')
+    with Session(db_connection()) as session:
+        session.execute(text(
+            f"UPDATE {EMBEDDING_TABLE} SET collection_id = NULL "
+            "WHERE document = 'two'"
+        ))
+        session.commit()
+    with pytest.raises(ValueError) as exc:
+        convert_embeddings(partitioned=True)
+    assert str(exc.value) == '1 embeddings without a collection would be dropped'
+    with Session(db_connection()) as session:
+        assert not is_partitioned(session)
+
+    assert convert_embeddings(partitioned=True, force=True) is True
+    assert search_texts('test') == ['one']
+    convert_embeddings(partitioned=False)
+
+
+def test_partitioned_embeddings_migration(partitioned):
+    """Test migration downgrade restores a plain table, upgrade keeps it"""
+    downgrade(PARTITIONS_DOWN_REVISION)
+    with Session(db_connection()) as session:
+        assert not is_partitioned(session)
+    upgrade()
+    with Session(db_connection()) as session:
+        assert not is_partitioned(session)
+
+
+def test_collection_partition(partitioned):
+    """Test partitions of new and deleted collections"""
+    collection = create_collection('test', {})
+    add_document(Document(page_content='some'), 'new_collection')
+    new_collection = single_collection_by_name('new_collection')
+    with Session(db_connection()) as session:
+        assert has_partition(session, collection.uuid)
+        assert has_partition(session, new_collection.uuid)
+    assert search_texts('new_collection') == ['some']
+
+    add_document(Document(page_content='other'), 'test')
+    delete_collection(collection.uuid)
+    with Session(db_connection()) as session:
+        assert not has_partition(session, collection.uuid)
+        assert single_collection_by_name('test') is None
+    drop_partition(collection.uuid)
+
+
+def test_drop_partition_detached(partitioned):
+    """Test drop_partition drops a partition left detached"""
+    collection = create_collection('test', {})
+    name = partition_name(collection.uuid)
+    with Session(db_connection()) as session:
+        session.execute(text(f'ALTER TABLE {EMBEDDING_TABLE} DETACH PARTITION {name}'))
+        session.commit()
+        assert not is_attached(session, collection.uuid)
+    drop_partition(collection.uuid)
+    with Session(db_connection()) as session:
+        assert not has_partition(session, collection.uuid)
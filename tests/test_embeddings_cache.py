@@ -0,0 +1,135 @@
+"""embeddings_cache module tests"""
+from langchain_community.embeddings.fake import FakeEmbeddings
+from brevia.embeddings_cache import (
+    CachedEmbeddings,
+    LOOKUP_BATCH_SIZE,
+    clear_embeddings_cache,
+    embeddings_conf_hash,
+    load_cached_embeddings,
+    normalize_query,
+    query_embeddings_cache,
+    QueryEmbeddingsCache,
+    read_cached_embeddings,
+    save_cached_embeddings,
+    text_hash,
+)
+from brevia.settings import get_settings
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    """Fake embeddings counting embedded texts"""
+    embedded: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def test_cached_embeddings():
+    """Test CachedEmbeddings class"""
+    fake = CountingEmbeddings(size=10, embedded=[])
+    embeddings = CachedEmbeddings(embeddings=fake, model_hash='abc')
+    first = embeddings.embed_documents(['one', 'two', 'one'])
+    assert len(first) == 3
+    assert first[0] == first[2]
+    assert fake.embedded == ['one', 'two']
+
+    second = embeddings.embed_documents(['two', 'three'])
+    assert fake.embedded == ['one', 'two', 'three']
+    assert second[0] == first[1]
+
+    other = CachedEmbeddings(embeddings=fake, model_hash='def')
+    other.embed_documents(['one'])
+    assert fake.embedded == ['one', 'two', 'three', 'one']
+
+
+def test_read_cached_embeddings():
+    """Test read_cached_embeddings function"""
+    embeddings = CachedEmbeddings(embeddings=FakeEmbeddings(size=5), model_hash='abc')
+    vectors = embeddings.embed_documents(['one'])
+    result = read_cached_embeddings('abc', [text_hash('one'), text_hash('two')])
+    assert list(result.keys()) == [text_hash('one')]
+    assert result[text_hash('one')] == vectors[0]
+
+
+def test_save_cached_embeddings_batches():
+    """Test save_cached_embeddings with more items than a single batch"""
+    items = {text_hash(str(i)): [float(i)] * 3 for i in range(LOOKUP_BATCH_SIZE + 10)}
+    save_cached_embeddings('abc', items)
+    result = read_cached_embeddings('abc', list(items.keys()))
+    assert len(result) == len(items)
+
+
+def test_clear_embeddings_cache():
+    """Test clear_embeddings_cache function"""
+    conf = {'_type': 'fake-embeddings', 'size': 5}
+    embeddings = CachedEmbeddings(
+        embeddings=FakeEmbeddings(size=5),
+        model_hash=embeddings_conf_hash(conf),
+    )
+    embeddings.embed_documents(['one', 'two'])
+    assert clear_embeddings_cache({'_type': 'other'}) == 0
+    assert clear_embeddings_cache(conf) == 2
+    assert clear_embeddings_cache() == 0
+
+
+def test_embeddings_conf_hash():
+    """Test embeddings_conf_hash function"""
+    conf = {'_type': 'fake-embeddings', 'size': 5}
+    assert embeddings_conf_hash(conf) == embeddings_conf_hash(
+        {'size': 5, '_type': 'fake-embeddings'}
+    )
+    assert embeddings_conf_hash(conf) != embeddings_conf_hash({'_type': 'other'})
+    assert embeddings_conf_hash() == embeddings_conf_hash(get_settings().embeddings)
+
+
+def test_load_cached_embeddings():
+    """Test load_cached_embeddings function"""
+    embeddings = load_cached_embeddings()
+    assert isinstance(embeddings, CachedEmbeddings)
+    assert isinstance(embeddings.embeddings, FakeEmbeddings)
+    assert embeddings.persistent is True
+    settings = get_settings()
+    settings.embeddings_cache = False
+    assert load_cached_embeddings().persistent is False
+    settings.embeddings_cache = True
+
+
+def test_cached_query_embeddings():
+    """Test CachedEmbeddings query embeddings cache"""
+    cache = query_embeddings_cache()
+    cache.clear()
+    embeddings = CachedEmbeddings(embeddings=FakeEmbeddings(size=5), model_hash='abc')
+    first = embeddings.embed_query('What is  Brevia? ')
+    assert embeddings.embed_query('What is Brevia?') == first
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'max_size': 1000}
+
+    other = CachedEmbeddings(embeddings=FakeEmbeddings(size=5), model_hash='def')
+    other.embed_query('What is Brevia?')
+    assert cache.misses == 2
+    cache.clear()
+
+
+def test_query_embeddings_cache():
+    """Test QueryEmbeddingsCache class"""
+    cache = QueryEmbeddingsCache(max_size=2, ttl=60)
+    cache.set(('a', 'one'), [1.0])
+    cache.set(('a', 'two'), [2.0])
+    assert cache.get(('a', 'one')) == [1.0]
+    cache.set(('a', 'three'), [3.0])
+    assert cache.get(('a', 'two')) is None
+    assert cache.get(('a', 'one')) == [1.0]
+    assert cache.stats() == {'hits': 2, 'misses': 1, 'size': 2, 'max_size': 2}
+
+    cache = QueryEmbeddingsCache(max_size=2, ttl=-1)
+    cache.set(('a', 'one'), [1.0])
+    assert cache.get(('a', 'one')) is None
+
+    cache = QueryEmbeddingsCache(max_size=0, ttl=60)
+    cache.set(('a', 'one'), [1.0])
+    assert cache.get(('a', 'one')) is None
+
+
+def test_normalize_query():
+    """Test normalize_query function"""
+    assert normalize_query(' What is\n  Brevia? ') == 'What is Brevia?'
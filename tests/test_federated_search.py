@@ -0,0 +1,161 @@
+"""federated_search module tests"""
+from types import SimpleNamespace
+from langchain.docstore.document import Document
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from brevia.collections import create_collection, single_collection_by_name
+from brevia.federated_search import (
+    FederatedRetriever,
+    embeddings_key,
+    federated_results,
+    federated_search_with_score,
+    federated_settings_statements,
+    collection_stores,
+    group_collections,
+    normalize_scores,
+)
+from brevia.index import add_document
+from brevia.vector_index import create_vector_index
+
+FAKE_EMBEDDINGS = {'_type': 'fake-embeddings', 'size': 1536}
+
+
+def test_embeddings_key():
+    """Test embeddings_key function"""
+    assert embeddings_key(None) == 'null'
+    assert embeddings_key({'embeddings': {'b': 1, 'a': 2}}) == '{"a": 2, "b": 1}'
+
+
+def test_group_collections():
+    """Test group_collections function"""
+    first = create_collection('first', {})
+    second = create_collection('second', {'embeddings': FAKE_EMBEDDINGS})
+    third = create_collection('third', {})
+    groups = group_collections([first, second, third])
+    assert [[item.name for item in group] for group in groups.values()] == [
+        ['first', 'third'], ['second'],
+    ]
+
+
+def test_normalize_scores():
+    """Test normalize_scores function"""
+    assert normalize_scores([1.0, 3.0, 2.0]) == [0.0, 1.0, 0.5]
+    assert normalize_scores([0.3, 0.3]) == [1.0, 1.0]
+    assert normalize_scores([]) == []
+
+
+def test_federated_results():
+    """Test federated_results function, scores normalized within each group"""
+    def store(name: str, relevance) -> SimpleNamespace:
+        return SimpleNamespace(
+            collection_id=name,
+            collection_name=name,
+            _select_relevance_score_fn=lambda: relevance,
+        )
+
+    def result(collection_id: str, distance: float) -> SimpleNamespace:
+        return SimpleNamespace(
+            EmbeddingStore=SimpleNamespace(
+                document=f'{collection_id} {distance}',
+                cmetadata={},
+                collection_id=collection_id,
+            ),
+            distance=distance,
+        )
+
+    first = [store('first', lambda dist: 1.0 - dist)]
+    second = [store('second', lambda dist: 1.0 - dist / 10)]
+    results = [
+        result('first', 0.0), result('first', 0.5), result('first', 0.25),
+        result('second', 4.0), result('second', 8.0),
+    ]
+    docs = federated_results(results, [first, second], k=4)
+    assert [(doc.page_content, score) for doc, score in docs] == [
+        ('first 0.0', 1.0), ('second 4.0', 1.0), ('first 0.25', 0.5),
+        ('first 0.5', 0.0),
+    ]
+    assert docs[1][0].metadata == {'collection': 'second'}
+
+    docs = federated_results(results[1:3], [first], k=1)
+    assert [(doc.page_content, score) for doc, score in docs] == [('first 0.25', 0.75)]
+
+
+def test_federated_search_with_score():
+    """Test federated_search_with_score function"""
+    first = create_collection('first', {})
+    second = create_collection('second', {'embeddings': FAKE_EMBEDDINGS})
+    third = create_collection('third', {})
+    add_document(document=Document(page_content='one'), collection_name='first')
+    add_document(document=Document(page_content='two'), collection_name='second')
+    add_document(document=Document(page_content='three'), collection_name='third')
+
+    result = federated_search_with_score('test', [first, second, third], k=3)
+    assert len(result) == 3
+    assert {doc.metadata['collection'] for doc, _ in result} == {
+        'first', 'second', 'third',
+    }
+    scores = [score for _, score in result]
+    assert scores == sorted(scores, reverse=True)
+
+    result = federated_search_with_score('test', [first, third], k=1)
+    assert len(result) == 1
+    assert result[0][0].metadata['collection'] in ['first', 'third']
+
+
+def test_federated_search_route_k():
+    """Test federated_search_with_score with collections routing"""
+    first = create_collection('first', {})
+    second = create_collection('second', {})
+    third = create_collection('third', {})
+    add_document(document=Document(page_content='one'), collection_name='first')
+    add_document(document=Document(page_content='two'), collection_name='second')
+
+    result = federated_search_with_score(
+        'test', [first, second, third], k=3, route_k=1
+    )
+    assert len(result) == 1
+    assert result[0][0].metadata['collection'] in ['first', 'second']
+
+
+def test_federated_search_vector_index():
+    """Test federated search with a collection vector index"""
+    first = create_collection('first', {})
+    second = create_collection('second', {})
+    add_document(document=Document(page_content='one'), collection_name='first')
+    add_document(
+        document=Document(page_content='two', metadata={'type': 'a'}),
+        collection_name='second',
+    )
+    create_vector_index('second', {'type': 'hnsw', 'ef_search': 60})
+    second = single_collection_by_name('second')
+
+    result = federated_search_with_score(
+        'test', [first, second], k=2, filter={'type': 'a'}
+    )
+    assert [doc.page_content for doc, _ in result] == ['two']
+
+    stores = collection_stores([first, second])
+    statements = federated_settings_statements(stores, k=2, ef_search=80)
+    assert [str(item) for item in statements] == ['SET LOCAL hnsw.ef_search = 80']
+
+
+def test_federated_retriever():
+    """Test FederatedRetriever class"""
+    first = create_collection('first', {})
+    second = create_collection('second', {})
+    add_document(document=Document(page_content='one'), collection_name='first')
+    add_document(document=Document(page_content='two'), collection_name='second')
+    retriever = FederatedRetriever(
+        collections=[first, second],
+        search_kwargs={'k': 2},
+    )
+    docs = retriever._get_relevant_documents(
+        'test', run_manager=CallbackManagerForRetrieverRun.get_noop_manager()
+    )
+    assert len(docs) == 2
+    assert all('score' in doc.metadata for doc in docs)
+
+    retriever.score_threshold = 2.0
+    docs = retriever._get_relevant_documents(
+        'test', run_manager=CallbackManagerForRetrieverRun.get_noop_manager()
+    )
+    assert docs == []
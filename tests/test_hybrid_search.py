@@ -0,0 +1,85 @@
+"""hybrid_search module tests"""
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from langchain.docstore.document import Document
+from brevia.collections import create_collection, update_collection
+from brevia.connection import db_connection
+from brevia import hybrid_search
+from brevia.hybrid_search import (
+    hybrid_search_conf,
+    refresh_documents_tsv,
+    text_search_config,
+)
+from brevia.index import add_document
+
+
+def documents_tsv(collection_id: str) -> list[str]:
+    """Read text search vectors of a collection documents"""
+    query = text(
+        'SELECT document_tsv::text FROM langchain_pg_embedding '
+        'WHERE collection_id = :collection_id'
+    )
+    with Session(db_connection()) as session:
+        return list(session.execute(query, {'collection_id': collection_id}).scalars())
+
+
+def test_hybrid_search_conf():
+    """Test hybrid_search_conf function"""
+    conf = hybrid_search_conf(None)
+    assert conf.language == 'simple'
+    assert conf.rrf_k == 60
+    conf = hybrid_search_conf({'hybrid_search': {'language': 'english'}})
+    assert conf.language == 'english'
+    with pytest.raises(ValidationError):
+        hybrid_search_conf({'hybrid_search': {'language': "english'"}})
+
+
+def test_text_search_config():
+    """Test text_search_config function"""
+    assert text_search_config(None) is None
+    assert text_search_config({'foo': 'bar'}) is None
+    assert text_search_config({'hybrid_search': {}}) == 'simple'
+    conf = {'hybrid_search': {'language': 'english'}}
+    assert text_search_config(conf) == 'english'
+
+
+def test_documents_tsv_disabled():
+    """Test documents text search vectors of collections without hybrid search"""
+    collection = create_collection('test', {})
+    doc = Document(page_content='Running products')
+    add_document(document=doc, collection_name='test')
+    assert documents_tsv(str(collection.uuid)) == [None]
+
+
+def test_refresh_documents_tsv(monkeypatch):
+    """Test refresh_documents_tsv function"""
+    collection = create_collection('test', {})
+    docs = [Document(page_content=f'Running product {i}') for i in range(3)]
+    for doc in docs:
+        add_document(document=doc, collection_name='test')
+    monkeypatch.setattr(hybrid_search, 'TSV_BATCH_SIZE', 2)
+    cmetadata = {'hybrid_search': {'language': 'english'}}
+    assert refresh_documents_tsv(str(collection.uuid), cmetadata) == 3
+    tsv = documents_tsv(str(collection.uuid))
+    assert sorted(tsv) == [f"'{i}':3 'product':2 'run':1" for i in range(3)]
+
+    assert refresh_documents_tsv(str(collection.uuid), {}) == 3
+    assert documents_tsv(str(collection.uuid)) == [None, None, None]
+
+
+def test_documents_tsv_language():
+    """Test documents text search vectors follow collection language"""
+    collection = create_collection('test', {'hybrid_search': {}})
+    doc = Document(page_content='Running products')
+    add_document(document=doc, collection_name='test')
+    assert documents_tsv(str(collection.uuid)) == ["'products':2 'running':1"]
+
+    cmetadata = {'hybrid_search': {'language': 'english'}}
+    update_collection(uuid=collection.uuid, name='test', cmetadata=cmetadata)
+    # vectors are not rebuilt on collection update
+    assert documents_tsv(str(collection.uuid)) == ["'products':2 'running':1"]
+
+    refresh_documents_tsv(str(collection.uuid), cmetadata)
+    assert documents_tsv(str(collection.uuid)) == ["'product':2 'run':1"]
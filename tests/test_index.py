@@ -1,19 +1,25 @@
 """Index module tests"""
+import asyncio
 from pathlib import Path
 from unittest.mock import patch
-from h11 import Response
 from langchain_text_splitters import NLTKTextSplitter
 from langchain_text_splitters.character import RecursiveCharacterTextSplitter
+import httpx
+import nltk
 import pytest
-from requests import HTTPError
 from langchain.docstore.document import Document
 from brevia.index import (
     load_pdf_file, split_document, update_links_documents,
     add_document, document_has_changed, select_load_link_options,
-    documents_metadata, create_splitter,
+    documents_metadata, create_splitter, add_documents_batch, read_document,
+    copy_value, update_document, chunks_diff, documents_metadata_page,
+    add_document_stream, update_document_stream, batched, split_text_stream,
+    init_splitting_data,
+    refresh_link,
 )
 from brevia.collections import create_collection
 from brevia.settings import get_settings
+from brevia.text_splitters import ContentDefinedTextSplitter, RegexTextSplitter
 
 
 def test_load_pdf_file():
@@ -24,6 +30,85 @@ def test_load_pdf_file():
     assert result == 1
 
 
+def test_add_document_stream():
+    """Test add_document_stream method"""
+    collection = create_collection('test', {})
+    texts = ['First page text.', 'Second page text.']
+    result = add_document_stream(
+        texts=iter(texts), collection_name='test', document_id='1'
+    )
+    assert result == 1
+    result = add_document_stream(
+        texts=iter(texts), collection_name='test', document_id='1', replace=True
+    )
+    assert result == 1
+    docs = documents_metadata(collection_id=collection.uuid, document_id='1')
+    assert len(docs) == 1
+
+
+def test_update_document_stream():
+    """Test update_document_stream method, unchanged chunks are kept"""
+    collection = create_collection('test', {})
+    texts = ['First page text.', 'Second page text.']
+    result = update_document_stream(
+        texts=iter(texts), collection_name='test', document_id='1'
+    )
+    assert result == 1
+    with patch('brevia.index.embed_texts', return_value=[]) as mock_embed:
+        result = update_document_stream(
+            texts=iter(texts), collection_name='test', document_id='1'
+        )
+    assert result == 1
+    mock_embed.assert_not_called()
+    docs = read_document(collection_id=collection.uuid, document_id='1')
+    assert len(docs) == 1
+
+    result = update_document_stream(
+        texts=iter(['Changed page text.']), collection_name='test', document_id='1'
+    )
+    assert result == 1
+    docs = read_document(collection_id=collection.uuid, document_id='1')
+    assert [doc['document'] for doc in docs] == ['Changed page text.']
+
+
+def test_batched():
+    """Test batched function"""
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
+
+
+def test_split_text_stream():
+    """Test split_text_stream function"""
+    meta = {'text_splitter': {
+        'splitter': 'langchain_text_splitters.RecursiveCharacterTextSplitter',
+        'chunk_size': 20,
+        'chunk_overlap': 0,
+    }}
+    texts = [f'Some words on page {i}.' for i in range(1, 60)]
+    result = list(split_text_stream(iter(texts), {'type': 'files'}, meta))
+    assert len(result) > 1
+    assert [doc.metadata['part'] for doc in result] == list(
+        range(1, len(result) + 1)
+    )
+    assert result[0].metadata['type'] == 'files'
+    assert all(len(doc.page_content) <= 20 for doc in result)
+    assert 'page 59.' in result[-1].page_content
+
+
+def test_split_text_stream_oversized():
+    """Test split_text_stream flushes chunks the splitter cannot cut"""
+    meta = {'text_splitter': {
+        'splitter': 'langchain_text_splitters.CharacterTextSplitter',
+        'separator': '|',
+        'chunk_size': 10,
+        'chunk_overlap': 0,
+    }}
+    texts = ['x' * 150 for _ in range(4)]
+    with patch('brevia.index.STREAM_SPLIT_CHUNKS', 2):
+        result = list(split_text_stream(iter(texts), {}, meta))
+    assert [len(doc.page_content) for doc in result] == [150, 150, 150, 150]
+
+
 def test_load_pdf_file_fail():
     """Test load_pdf_file failure"""
     file_path = f'{Path(__file__).parent}/files/notfound.pdf'
@@ -63,12 +148,14 @@ def test_document_has_changed():
     assert result is True
 
 
-def _raise_http_err():
-    raise HTTPError('404 Client Error', response=Response(headers=[], status_code=404))
+def mock_links_client(handler):
+    """Mock links HTTP client factory, using `handler` to create responses"""
+    return lambda concurrency: httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
 
 
-@patch('brevia.index.load_file.requests.get')
-def test_update_links_documents_http_error(mock_get):
+def test_update_links_documents_http_error():
     """Test update_links_documents method with HTTP error"""
     collection = create_collection('test', {})
     doc1 = Document(
@@ -76,28 +163,86 @@ def test_update_links_documents_http_error(mock_get):
     )
     add_document(document=doc1, collection_name='test', document_id='1')
 
-    mock_get.return_value.status_code = 404
-    mock_get.return_value.text = '404 Client Error'
-    mock_get.return_value.raise_for_status = _raise_http_err
-
-    result = update_links_documents('test')
+    client = mock_links_client(lambda req: httpx.Response(404, text='Not Found'))
+    with patch('brevia.index.links_http_client', client):
+        result = update_links_documents('test')
     assert result == 0
     meta = documents_metadata(collection_id=collection.uuid, document_id='1')
     assert meta[0]['cmetadata']['http_error'] == '404'
 
-    mock_get.return_value.status_code = 200
-    mock_get.return_value.text = 'changed'
-
-    def donothing():
-        pass
-    mock_get.return_value.raise_for_status = donothing
-
-    result = update_links_documents('test')
+    client = mock_links_client(lambda req: httpx.Response(200, text='changed'))
+    with patch('brevia.index.links_http_client', client):
+        result = update_links_documents('test')
     assert result == 1
     meta = documents_metadata(collection_id=collection.uuid, document_id='1')
     assert meta[0]['cmetadata'].get('http_error') is None
 
 
+def test_update_links_documents_conditional():
+    """Test update_links_documents method with conditional requests"""
+    collection = create_collection('test', {})
+    for num in range(3):
+        doc = Document(
+            page_content='some',
+            metadata={'type': 'links', 'url': f'http://example.com/{num}'},
+        )
+        add_document(document=doc, collection_name='test', document_id=str(num))
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        headers = {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2026 07:28:00 GMT'}
+        return httpx.Response(200, text='new content', headers=headers)
+
+    progress = []
+    with patch('brevia.index.links_http_client', mock_links_client(handler)):
+        result = update_links_documents(
+            'test',
+            concurrency=2,
+            progress=lambda done, total: progress.append((done, total)),
+        )
+    assert result == 3
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    meta = documents_metadata(collection_id=collection.uuid, document_id='1')
+    assert meta[0]['cmetadata']['etag'] == '"v1"'
+    assert meta[0]['cmetadata']['last_modified'] == 'Wed, 21 Oct 2026 07:28:00 GMT'
+
+    with patch('brevia.index.links_http_client', mock_links_client(handler)):
+        result = update_links_documents('test')
+    assert result == 0
+    assert len(requests) == 6
+    assert requests[-1].headers['If-Modified-Since'] == (
+        'Wed, 21 Oct 2026 07:28:00 GMT'
+    )
+
+
+def test_refresh_link_semaphores():
+    """Test refresh_link waits on host semaphore without holding a global slot"""
+    async def run():
+        global_semaphore = asyncio.Semaphore(1)
+        host_semaphore = asyncio.Semaphore(1)
+        await host_semaphore.acquire()
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda req: httpx.Response(304))
+        )
+        task = asyncio.create_task(refresh_link(
+            client=client,
+            collection=None,
+            document_id='1',
+            metadata={'url': 'http://example.com'},
+            semaphores=[global_semaphore, host_semaphore],
+        ))
+        await asyncio.sleep(0)
+        assert not global_semaphore.locked()
+        host_semaphore.release()
+        assert await task is False
+
+    asyncio.run(run())
+
+
 def test_select_load_link_options():
     """Test select_load_link_options method"""
     options = [
@@ -138,6 +283,124 @@ def test_add_document_custom_split():
     settings.text_splitter = current_splitter
 
 
+def test_add_documents_batch():
+    """Test add_documents_batch method"""
+    collection = create_collection('test', {})
+    add_document(document=Document(page_content='old'), collection_name='test',
+                 document_id='1')
+    settings = get_settings()
+    settings.index_batch_size = 1
+    result = add_documents_batch(
+        documents={
+            '1': Document(page_content='new content', metadata={'a': 'b'}),
+            '2': Document(page_content='other content'),
+        },
+        collection=collection,
+    )
+    settings.index_batch_size = 500
+    assert result == {'1': 1, '2': 1}
+
+    docs = read_document(collection_id=collection.uuid, document_id='1')
+    assert docs == [{'document': 'new content', 'cmetadata': {'a': 'b', 'part': 1}}]
+    docs = read_document(collection_id=collection.uuid, document_id='2')
+    assert len(docs) == 1
+
+
+def test_add_documents_batch_failure():
+    """Test add_documents_batch with embeddings or database errors"""
+    collection = create_collection('test', {})
+    error = RuntimeError('Embeddings provider error')
+    with patch('brevia.index.sync_documents_chunks', side_effect=error):
+        result = add_documents_batch(
+            documents={
+                '1': Document(page_content='some content'),
+                '2': Document(page_content='other content'),
+            },
+            collection=collection,
+        )
+    assert result == {
+        '1': 'Embeddings provider error',
+        '2': 'Embeddings provider error',
+    }
+
+
+def test_add_document_copy():
+    """Test add_document rows written with COPY"""
+    collection = create_collection('test', {})
+    content = 'Some\ttext with \\ backslash'
+    doc = Document(page_content=content, metadata={'title': 'Tab\tnew\nline'})
+    num = add_document(document=doc, collection_name='test', document_id='1')
+    assert num == 1
+    docs = read_document(collection_id=collection.uuid, document_id='1')
+    assert docs == [{
+        'document': content,
+        'cmetadata': {'title': 'Tab\tnew\nline', 'part': 1},
+    }]
+
+
+def test_update_document():
+    """Test update_document method, only changed chunks are replaced"""
+    collection = create_collection('test', {})
+    settings = get_settings()
+    current_splitter = settings.text_splitter
+    settings.text_splitter = {
+        'splitter': 'langchain_text_splitters.character.CharacterTextSplitter',
+        'separator': '\n',
+        'chunk_size': 5,
+        'chunk_overlap': 0,
+    }
+    doc = Document(page_content='aaaa\nbbbb\ncccc', metadata={'a': 1})
+    assert update_document(doc, collection_name='test', document_id='1') == 3
+    before = {
+        item['document']: item
+        for item in read_document(collection_id=collection.uuid, document_id='1')
+    }
+
+    doc = Document(page_content='zzzz\naaaa\ncccc', metadata={'a': 1})
+    assert update_document(doc, collection_name='test', document_id='1') == 3
+    settings.text_splitter = current_splitter
+
+    after = read_document(collection_id=collection.uuid, document_id='1')
+    after.sort(key=lambda x: x['cmetadata']['part'])
+    assert [item['document'] for item in after] == ['zzzz', 'aaaa', 'cccc']
+    assert after[1]['cmetadata'] == {'a': 1, 'part': 2}
+    assert before['cccc']['cmetadata'] == {'a': 1, 'part': 3}
+
+
+def test_chunks_diff():
+    """Test chunks_diff method"""
+    stored = [
+        {'uuid': 'u1', 'document': 'one', 'cmetadata': {'part': 1}},
+        {'uuid': 'u2', 'document': 'two', 'cmetadata': {'part': 2}},
+        {'uuid': 'u3', 'document': 'three', 'cmetadata': {'part': 3}},
+    ]
+    texts = [
+        Document(page_content='two', metadata={'part': 1}),
+        Document(page_content='three', metadata={'part': 2}),
+        Document(page_content='four', metadata={'part': 3}),
+    ]
+    to_add, to_update, to_remove = chunks_diff(stored, texts)
+    assert [text.page_content for text in to_add] == ['four']
+    assert to_update == [
+        {'uuid': 'u2', 'cmetadata': {'part': 1}},
+        {'uuid': 'u3', 'cmetadata': {'part': 2}},
+    ]
+    assert to_remove == ['u1']
+
+    to_add, to_update, to_remove = chunks_diff(stored, [])
+    assert to_add == [] and to_update == []
+    assert to_remove == ['u1', 'u2', 'u3']
+
+
+def test_copy_value():
+    """Test copy_value method"""
+    assert copy_value(None) == '\\N'
+    assert copy_value('a\tb\nc\\d\re') == 'a\\tb\\nc\\\\d\\re'
+    assert copy_value([1, 0.5]) == '[1.0,0.5]'
+    assert copy_value({'a': 'b\n'}) == '{"a": "b\\\\n"}'
+    assert copy_value(123) == '123'
+
+
 def test_create_splitter_chunk_params():
     """Test create_splitter method"""
     splitter = create_splitter({'chunk_size': 2222, 'chunk_overlap': 333})
@@ -166,3 +429,75 @@ def test_create_splitter_chunk_params():
     assert isinstance(splitter, RecursiveCharacterTextSplitter)
     assert splitter._chunk_size == 1111
     assert splitter._chunk_overlap == 555
+
+
+def test_create_splitter_cache():
+    """Test create_splitter reuses splitter instances"""
+    meta = {'chunk_size': 2222, 'chunk_overlap': 333}
+    splitter = create_splitter(meta)
+    assert create_splitter(dict(meta)) is splitter
+    assert create_splitter({'chunk_size': 2222}) is not splitter
+
+    custom = {
+        'text_splitter': {
+            'splitter': 'langchain_text_splitters.character.CharacterTextSplitter',
+            'separator': ' ',
+        },
+    }
+    splitter = create_splitter(custom)
+    assert create_splitter(custom) is splitter
+    assert custom['text_splitter']['splitter'].endswith('CharacterTextSplitter')
+
+
+def test_create_splitter_alias():
+    """Test create_splitter with a built-in splitter alias"""
+    splitter = create_splitter({
+        'chunk_size': 1234,
+        'text_splitter': {'splitter': 'regex'},
+    })
+    assert isinstance(splitter, RegexTextSplitter)
+    assert splitter._chunk_size == 1234
+
+    splitter = create_splitter({
+        'text_splitter': {'splitter': 'cdc', 'avg_size': 500},
+    })
+    assert isinstance(splitter, ContentDefinedTextSplitter)
+    assert splitter._avg_size == 500
+
+
+def test_init_splitting_data_path():
+    """Test init_splitting_data with local NLTK data path"""
+    settings = get_settings()
+    current_path = settings.nltk_data_path
+    settings.nltk_data_path = '/tmp/nltk_data'
+    init_splitting_data.cache_clear()
+    with patch('nltk.data.find') as mock_find, patch('nltk.download') as mock_dl:
+        assert init_splitting_data() is True
+        mock_find.assert_called_once_with('tokenizers/punkt_tab')
+        mock_dl.assert_not_called()
+
+    assert nltk.data.path[0] == '/tmp/nltk_data'
+    nltk.data.path.remove('/tmp/nltk_data')
+    settings.nltk_data_path = current_path
+    init_splitting_data.cache_clear()
+
+
+def test_documents_metadata():
+    """Test documents_metadata and documents_metadata_page functions"""
+    collection = create_collection('test', {})
+    text = 'First sentence of a long document. ' * 100
+    for doc_id in ['2', '1']:
+        doc = Document(page_content=text, metadata={'type': 'files'})
+        add_document(document=doc, collection_name='test', document_id=doc_id)
+
+    meta = documents_metadata(collection_id=collection.uuid)
+    assert [item['custom_id'] for item in meta] == ['1', '2']
+
+    result = documents_metadata_page(
+        collection_id=collection.uuid,
+        filter={'type': 'files'},
+        page=1,
+        page_size=1,
+    )
+    assert [item['custom_id'] for item in result['data']] == ['1']
+    assert result['meta']['pagination']['count'] == 2
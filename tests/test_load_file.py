@@ -1,7 +1,14 @@
 """load_file module tests"""
+import time
 from pathlib import Path
+from unittest.mock import patch
 import pytest
-from brevia.load_file import read, load_documents
+import pypdf
+from langchain_core.documents import Document
+from brevia.load_file import (
+    read, load_documents, iter_pdf_pages, iter_texts, load_documents_pdf,
+    ocr_pdf_documents,
+)
 
 
 def test_read():
@@ -22,6 +29,72 @@ def test_read_pages():
     assert content == 'This is an empty PDF sample file.'
 
 
+def test_iter_pdf_pages():
+    """Test iter_pdf_pages function"""
+    file_path = f'{Path(__file__).parent}/files/docs/empty.pdf'
+    pages = iter_pdf_pages(file_path)
+    assert list(pages) == ['This is an empty PDF sample file.']
+    assert list(iter_pdf_pages(file_path, page_from=2)) == []
+
+
+def test_iter_pdf_pages_parallel(tmp_path):
+    """Test iter_pdf_pages function with parallel extraction"""
+    source = pypdf.PdfReader(f'{Path(__file__).parent}/files/docs/empty.pdf')
+    writer = pypdf.PdfWriter()
+    for _ in range(20):
+        writer.add_page(source.pages[0])
+    file_path = f'{tmp_path}/sample.pdf'
+    writer.write(file_path)
+
+    serial = list(iter_pdf_pages(file_path, workers=1))
+    assert len(serial) == 20
+    assert list(iter_pdf_pages(file_path, workers=2)) == serial
+    pages = list(iter_pdf_pages(file_path, page_from=3, page_to=12, workers=2))
+    assert pages == serial[2:12]
+
+    docs = load_documents_pdf(file_path, workers=2)
+    assert [doc.metadata['page'] for doc in docs] == list(range(20))
+
+
+def test_load_documents_pdf_ocr():
+    """Test load_documents_pdf with OCR option, not needed on text pages"""
+    file_path = f'{Path(__file__).parent}/files/docs/empty.pdf'
+    docs = load_documents_pdf(file_path, ocr=True, min_text_len=10)
+    assert len(docs) == 1
+    assert docs[0].page_content == 'This is an empty PDF sample file.'
+    assert 'ocr' not in docs[0].metadata
+
+
+def slow_ocr_pdf_page(file_path: str, page: int, ocr_languages=None) -> str:
+    """Fake OCR of a PDF page, stuck on second page"""
+    if page == 1:
+        time.sleep(60)
+    return f'Page {page}'
+
+
+@patch('brevia.load_file.ocr_pdf_page', slow_ocr_pdf_page)
+def test_ocr_pdf_documents_timeout():
+    """Test ocr_pdf_documents with a stuck OCR page"""
+    docs = [Document(page_content='', metadata={'page': num}) for num in range(4)]
+    start = time.monotonic()
+    result = list(ocr_pdf_documents('test.pdf', docs, workers=2, timeout=2))
+    assert time.monotonic() - start < 30
+    assert [doc.page_content for doc in result] == ['Page 0', '', 'Page 2', 'Page 3']
+    assert 'ocr' not in result[1].metadata
+    assert result[3].metadata == {'page': 3, 'ocr': True}
+
+
+def test_iter_texts():
+    """Test iter_texts function"""
+    file_path = f'{Path(__file__).parent}/files/docs/test.txt'
+    assert list(iter_texts(file_path)) == ['some text']
+
+    file_path = f'{Path(__file__).parent}/files/not.found'
+    with pytest.raises(FileNotFoundError) as exc:
+        iter_texts(file_path)
+    assert str(exc.value) == file_path
+
+
 def test_read_failure():
     """Test read function fail"""
     file_path = f'{Path(__file__).parent}/files/silence.mp3'
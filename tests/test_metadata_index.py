@@ -0,0 +1,73 @@
+"""metadata_index module tests"""
+import pytest
+from langchain.docstore.document import Document
+from brevia.collections import create_collection, delete_collection, single_collection
+from brevia.index import add_document, collection_documents
+from brevia.metadata_index import (
+    create_index_statement,
+    create_metadata_indexes,
+    filterable_metadata,
+    metadata_index_name,
+    metadata_indexes,
+)
+from brevia.vector_store import vector_store
+
+
+def test_create_metadata_indexes():
+    """Test create_metadata_indexes function"""
+    collection = create_collection('test', {'filterable_metadata': ['type']})
+    add_document(
+        document=Document(page_content='some', metadata={'type': 'links'}),
+        collection_name='test',
+    )
+    assert create_metadata_indexes('test') == ['type']
+    names = metadata_indexes(collection.uuid)
+    assert names == [metadata_index_name(collection.uuid, 'type')]
+
+    result = collection_documents(collection.uuid, filter={'type': 'links'})
+    assert len(result['data']) == 1
+
+    keys = create_metadata_indexes('test', ['url', 'source'])
+    assert keys == ['url', 'source']
+    assert len(metadata_indexes(collection.uuid)) == 2
+    updated = single_collection(collection.uuid)
+    assert updated.cmetadata['filterable_metadata'] == ['url', 'source']
+
+    delete_collection(collection.uuid)
+    assert metadata_indexes(collection.uuid) == []
+
+
+def test_create_metadata_indexes_fail():
+    """Test create_metadata_indexes failure"""
+    with pytest.raises(ValueError) as exc:
+        create_metadata_indexes('test')
+    assert str(exc.value) == 'Collection not found: test'
+
+
+def test_create_index_statement():
+    """Test create_index_statement function"""
+    statement = create_index_statement('abc', "it's")
+    assert "((cmetadata ->> 'it''s'))" in statement
+    assert "WHERE collection_id = 'abc'" in statement
+
+
+def test_filterable_metadata():
+    """Test filterable_metadata function"""
+    assert filterable_metadata(None) == []
+    assert filterable_metadata({'filterable_metadata': ['a']}) == ['a']
+
+
+def test_search_metadata_filter():
+    """Test vector search with equality metadata filters"""
+    create_collection('test', {})
+    store = vector_store('test')
+    store.add_documents([
+        Document(page_content='one', metadata={'type': 'links', 'num': 1}),
+        Document(page_content='two', metadata={'type': 'files', 'num': 2}),
+    ])
+    result = store.similarity_search('test', k=2, filter={'type': 'links'})
+    assert [doc.page_content for doc in result] == ['one']
+    result = store.similarity_search('test', k=2, filter={'num': {'$eq': 2}})
+    assert [doc.page_content for doc in result] == ['two']
+    result = store.similarity_search('test', k=2, filter={'num': {'$gt': 0}})
+    assert len(result) == 2
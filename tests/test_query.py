@@ -15,8 +15,11 @@ from brevia.query import (
     SearchQuery,
 )
 from brevia.collections import create_collection
+from brevia.federated_search import FederatedRetriever
 from brevia.index import add_document
+from brevia.rerank import RerankRetriever
 from brevia.settings import get_settings
+from brevia.vector_index import create_vector_index
 
 
 def test_search_vector_qa():
@@ -26,6 +29,97 @@ def test_search_vector_qa():
     assert str(exc.value) == 'Collection not found: test'
 
 
+def test_search_query_collections():
+    """Test SearchQuery collection names"""
+    search = SearchQuery(query='test', collection='a', collections=['b', 'a'])
+    assert search.collection_names() == ['a', 'b']
+    search = SearchQuery(query='test', collections=['b'])
+    assert search.collection_names() == ['b']
+    with pytest.raises(ValueError):
+        SearchQuery(query='test')
+
+
+def test_search_vector_qa_collections():
+    """Test search_vector_qa function with multiple collections"""
+    create_collection('first', {})
+    create_collection('second', {'embeddings': {'_type': 'fake-embeddings'}})
+    add_document(document=Document(page_content='one'), collection_name='first')
+    add_document(document=Document(page_content='two'), collection_name='second')
+
+    result = search_vector_qa(search=SearchQuery(
+        query='test',
+        collections=['first', 'second'],
+        docs_num=2,
+    ))
+    assert sorted(doc.page_content for doc, _ in result) == ['one', 'two']
+
+    with pytest.raises(ValueError) as exc:
+        search_vector_qa(search=SearchQuery(query='test', collections=['a', 'b']))
+    assert str(exc.value) == 'Collection not found: a, b'
+
+    with pytest.raises(ValueError) as exc:
+        search_vector_qa(search=SearchQuery(
+            query='test',
+            collections=['first', 'second'],
+            search_type='hybrid',
+        ))
+    assert str(exc.value) == 'Hybrid search is not supported with multiple collections'
+
+
+def test_search_vector_hybrid():
+    """Test search_vector_qa with hybrid search type"""
+    create_collection('test', {'hybrid_search': {'language': 'english'}})
+    for text in ['first product', 'product code ABC-1234', 'third product']:
+        add_document(document=Document(page_content=text), collection_name='test')
+
+    result = search_vector_qa(search=SearchQuery(
+        query='ABC-1234',
+        collection='test',
+        docs_num=3,
+        search_type='hybrid',
+    ))
+    assert len(result) == 3
+    assert result[0][0].page_content == 'product code ABC-1234'
+    assert result[0][1] > result[1][1]
+
+
+def test_search_vector_prefix():
+    """Test search_vector_qa with prefix search type"""
+    create_collection('test', {})
+    for text in ['first', 'second', 'third']:
+        add_document(document=Document(page_content=text), collection_name='test')
+    search = SearchQuery(query='test', collection='test', docs_num=2)
+    expected = search_vector_qa(search=search)
+
+    create_vector_index('test', {'dimension': 256}, prefix=True)
+    result = search_vector_qa(search=SearchQuery(
+        query='test',
+        collection='test',
+        docs_num=2,
+        search_type='prefix',
+    ))
+    assert len(result) == 2
+    assert [doc.page_content for doc, _ in result] == [
+        doc.page_content for doc, _ in expected
+    ]
+
+
+def test_search_vector_rerank():
+    """Test search_vector_qa with re-ranking"""
+    create_collection('test', {'rerank': {'scorer': 'lexical'}})
+    for text in ['first product', 'product code ABC-1234', 'third product']:
+        add_document(document=Document(page_content=text), collection_name='test')
+
+    result = search_vector_qa(search=SearchQuery(
+        query='ABC-1234',
+        collection='test',
+        docs_num=1,
+    ))
+    assert len(result) == 1
+    assert result[0][0].page_content == 'product code ABC-1234'
+    assert result[0][0].metadata['rerank_score'] > 0
+
+
 def test_search_vector_filter():
     """Test search_vector_qa with metadata filter"""
     create_collection('test', {})
@@ -169,6 +263,30 @@ def test_conversation_retriever():
     assert isinstance(retriever, MultiQueryRetriever)
 
 
+def test_conversation_federated_retriever():
+    """Test create_conversation_retriever function with multiple collections"""
+    first = create_collection('first', {})
+    second = create_collection('second', {})
+    retriever = create_conversation_retriever(
+        collection=first,
+        chat_params=ChatParams(docs_num=3),
+        llm=load_chatmodel({}),
+        collections=[first, second],
+    )
+    assert isinstance(retriever, FederatedRetriever)
+    assert retriever.search_kwargs['k'] == 3
+
+    with pytest.raises(ValueError) as exc:
+        create_conversation_retriever(
+            collection=first,
+            chat_params=ChatParams(search_type='mmr'),
+            llm=load_chatmodel({}),
+            collections=[first, second],
+        )
+    message = 'Search type mmr is not supported with multiple collections'
+    assert str(exc.value) == message
+
+
 def test_conversation_custom_retriever():
     """Test create_conversation_retriever with custom retriever"""
     collection = create_collection('test', {})
@@ -195,3 +313,32 @@ def test_conversation_custom_retriever():
 
     assert retriever is not None
     assert isinstance(retriever, VectorStoreRetriever)
+
+
+def test_conversation_rerank_retriever():
+    """Test create_conversation_retriever with re-ranking"""
+    collection = create_collection('test', {'rerank': {'scorer': 'fake', 'fetch_k': 8}})
+    retriever = create_conversation_retriever(
+        collection=collection,
+        chat_params=ChatParams(docs_num=2),
+        llm=load_chatmodel({}),
+    )
+
+    assert isinstance(retriever, RerankRetriever)
+    assert retriever.k == 2
+    assert retriever.retriever.search_kwargs['k'] == 8
+
+    conf = {
+        'retriever': 'langchain_core.vectorstores.VectorStoreRetriever',
+        'rerank': {'scorer': 'lexical'},
+    }
+    collection = create_collection('test2', {'qa_retriever': conf})
+    retriever = create_conversation_retriever(
+        collection=collection,
+        chat_params=ChatParams(docs_num=2),
+        llm=load_chatmodel({}),
+    )
+
+    assert isinstance(retriever, RerankRetriever)
+    assert isinstance(retriever.retriever, VectorStoreRetriever)
+    assert retriever.retriever.search_kwargs['k'] == 8
@@ -0,0 +1,119 @@
+"""rerank module tests"""
+import pytest
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from brevia.rerank import (
+    CrossEncoderScorer,
+    FakeScorer,
+    LexicalScorer,
+    RerankConf,
+    RerankRetriever,
+    load_scorer,
+    rerank_conf,
+    rerank_docs_and_scores,
+    rerank_documents,
+)
+from brevia.settings import get_settings
+
+TEXTS = ['first product', 'product code ABC-1234', 'third product']
+
+
+class FakeRetriever(BaseRetriever):
+    """Fake retriever returning fixed documents"""
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return [Document(page_content=text) for text in TEXTS]
+
+
+def test_lexical_scorer():
+    """Test LexicalScorer class"""
+    docs = [Document(page_content=text) for text in TEXTS]
+    scores = LexicalScorer().score('ABC-1234 code', docs)
+    assert len(scores) == 3
+    assert scores[1] > scores[0]
+    assert scores[0] == scores[2] == 0.0
+    assert LexicalScorer().score('test', []) == []
+
+
+def test_fake_scorer():
+    """Test FakeScorer class"""
+    docs = [Document(page_content=text) for text in TEXTS]
+    assert FakeScorer().score('test', docs) == [0.0, 1.0, 2.0]
+    assert FakeScorer(scores=[3, 1, 2]).score('test', docs) == [3, 1, 2]
+
+
+def test_rerank_documents():
+    """Test rerank_documents function"""
+    docs = [Document(page_content=text) for text in TEXTS]
+    result = rerank_documents('ABC-1234', docs, LexicalScorer(), k=2)
+    assert len(result) == 2
+    assert result[0].page_content == 'product code ABC-1234'
+    assert result[0].metadata['rerank_score'] > 0
+
+
+def test_rerank_docs_and_scores():
+    """Test rerank_docs_and_scores function"""
+    docs_and_scores = [(Document(page_content=text), 0.1) for text in TEXTS]
+    result = rerank_docs_and_scores('test', docs_and_scores, FakeScorer(), k=1)
+    assert len(result) == 1
+    assert result[0][0].page_content == 'third product'
+    assert result[0][1] == 0.1
+
+
+def test_rerank_conf():
+    """Test rerank_conf function"""
+    assert rerank_conf({}) is None
+    conf = rerank_conf({'rerank': {'scorer': 'fake', 'fetch_k': 10}})
+    assert conf.scorer == 'fake'
+    assert conf.fetch_size(4) == 10
+    conf = rerank_conf(
+        {'rerank': {'scorer': 'fake'}},
+        {'retriever': 'some.Retriever', 'rerank': {'scorer': 'lexical'}},
+    )
+    assert conf.scorer == 'lexical'
+    assert conf.fetch_size(4) == 16
+
+    settings = get_settings()
+    current = settings.qa_rerank
+    settings.qa_rerank = {'scorer': 'lexical', 'k1': 1.2}
+    conf = rerank_conf(None)
+    settings.qa_rerank = current
+    assert conf.model_extra == {'k1': 1.2}
+
+
+def test_load_scorer():
+    """Test load_scorer function"""
+    assert isinstance(load_scorer(RerankConf()), LexicalScorer)
+    scorer = load_scorer(RerankConf(scorer='lexical', k1=1.2))
+    assert scorer.k1 == 1.2
+    scorer = load_scorer(RerankConf(scorer='brevia.rerank.CrossEncoderScorer'))
+    assert isinstance(scorer, CrossEncoderScorer)
+    # test models are in use
+    assert isinstance(load_scorer(RerankConf(scorer='cross-encoder')), FakeScorer)
+
+    with pytest.raises(ValueError) as exc:
+        load_scorer(RerankConf(scorer='brevia.rerank.RerankConf'))
+    assert str(exc.value) == 'Class "RerankConf" must extend "BaseScorer"'
+
+
+def test_rerank_retriever():
+    """Test RerankRetriever class"""
+    retriever = RerankRetriever(
+        retriever=FakeRetriever(),
+        scorer=LexicalScorer(),
+        k=1,
+    )
+    result = retriever.invoke('ABC-1234')
+    assert [doc.page_content for doc in result] == ['product code ABC-1234']
+
+
+@pytest.mark.asyncio
+async def test_rerank_retriever_async():
+    """Test RerankRetriever class async retrieval"""
+    retriever = RerankRetriever(
+        retriever=FakeRetriever(),
+        scorer=FakeScorer(),
+        k=2,
+    )
+    result = await retriever.ainvoke('test')
+    assert [doc.page_content for doc in result] == ['third product', TEXTS[1]]
@@ -0,0 +1,100 @@
+"""text_splitters module tests"""
+from langchain_core.documents import Document
+from brevia.text_splitters import (
+    ContentDefinedTextSplitter, RegexTextSplitter, sentence_spans,
+)
+
+TEXT = (
+    '  First sentence here. Then J. Smith said: "Hello!" Is it ok?  \n\n'
+    'New paragraph 1. item\nsame sentence.'
+)
+
+
+def test_sentence_spans():
+    """Test sentence_spans function"""
+    sentences = [TEXT[start:end] for start, end in sentence_spans(TEXT)]
+    assert sentences == [
+        'First sentence here.',
+        'Then J. Smith said: "Hello!"',
+        'Is it ok?',
+        'New paragraph 1. item\nsame sentence.',
+    ]
+    assert list(sentence_spans('')) == []
+    assert list(sentence_spans('  \n ')) == []
+    assert list(sentence_spans('no end')) == [(0, 6)]
+
+
+def test_regex_splitter():
+    """Test RegexTextSplitter split_text method"""
+    splitter = RegexTextSplitter(chunk_size=40, chunk_overlap=0)
+    chunks = splitter.split_text(TEXT)
+    assert chunks == [
+        'First sentence here.',
+        'Then J. Smith said: "Hello!" Is it ok?',
+        'New paragraph 1. item\nsame sentence.',
+    ]
+    assert splitter.split_text('') == []
+
+
+def test_regex_splitter_overlap():
+    """Test RegexTextSplitter chunk overlap"""
+    text = ' '.join(f'Sentence number {i}.' for i in range(10, 20))
+    splitter = RegexTextSplitter(chunk_size=60, chunk_overlap=20)
+    chunks = splitter.split_text(text)
+    assert all(len(chunk) <= 60 for chunk in chunks)
+    for prev, chunk in zip(chunks, chunks[1:]):
+        last = prev.rsplit('. ', 1)[-1]
+        assert chunk.startswith(last.rstrip('.'))
+
+
+def test_regex_splitter_long_sentence():
+    """Test RegexTextSplitter with a sentence longer than chunk size"""
+    splitter = RegexTextSplitter(chunk_size=10, chunk_overlap=0)
+    assert splitter.split_text('A very long sentence. Ok.') == [
+        'A very long sentence.', 'Ok.',
+    ]
+
+
+def test_regex_splitter_documents():
+    """Test RegexTextSplitter split_documents method"""
+    splitter = RegexTextSplitter(chunk_size=30, chunk_overlap=0)
+    docs = splitter.split_documents([
+        Document(page_content='One sentence. Two sentences.', metadata={'a': 1}),
+    ])
+    assert [doc.page_content for doc in docs] == ['One sentence. Two sentences.']
+    assert docs[0].metadata == {'a': 1}
+
+
+def test_content_defined_splitter():
+    """Test ContentDefinedTextSplitter split_text method"""
+    text = ' '.join(f'This is sentence number {i}.' for i in range(10, 210))
+    splitter = ContentDefinedTextSplitter(chunk_size=300, chunk_overlap=0)
+    chunks = splitter.split_text(text)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    assert ' '.join(chunks) == text
+    assert splitter.split_text('') == []
+
+
+def test_content_defined_splitter_edit():
+    """Test ContentDefinedTextSplitter boundaries stability after an edit"""
+    text = ' '.join(f'This is sentence number {i}.' for i in range(10, 210))
+    edited = text.replace('number 13.', 'number 13. A brand new sentence.')
+    splitter = ContentDefinedTextSplitter(chunk_size=300, chunk_overlap=60)
+    chunks = splitter.split_text(text)
+    new_chunks = splitter.split_text(edited)
+    changed = [chunk for chunk in new_chunks if chunk not in chunks]
+    assert 1 <= len(changed) <= 3
+    assert len(new_chunks) - len(changed) >= len(chunks) - 3
+    assert new_chunks[-1] == chunks[-1]
+
+
+def test_content_defined_splitter_overlap():
+    """Test ContentDefinedTextSplitter chunk overlap"""
+    text = ' '.join(f'This is sentence number {i}.' for i in range(10, 210))
+    splitter = ContentDefinedTextSplitter(chunk_size=300, chunk_overlap=60)
+    chunks = splitter.split_text(text)
+    assert all(len(chunk) <= 300 for chunk in chunks)
+    for prev, chunk in zip(chunks, chunks[1:]):
+        first = chunk.split('. ', 1)[0]
+        assert first in prev
@@ -0,0 +1,179 @@
+"""vector_index module tests"""
+import pytest
+from langchain.docstore.document import Document
+from brevia.collections import create_collection, single_collection
+from brevia.index import add_document
+from brevia.query import search_vector_qa, SearchQuery
+from brevia.vector_index import (
+    create_index_statement,
+    create_vector_index,
+    drop_vector_index,
+    rebuild_vector_index,
+    rerank_k,
+    search_settings,
+    vector_index_conf,
+    VectorIndexConf,
+)
+
+
+def test_create_vector_index():
+    """Test create_vector_index function"""
+    collection = create_collection('test', {})
+    add_document(document=Document(page_content='some'), collection_name='test')
+    conf = create_vector_index('test', {'type': 'hnsw', 'm': 8})
+    assert conf.dimension == 1536
+    assert conf.m == 8
+
+    updated = single_collection(collection.uuid)
+    assert updated.cmetadata['vector_index']['type'] == 'hnsw'
+    assert updated.cmetadata['vector_index']['dimension'] == 1536
+
+    result = search_vector_qa(SearchQuery(query='test', collection='test'))
+    assert len(result) == 1
+    result = search_vector_qa(SearchQuery(
+        query='test',
+        collection='test',
+        ef_search=100,
+    ))
+    assert len(result) == 1
+
+
+@pytest.mark.parametrize('storage', ['halfvec', 'bit'])
+def test_create_vector_index_storage(storage):
+    """Test create_vector_index with reduced precision storage"""
+    collection = create_collection('test', {})
+    add_document(document=Document(page_content='some'), collection_name='test')
+    add_document(document=Document(page_content='other'), collection_name='test')
+    conf = create_vector_index('test', {'storage': storage, 'rerank_k': 5})
+    assert conf.storage == storage
+
+    updated = single_collection(collection.uuid)
+    assert updated.cmetadata['vector_index']['storage'] == storage
+    result = search_vector_qa(SearchQuery(query='test', collection='test', docs_num=1))
+    assert len(result) == 1
+    result = search_vector_qa(SearchQuery(query='test', collection='test'))
+    assert len(result) == 2
+
+
+def test_create_prefix_index():
+    """Test create_vector_index and drop_vector_index with prefix index"""
+    collection = create_collection('test', {})
+    add_document(document=Document(page_content='some'), collection_name='test')
+    create_vector_index('test', {'dimension': 1536})
+    conf = create_vector_index('test', {'dimension': 128}, prefix=True)
+    assert conf.dimension == 128
+
+    updated = single_collection(collection.uuid)
+    assert updated.cmetadata['prefix_index']['dimension'] == 128
+    assert updated.cmetadata['vector_index']['dimension'] == 1536
+    result = search_vector_qa(SearchQuery(
+        query='test',
+        collection='test',
+        search_type='prefix',
+    ))
+    assert len(result) == 1
+
+    drop_vector_index('test', prefix=True)
+    updated = single_collection(collection.uuid)
+    assert 'prefix_index' not in updated.cmetadata
+    assert 'vector_index' in updated.cmetadata
+
+
+def test_create_prefix_index_fail():
+    """Test create_vector_index prefix index failures"""
+    create_collection('test', {})
+    add_document(document=Document(page_content='some'), collection_name='test')
+    with pytest.raises(ValueError) as exc:
+        create_vector_index('test', prefix=True)
+    assert str(exc.value) == 'Missing prefix dimension of "test" prefix index'
+    with pytest.raises(ValueError) as exc:
+        create_vector_index('test', {'dimension': 1536}, prefix=True)
+    assert 'must be less than embeddings dimension 1536' in str(exc.value)
+
+
+def test_create_vector_index_fail():
+    """Test create_vector_index failures"""
+    with pytest.raises(ValueError) as exc:
+        create_vector_index('test')
+    assert str(exc.value) == 'Collection not found: test'
+
+    create_collection('test', {})
+    with pytest.raises(ValueError) as exc:
+        create_vector_index('test')
+    assert 'Unable to detect embeddings dimension' in str(exc.value)
+
+
+def test_rebuild_vector_index():
+    """Test rebuild_vector_index function"""
+    collection = create_collection('test', {})
+    add_document(document=Document(page_content='some'), collection_name='test')
+    create_vector_index('test', {'type': 'ivfflat', 'lists': 1})
+    conf = rebuild_vector_index('test')
+    assert conf.type == 'ivfflat'
+
+    conf = rebuild_vector_index('test', {'type': 'hnsw'})
+    assert conf.type == 'hnsw'
+    updated = single_collection(collection.uuid)
+    assert updated.cmetadata['vector_index']['type'] == 'hnsw'
+
+
+def test_drop_vector_index():
+    """Test drop_vector_index function"""
+    collection = create_collection('test', {'docs_num': 2})
+    create_vector_index('test', {'dimension': 1536})
+    drop_vector_index('test')
+    updated = single_collection(collection.uuid)
+    assert updated.cmetadata == {'docs_num': 2}
+
+
+def test_search_settings():
+    """Test search_settings function"""
+    assert search_settings(None, ef_search=10) == {}
+    conf = VectorIndexConf(type='hnsw', ef_search=80)
+    assert search_settings(conf) == {'hnsw.ef_search': 80}
+    assert search_settings(conf, ef_search=120) == {'hnsw.ef_search': 120}
+    assert search_settings(conf, candidates=100) == {'hnsw.ef_search': 100}
+    conf = VectorIndexConf(type='hnsw')
+    assert search_settings(conf, candidates=20) == {}
+    assert search_settings(conf, candidates=2000) == {'hnsw.ef_search': 1000}
+    conf = VectorIndexConf(type='ivfflat')
+    assert search_settings(conf) == {}
+    assert search_settings(conf, probes=5) == {'ivfflat.probes': 5}
+    assert search_settings(conf, candidates=100) == {}
+
+
+def test_rerank_k():
+    """Test rerank_k function"""
+    assert rerank_k(None, 4) is None
+    assert rerank_k(VectorIndexConf(), 4) is None
+    assert rerank_k(VectorIndexConf(storage='halfvec'), 4) == 8
+    assert rerank_k(VectorIndexConf(storage='bit'), 4) == 40
+    assert rerank_k(VectorIndexConf(storage='bit', rerank_k=20), 4) == 20
+    assert rerank_k(VectorIndexConf(storage='bit', rerank_k=2), 4) == 4
+    assert rerank_k(VectorIndexConf(), 4, prefix=True) == 16
+    assert rerank_k(VectorIndexConf(storage='bit'), 4, prefix=True) == 40
+
+
+def test_create_index_statement():
+    """Test create_index_statement function"""
+    conf = VectorIndexConf(dimension=3072, storage='halfvec')
+    statement = create_index_statement('abc', conf)
+    assert '((embedding::halfvec(3072)) halfvec_cosine_ops)' in statement
+    conf = VectorIndexConf(dimension=3072, storage='bit', type='ivfflat')
+    statement = create_index_statement('abc', conf)
+    assert '((binary_quantize(embedding)::bit(3072)) bit_hamming_ops)' in statement
+    assert 'USING ivfflat' in statement
+    conf = VectorIndexConf(dimension=256)
+    statement = create_index_statement('abc', conf, prefix=True)
+    assert statement.startswith('CREATE INDEX CONCURRENTLY ix_embedding_pre_abc ')
+    expression = '((subvector(embedding, 1, 256)::vector(256)) vector_cosine_ops)'
+    assert expression in statement
+
+
+def test_vector_index_conf():
+    """Test vector_index_conf function"""
+    assert vector_index_conf(None) is None
+    assert vector_index_conf({'docs_num': 2}) is None
+    conf = vector_index_conf({'vector_index': {'type': 'ivfflat', 'lists': 10}})
+    assert conf.type == 'ivfflat'
+    assert conf.lists == 10
@@ -0,0 +1,51 @@
+"""vector_store module tests"""
+from langchain.docstore.document import Document
+from langchain_community.vectorstores.pgvector import DistanceStrategy
+from brevia.collections import create_collection, update_collection
+from brevia.vector_store import (
+    BreviaPGVector,
+    invalidate_vector_stores,
+    vector_store,
+)
+
+
+def test_vector_store():
+    """Test vector_store registry function"""
+    collection = create_collection('test', {})
+    store = vector_store('test', collection_id=collection.uuid)
+    assert isinstance(store, BreviaPGVector)
+    assert store.collection_id == collection.uuid
+    assert vector_store('test', collection_id=collection.uuid) is store
+    assert vector_store('test', {}) is store
+
+    other = vector_store('test', distance_strategy=DistanceStrategy.EUCLIDEAN)
+    assert other is not store
+
+    changed = vector_store('test', {'docs_num': 2})
+    assert changed is not store
+    assert vector_store('test', {'docs_num': 2}) is changed
+
+
+def test_vector_store_invalidation():
+    """Test vector stores invalidation on collection update"""
+    collection = create_collection('test', {})
+    store = vector_store('test', collection_id=collection.uuid)
+    update_collection(collection.uuid, 'test', {'docs_num': 3})
+    assert vector_store('test', collection_id=collection.uuid) is not store
+
+    store = vector_store('test', collection_id=collection.uuid)
+    invalidate_vector_stores()
+    assert vector_store('test', collection_id=collection.uuid) is not store
+
+
+def test_vector_store_search():
+    """Test vector store search methods with index params"""
+    create_collection('test', {})
+    store = vector_store('test')
+    store.add_documents([Document(page_content='some')], ids=['1'])
+
+    result = store.similarity_search_with_score('test', k=2, ef_search=10)
+    assert len(result) == 1
+    result = store.similarity_search('test', k=2, probes=3)
+    assert len(result) == 1
+    assert result[0].page_content == 'some'
@@ -2,11 +2,15 @@
 from pathlib import Path
 from os import unlink
 import pytest
+from sqlalchemy.orm import Session
 from brevia.utilities.collections_io import (
+    csv_column,
     export_collection_data,
     import_collection_data,
 )
-from brevia.collections import create_collection
+from brevia.collections import create_collection, collection_name_exists
+from brevia.connection import db_connection
+from brevia.embedding_partitions import convert_embeddings, has_partition
 
 
 def test_export_collection_data():
@@ -58,3 +62,20 @@ def test_import_collection_data_errors():
         import_collection_data(folder_path=folder_path, collection='empty')
     assert str(exc.value) == f"CSV file {csv_em_path} not found, exiting"
     unlink(csv_path)
+
+
+def test_csv_column():
+    """Test csv_column function"""
+    csv_path = f'{Path(__file__).parent.parent}/files/test-collection-collection.csv'
+    assert csv_column(csv_path, 'uuid') == ['1c6211e0-2f13-4e59-a14c-e636bbd6c207']
+
+
+def test_import_collection_data_partitioned():
+    """Test import_collection_data creates the collection partition"""
+    convert_embeddings(partitioned=True)
+    folder_path = f'{Path(__file__).parent.parent}/files'
+    import_collection_data(folder_path=folder_path, collection='test-collection')
+    assert collection_name_exists('test-collection')
+    with Session(db_connection()) as session:
+        assert has_partition(session, '1c6211e0-2f13-4e59-a14c-e636bbd6c207')
+    convert_embeddings(partitioned=False)